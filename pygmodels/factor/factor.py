@@ -4,25 +4,54 @@
 Defining a factor from Koller and Friedman 2009, p. 106-107
 """
 
-from functools import reduce as freduce
-from itertools import combinations, product
-from pprint import pprint
-from typing import Callable, FrozenSet, List, Optional, Set, Tuple, Union
+from functools import lru_cache, reduce
+from math import fsum
+from operator import mul
+from typing import Callable, Iterable, List, Optional, Set, Tuple, Union
 from uuid import uuid4
 
-from pygmodels.factor.factorf.factorops import FactorBoolOps, FactorOps
-from pygmodels.factor.ftype.abstractfactor import (
-    AbstractFactor,
-    DomainSliceSet,
-    DomainSubset,
-    FactorDomain,
-    FactorScope,
-)
+from pygmodels.factor.ftype.abstractfactor import AbstractFactor
 from pygmodels.factor.ftype.basefactor import BaseFactor
-from pygmodels.graph.gtype.graphobj import GraphObject
 from pygmodels.pgm.pgmtype.randomvariable import NumCatRVariable
 from pygmodels.value.value import NumericValue
 
+try:
+    from math import prod
+except ImportError:  # math.prod is available from python 3.8 on
+
+    def prod(iterable, start=1):
+        return reduce(mul, iterable, start)
+
+
+@lru_cache(maxsize=None)
+def _joint_product(nb_vars: int) -> Callable:
+    """!
+    \brief generate the marginal joint function for factors of nb_vars
+    variables
+
+    The product of \see Factor.marginal_joint is unrolled over the given
+    number of variables, so that the generated function unpacks the row
+    and multiplies the marginal of each assigned value in a single
+    expression.
+
+    \return factory taking the tabulated marginals of a factor and
+    returning the product function. The product function raises KeyError,
+    TypeError or ValueError for rows it can not evaluate.
+    """
+    ns = range(nb_vars)
+    targets = ", ".join("(i{0}, v{0})".format(n) for n in ns)
+    terms = " * ".join("m[i{0}][v{0}]".format(n) for n in ns) or "1.0"
+    lines = [
+        "def factory(m):",
+        "    def joint(scope_product):",
+        "        [{}] = scope_product".format(targets),
+        "        return " + terms,
+        "    return joint",
+    ]
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return namespace["factory"]
+
 
 class Factor(BaseFactor):
     """!
@@ -38,6 +67,7 @@ class Factor(BaseFactor):
             Callable[[Set[Tuple[str, NumCatRVariable]]], float]
         ] = None,
         data={},
+        typecode: Optional[str] = None,
     ):
         """!
         \brief Constructor for a factor \f$ \phi(A,B) \f$
@@ -50,6 +80,7 @@ class Factor(BaseFactor):
 
         \param scope_vars variables that constitue scope of factor.
         \param factor_fn a real valued function
+        \param typecode storage of the value table \see BaseFactor
 
         \code{.py}
 
@@ -101,28 +132,61 @@ class Factor(BaseFactor):
             factor_fn = self.marginal_joint
 
         super().__init__(
-            gid=gid, scope_vars=scope_vars, factor_fn=factor_fn, data=data
+            gid=gid,
+            scope_vars=scope_vars,
+            factor_fn=factor_fn,
+            data=data,
+            typecode=typecode,
         )
 
         ## scope variable hash table
-        self.domain_table = {s.id(): s for s in self.scope_vars()}
+        self.domain_table = {s.id(): s for s in self.svars}
+
+        ## marginal probability of each outcome value of scope variables
+        self._marginals = {
+            s.id(): {v: s.marginal(v) for v in s.values()}
+            for s in self.svars
+        }
+
+        ## marginal vectors of the domain given by the signature, built
+        ## lazily \see Factor._marginal_vectors
+        self._vectors: Optional[List[List[float]]] = None
+        self._vectors_signature = None
+
+        ## marginal joint function unrolled over the scope variables, built on
+        ## first use \see Factor.marginal_joint
+        self._joint: Optional[Callable] = None
+
+    def __getstate__(self):
+        """!
+        \brief state of the factor without the generated marginal joint
+        function, which cannot be pickled and is rebuilt on first use
+        """
+        state = super().__getstate__()
+        state["_joint"] = None
+        return state
 
     @classmethod
     def from_abstract_factor(cls, f: AbstractFactor):
         """"""
-        bfac = BaseFactor.from_abstract_factor(f)
-        return cls.from_base_factor(bfac)
+        return cls(
+            gid=f.id(),
+            scope_vars=f.scope_vars(),
+            factor_fn=f.phi,
+            data=f.data(),
+        )
 
     @classmethod
     def from_base_factor(cls, bfac: BaseFactor):
         """!
         Construct normal factor from base factor
         """
-        return Factor(
+        return cls(
             gid=bfac.id(),
             scope_vars=bfac.scope_vars(),
             factor_fn=bfac.factor_fn,
             data=bfac.data(),
+            typecode=bfac.typecode,
         )
 
     @classmethod
@@ -149,8 +213,7 @@ class Factor(BaseFactor):
 
         \endcode
         """
-        bfac = BaseFactor.from_joint_vars(svars)
-        return cls.from_base_factor(bfac)
+        return cls(gid=str(uuid4()), scope_vars=svars)
 
     @classmethod
     def from_scope_variables_with_fn(
@@ -161,8 +224,7 @@ class Factor(BaseFactor):
         """!
         \brief Make a factor from scope variables and a preference function
         """
-        bfac = BaseFactor.from_scope_variables_with_fn(svars, fn)
-        return cls.from_base_factor(bfac)
+        return cls(gid=str(uuid4()), scope_vars=svars, factor_fn=fn)
 
     def __call__(self, scope_product: Set[Tuple[str, NumericValue]]) -> float:
         """!
@@ -181,23 +243,149 @@ class Factor(BaseFactor):
 
         \param scope_product a row in conditional probability table of factor
 
+        Marginals of the outcome values are tabulated at construction, values
+        outside of the tabulated outcomes are asked to the variable itself.
+        Rows assigning each scope variable are evaluated by a function
+        generated for the number of scope variables \see _joint_product.
+
         \throw ValueError A value error is raised when there is an unknown
         random variable with an identifier
 
         \return preference value for a given scope_product
         """
+        joint = self._joint
+        if joint is None:
+            joint = _joint_product(len(self._marginals))(self._marginals)
+            self._joint = joint
+        try:
+            return joint(scope_product)
+        except (KeyError, TypeError, ValueError):
+            # partial rows, unknown variables or values outside of the
+            # tabulated outcomes
+            pass
+        marginals = self._marginals
         p = 1.0
-        for sv in scope_product:
-            var_id = sv[0]
-            var_value = sv[1]
-            hasv, var = FactorOps.find_var(self, var_id)
-            if hasv is False:
+        for var_id, var_value in scope_product:
+            var_marginals = marginals.get(var_id)
+            if var_marginals is None:
                 raise ValueError(
                     "Unknown variable id among arguments: " + var_id
                 )
-            p *= var.marginal(var_value)
+            marg = var_marginals.get(var_value)
+            if marg is None:
+                marg = self.domain_table[var_id].marginal(var_value)
+            p *= marg
         return p
 
+    def _marginal_vectors(
+        self, sig: Tuple[Tuple[str, Tuple[NumericValue, ...]], ...]
+    ) -> List[List[float]]:
+        """!
+        \brief marginal probabilities of the values of each variable in the
+        domain given by the signature
+
+        The vectors are kept until the signature changes, like the dense
+        table \see BaseFactor._ensure_table
+        """
+        if self._vectors is not None and self._vectors_signature == sig:
+            return self._vectors
+        vecs = []
+        for sid, vs in sig:
+            var_marginals = self._marginals[sid]
+            var = self.domain_table[sid]
+            vecs.append(
+                [
+                    var_marginals[v] if v in var_marginals else var.marginal(v)
+                    for v in vs
+                ]
+            )
+        self._vectors = vecs
+        self._vectors_signature = sig
+        return vecs
+
+    @staticmethod
+    def _vector_product(
+        vecs: List[List[float]], idx: Tuple[int, ...]
+    ) -> float:
+        """!
+        \brief product of one entry per marginal vector, the entries being
+        given by value positions
+
+        \throws IndexError if idx does not hold a valid value position for
+        each vector
+        """
+        if len(idx) != len(vecs):
+            msg = "a value position is needed for each variable"
+            raise IndexError(msg)
+        p = 1.0
+        for margs, pos in zip(vecs, idx):
+            if not 0 <= pos < len(margs):
+                raise IndexError("value position out of range")
+            p *= margs[pos]
+        return p
+
+    def phi_by_index(self, idx: Tuple[int, ...]) -> NumericValue:
+        """!
+        \brief obtain a factor value for a row given by value positions
+
+        \see Factor.phi_batch, BaseFactor.phi_by_index
+        """
+        if self.factor_fn != self.marginal_joint:
+            return super().phi_by_index(idx)
+        vecs = self._marginal_vectors(self._domain_signature())
+        return self._vector_product(vecs, idx)
+
+    def phi_batch(self, idxs: Iterable[Tuple[int, ...]]) -> List[NumericValue]:
+        """!
+        \brief obtain factor values for many rows given by value positions
+
+        Values of the marginal joint factor are read from the marginal
+        vectors of its variables, multiplying one entry per variable, so
+        that the dense table is not needed.
+
+        \see BaseFactor.phi_batch
+        """
+        if self.factor_fn != self.marginal_joint:
+            return super().phi_batch(idxs)
+        vecs = self._marginal_vectors(self._domain_signature())
+        return [self._vector_product(vecs, idx) for idx in idxs]
+
+    def _tabulate(
+        self,
+        sig: Tuple[Tuple[str, Tuple[NumericValue, ...]], ...],
+        nb_workers: int = 1,
+    ) -> List[float]:
+        """!
+        \brief evaluate the factor over the domain given by the signature
+
+        The marginal joint factor is the outer product of the marginal
+        vectors of its variables, so its table is built by successive
+        multiplications without forming any row of the cartesian product.
+
+        \see BaseFactor._tabulate
+        """
+        if self.factor_fn != self.marginal_joint:
+            return super()._tabulate(sig, nb_workers)
+        table = [1.0]
+        for margs in self._marginal_vectors(sig):
+            table = [t * m for t in table for m in margs]
+        return table
+
+    def _table_sum(self, nb_workers: int = 1) -> NumericValue:
+        """!
+        \brief sum of the factor values over its whole domain
+
+        The sum of an outer product is the product of the sums of its
+        vectors, so the partition value of the marginal joint factor is
+        computed from the marginal vectors without building the table.
+
+        \see BaseFactor._table_sum
+        """
+        if self.factor_fn != self.marginal_joint:
+            return super()._table_sum(nb_workers)
+        vecs = self._marginal_vectors(self._domain_signature())
+        return prod([fsum(margs) for margs in vecs], start=1.0)
+
     def __contains__(self, v: Union[NumCatRVariable, str]) -> bool:
         """!
         \brief Check if given parameter is in scope of this factor
@@ -211,9 +399,8 @@ class Factor(BaseFactor):
         \return a boolean flag which indicates if the argument is in scope or
         not.
         """
+        if isinstance(v, str):
+            return v in self.domain_table
         if isinstance(v, NumCatRVariable):
             return v.id() in self.domain_table
-        elif isinstance(v, str):
-            return v in self.domain_table
-        else:
-            raise TypeError("argument must be NumCatRVariable or its id")
+        raise TypeError("argument must be NumCatRVariable or its id")
@@ -2,9 +2,17 @@
 \file factoralg.py Factor algebra operations
 """
 
-from functools import reduce as freduce
-from itertools import combinations
-from typing import Callable, FrozenSet, List, Optional, Set, Tuple, Union
+from itertools import count
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 from uuid import uuid4
 
 from pygmodels.factor.factorf.factorops import FactorFactorableOps, FactorOps
@@ -18,6 +26,18 @@ from pygmodels.factor.ftype.abstractfactor import (
 from pygmodels.factor.ftype.basefactor import BaseFactor
 from pygmodels.randvar.rtype.abstractrandvar import AbstractRandomVariable
 
+# identifiers of factors built by the algebra are a per process random tag
+# followed by a counter, which is much cheaper than a uuid per factor
+_GID_PREFIX = uuid4().hex[:8] + "-"
+_gid_counter = count()
+
+
+def _next_gid() -> str:
+    """!
+    \brief identifier of a factor built by \see FactorAlgebra
+    """
+    return _GID_PREFIX + str(next(_gid_counter))
+
 
 class FactorAlgebra:
     """
@@ -31,9 +51,13 @@ class FactorAlgebra:
         other: AbstractFactor,
         product_fn=lambda x, y: x * y,
         accumulator=lambda added, accumulated: added * accumulated,
+        typecode: Optional[str] = None,
     ) -> Tuple[AbstractFactor, float]:
         """!
         Wrapper of FactorOps.cls_product
+
+        \param typecode storage of the value table of the product, "f"
+        halves its memory \see BaseFactor
         """
         ((scope, phi), prod) = FactorOps.product(
             f=f,
@@ -42,7 +66,12 @@ class FactorAlgebra:
             accumulator=accumulator,
         )
         return (
-            BaseFactor(gid=str(uuid4()), scope_vars=scope, factor_fn=phi),
+            BaseFactor(
+                gid=_next_gid(),
+                scope_vars=scope,
+                factor_fn=phi,
+                typecode=typecode,
+            ),
             prod,
         )
 
@@ -52,7 +81,7 @@ class FactorAlgebra:
         Wrapper of FactorOps.cls_reduced
         """
         (scope, phi) = FactorOps.reduced(f=f, assignments=assignments)
-        return BaseFactor(gid=str(uuid4()), scope_vars=scope, factor_fn=phi)
+        return BaseFactor(gid=_next_gid(), scope_vars=scope, factor_fn=phi)
 
     @staticmethod
     def reduced_by_value(
@@ -64,17 +93,22 @@ class FactorAlgebra:
         (scope, phi) = FactorFactorableOps.reduced_by_value(
             f=f, assignments=assignments
         )
-        return BaseFactor(gid=str(uuid4()), scope_vars=scope, factor_fn=phi)
+        return BaseFactor(gid=_next_gid(), scope_vars=scope, factor_fn=phi)
 
     @staticmethod
     def filter_assignments(
         f: AbstractFactor, assignments: DomainSubset
-    ) -> AbstractFactor:
+    ) -> DomainSubset:
         """!
-        Wrapper of FactorOps.cls_filter_assignments
+        Wrapper of FactorOps.filter_assignments keeping the assignments to
+        the scope variables of f
+
+        Filtering gives assignments, not a factor, so they are returned as
+        they are.
         """
-        (scope, phi) = FactorOps.filter_assignments(f=f, assignments=assignments)
-        return BaseFactor(gid=str(uuid4()), scope_vars=scope, factor_fn=phi)
+        return FactorOps.filter_assignments(
+            f=f, assignments=assignments, context=f.scope_vars()
+        )
 
     @staticmethod
     def reduced_by_vars(f: AbstractFactor, assignments: DomainSubset) -> AbstractFactor:
@@ -82,42 +116,183 @@ class FactorAlgebra:
         Wrapper of FactorOps.reduced_by_vars
         """
         (scope, phi) = FactorFactorableOps.reduced_by_vars(f=f, assignments=assignments)
-        return BaseFactor(gid=str(uuid4()), scope_vars=scope, factor_fn=phi)
+        return BaseFactor(gid=_next_gid(), scope_vars=scope, factor_fn=phi)
 
     @staticmethod
-    def maxout_var(f: AbstractFactor, Y: AbstractRandomVariable) -> AbstractFactor:
+    def maxout_var(
+        f: AbstractFactor,
+        Y: AbstractRandomVariable,
+        typecode: Optional[str] = None,
+    ) -> AbstractFactor:
         """!
         Wrapper of FactorOps.maxout_var
+
+        \param typecode storage of the value table of the result \see
+        BaseFactor
         """
         (scope, phi) = FactorFactorableOps.maxout_var(f=f, Y=Y)
-        return BaseFactor(gid=str(uuid4()), scope_vars=scope, factor_fn=phi)
+        return BaseFactor(
+            gid=_next_gid(),
+            scope_vars=scope,
+            factor_fn=phi,
+            typecode=typecode,
+        )
 
     @staticmethod
-    def sumout_var(f: AbstractFactor, Y: AbstractRandomVariable) -> AbstractFactor:
+    def sumout_var(
+        f: AbstractFactor,
+        Y: AbstractRandomVariable,
+        typecode: Optional[str] = None,
+    ) -> AbstractFactor:
         """!
         Wrapper of FactorOps.cls_sumout_var
+
+        \param typecode storage of the value table of the result \see
+        BaseFactor
         """
         (scope, phi) = FactorFactorableOps.sumout_var(f=f, Y=Y)
-        return BaseFactor(gid=str(uuid4()), scope_vars=scope, factor_fn=phi)
+        return BaseFactor(
+            gid=_next_gid(),
+            scope_vars=scope,
+            factor_fn=phi,
+            typecode=typecode,
+        )
+
+    @staticmethod
+    def product_sum_out(
+        fs: List[AbstractFactor],
+        Ys: Set[AbstractRandomVariable],
+        typecode: Optional[str] = None,
+    ) -> AbstractFactor:
+        """!
+        Wrapper of FactorFactorableOps.product_sum_out
+
+        \param typecode storage of the value table of the result \see
+        BaseFactor
+        """
+        (scope, phi) = FactorFactorableOps.product_sum_out(fs=fs, Ys=Ys)
+        return BaseFactor(
+            gid=_next_gid(),
+            scope_vars=scope,
+            factor_fn=phi,
+            typecode=typecode,
+        )
 
     @staticmethod
     def sumout_vars(
-        f: AbstractFactor, Ys: Set[AbstractRandomVariable]
+        f: AbstractFactor,
+        Ys: Set[AbstractRandomVariable],
+        typecode: Optional[str] = None,
     ) -> AbstractFactor:
         """!
         \brief Sum the variable out of factor as per Koller, Friedman 2009, p. 297
 
         \see Factor.sumout_var(Y)
 
+        Several variables are summed out in a single pass over the dense
+        table of the factor \see FactorFactorableOps.product_sum_out instead
+        of building an intermediate factor per variable.
+
+        \param typecode storage of the value table of the result \see
+        BaseFactor
+
         \return Factor
         """
         if len(Ys) == 0:
             raise ValueError("variables not be an empty set")
         if len(Ys) == 1:
-            v = Ys.pop()
-            return FactorAlgebra.sumout_var(f, v)
-        ylst = list(Ys)
-        fac = FactorAlgebra.sumout_var(f, ylst[0])
-        for i in range(1, len(ylst)):
-            fac = FactorAlgebra.sumout_var(fac, ylst[i])
-        return fac
+            return FactorAlgebra.sumout_var(
+                f, next(iter(Ys)), typecode=typecode
+            )
+        return FactorAlgebra.product_sum_out([f], Ys, typecode=typecode)
+
+    @staticmethod
+    def elimination_order(
+        fs: List[AbstractFactor], Ys: Set[AbstractRandomVariable]
+    ) -> List[AbstractRandomVariable]:
+        """!
+        \brief Order the variables for elimination with the min degree
+        heuristic, ties broken by min fill
+
+        The elimination graph connects the variables sharing a factor scope.
+        At each step the variable with the fewest remaining neighbours is
+        picked. Among those, the one whose elimination adds the fewest edges
+        between its neighbours comes first. The neighbours of the picked
+        variable are then connected as a clique.
+
+        \param fs factors whose scopes make up the elimination graph
+        \param Ys variables to order
+
+        \return variables of Ys in elimination order
+        """
+        neighbours: Dict[str, Set[str]] = {}
+        for f in fs:
+            sids = set(s.id() for s in f.scope_vars())
+            for sid in sids:
+                neighbours.setdefault(sid, set()).update(sids - {sid})
+        by_id = {Y.id(): Y for Y in Ys}
+        remaining = set(by_id)
+        order: List[AbstractRandomVariable] = []
+
+        def cost(sid: str) -> Tuple[int, int, str]:
+            nbrs = neighbours.get(sid, set())
+            fill = sum(
+                1
+                for a in nbrs
+                for b in nbrs
+                if a < b and b not in neighbours[a]
+            )
+            return (len(nbrs), fill, sid)
+
+        while remaining:
+            sid = min(remaining, key=cost)
+            remaining.discard(sid)
+            order.append(by_id[sid])
+            nbrs = neighbours.pop(sid, set())
+            for n in nbrs:
+                neighbours[n].discard(sid)
+                neighbours[n].update(nbrs - {n})
+        return order
+
+    @staticmethod
+    def eliminate_vars(
+        fs: List[AbstractFactor],
+        Ys: Set[AbstractRandomVariable],
+        order: Optional[List[AbstractRandomVariable]] = None,
+    ) -> List[AbstractFactor]:
+        """!
+        \brief Sum variables out of a list of factors one at a time
+
+        Each variable is summed out of the product of the factors mentioning
+        it \see FactorAlgebra.product_sum_out so that only those factors are
+        joined. The order matters a lot for the size of the intermediate
+        factors, hence it defaults to \see FactorAlgebra.elimination_order
+
+        \param fs factors to sum variables out of
+        \param Ys variables to sum out
+        \param order elimination order of Ys, computed if not given
+
+        \throws ValueError if a variable is not in the scope of any factor
+
+        \return remaining factors whose product is the summed out product of
+        fs
+        """
+        if order is None:
+            order = FactorAlgebra.elimination_order(fs, Ys)
+        factors = list(fs)
+        for Y in order:
+            yid = Y.id()
+            touching = []
+            rest = []
+            for f in factors:
+                if any(s.id() == yid for s in f.scope_vars()):
+                    touching.append(f)
+                else:
+                    rest.append(f)
+            if not touching:
+                raise ValueError(
+                    "variable " + yid + " is not in the scope of any factor"
+                )
+            rest.append(FactorAlgebra.product_sum_out(touching, set([Y])))
+            factors = rest
+        return factors
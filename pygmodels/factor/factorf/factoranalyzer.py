@@ -5,9 +5,10 @@ The main objective of these functions is to analyze a given factor
 or a set of factors.
 """
 
+from math import fsum
 from typing import Callable, FrozenSet, List, Optional, Set, Tuple, Union
 
-from pygmodels.factor.factorf.factorops import FactorOps
+from pygmodels.factor.factorf.factorops import FactorOps, _decode
 from pygmodels.factor.ftype.abstractfactor import AbstractFactor
 from pygmodels.pgm.pgmtype.randomvariable import NumCatRVariable, NumericValue
 from pygmodels.value.value import FiniteVSet, OrderedFiniteVSet
@@ -76,10 +77,12 @@ class FactorNumericAnalyzer:
         constant
 
         \return normalized preference value
+
+        The partition value is kept by factors holding a value table, so
+        that repeated calls do not sum the domain again
+        \see FactorNumericAnalyzer.zval
         """
-        fdomain = FactorOps.factor_domain(f)
-        Z = FactorOps.partition_value(fdomain)
-        return phi_result / Z
+        return phi_result / FactorNumericAnalyzer.zval(f)
 
     @staticmethod
     def min_probability(f: AbstractFactor) -> ProbabilityValue:
@@ -127,13 +130,25 @@ class FactorNumericAnalyzer:
         return mprob
 
     @staticmethod
-    def zval(f: AbstractFactor) -> float:
+    def zval(f: AbstractFactor, nb_workers: int = 1) -> float:
         """!
         \brief compute value of partition function for this factor
 
         \see Factor.partition_value(domains)
+
+        Factors that keep a value table are summed over that table
+        directly.
+
+        \param nb_workers number of worker processes evaluating the factor
+        function if the value table is not built yet, see
+        BaseFactor._tabulate for the constraints on the factor function.
         """
-        return sum([f.phi(scope_product=sv) for sv in FactorOps.cartesian(f)])
+        table_sum = getattr(f, "_table_sum", None)
+        if table_sum is not None:
+            return table_sum(nb_workers)
+        return fsum(
+            f.phi(scope_product=sv) for sv in FactorOps.iter_cartesian(f)
+        )
 
 
 class FactorAnalyzer:
@@ -147,20 +162,51 @@ class FactorAnalyzer:
         comp_fn: Callable[[float, float], bool] = lambda phi_s, mx: phi_s > mx,
         comp_v: float = float("-inf"),
     ) -> Tuple[Set[OrderedFiniteVSet], ProbabilityValue]:
-        """"""
+        """!
+        \brief scan the dense table of the factor for the value preferred by
+        the comparison function
+
+        \return the row of the preferred value, in the order of the table
+        for ties, with the value itself
+        """
         if not isinstance(f, AbstractFactor):
             raise TypeError("The object must be of Factor type")
 
         cval = comp_v
-        out_val = None
-        for sp in FactorOps.cartesian(f):
-            ss = frozenset(sp)
-            phi_s = f.phi(ss)
+        best = None
+        sig, table = FactorOps.dense_table(f)
+        for i, phi_s in enumerate(table):
             if comp_fn(phi_s, cval):
                 cval = phi_s
-                out_val = ss
+                best = i
+        out_val = None if best is None else _decode(sig, best)
         return out_val, cval
 
+    @staticmethod
+    def _extreme_prob_value(
+        f: AbstractFactor,
+        extreme: Callable[..., int],
+        default: float,
+    ) -> Tuple[Set[OrderedFiniteVSet], ProbabilityValue]:
+        """!
+        \brief find the row of the largest or smallest factor value
+
+        The position of the value is found by the builtin max or min over
+        the dense table, which keeps the first of tied positions as does
+        \see FactorAnalyzer._compare_prob_value, without calling a
+        comparison function per row.
+
+        \param extreme builtin max or min
+        \param default value returned for empty tables
+        """
+        if not isinstance(f, AbstractFactor):
+            raise TypeError("The object must be of Factor type")
+        sig, table = FactorOps.dense_table(f)
+        if len(table) == 0:
+            return None, default
+        best = extreme(range(len(table)), key=table.__getitem__)
+        return _decode(sig, best), table[best]
+
     @staticmethod
     def _max_prob_value(
         f: AbstractFactor,
@@ -172,9 +218,7 @@ class FactorAnalyzer:
         Obtain the highest preference value yielding domain member of this
         factor with its associated value.
         """
-        return FactorAnalyzer._compare_prob_value(
-            f=f, comp_fn=lambda phi_s, mx: phi_s > mx, comp_v=float("-inf")
-        )
+        return FactorAnalyzer._extreme_prob_value(f, max, float("-inf"))
 
     @staticmethod
     def _min_prob_value(
@@ -187,9 +231,7 @@ class FactorAnalyzer:
         Obtain the highest preference value yielding domain member of this
         factor with its associated value.
         """
-        return FactorAnalyzer._compare_prob_value(
-            f=f, comp_fn=lambda phi_s, mx: phi_s < mx, comp_v=float("inf")
-        )
+        return FactorAnalyzer._extreme_prob_value(f, min, float("inf"))
 
     @staticmethod
     def max_value(f: AbstractFactor) -> Set[OrderedFiniteVSet]:
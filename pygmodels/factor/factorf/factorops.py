@@ -5,10 +5,18 @@ The main objective of these functions is to operate on a given factor
 or a set of factors.
 """
 
-from functools import reduce as freduce
-from itertools import combinations, product
-from typing import Callable, FrozenSet, List, Optional, Set, Tuple, Union
-from uuid import uuid4
+from itertools import product
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from pygmodels.factor.ftype.abstractfactor import (
     AbstractFactor,
@@ -18,10 +26,160 @@ from pygmodels.factor.ftype.abstractfactor import (
     FactorDomain,
     FactorScope,
 )
+from pygmodels.factor.ftype.basefactor import _canonical, _row_locator
 from pygmodels.randvar.rtype.abstractrandvar import AbstractRandomVariable
 from pygmodels.value.value import NumericValue
 
 
+def _keep(x) -> bool:
+    """!
+    \brief default filter of \see FactorOps.factor_domain
+    """
+    return True
+
+
+def _identity(x):
+    """!
+    \brief default value transform of \see FactorOps.factor_domain
+    """
+    return x
+
+
+def _decode(
+    sig: Tuple[Tuple[str, Tuple[NumericValue, ...]], ...], flat: int
+) -> DomainSliceSet:
+    """!
+    \brief row found at the given position of a dense table
+    \see FactorOps.dense_table
+    """
+    row = []
+    for sid, vs in reversed(sig):
+        flat, pos = divmod(flat, len(vs))
+        row.append((sid, vs[pos]))
+    return frozenset(row)
+
+
+def _pair_codes(
+    sig: Tuple[Tuple[str, Tuple[NumericValue, ...]], ...]
+) -> Dict[Tuple[str, NumericValue], int]:
+    """!
+    \brief number each assignment of a value to a variable of the signature
+
+    Codes increase with the order of the signature, so the codes of a row
+    listed in that order are already sorted.
+    """
+    pairs = ((sid, v) for sid, vs in sig for v in vs)
+    return {pair: code for code, pair in enumerate(pairs)}
+
+
+def _encode(
+    codes: Dict[Tuple[str, NumericValue], int], row: DomainSliceSet
+) -> Tuple[int, ...]:
+    """!
+    \brief key of a row as the sorted tuple of the codes of its assignments
+
+    Tuples of small integers hash and compare faster than frozensets of
+    pairs. Unknown assignments are coded as -1, so that rows holding them
+    match no key. \see _pair_codes
+    """
+    return tuple(sorted([codes.get(a, -1) for a in row]))
+
+
+def _aggregate_out(
+    f: AbstractFactor,
+    Y: AbstractRandomVariable,
+    aggregate: Callable[[List[NumericValue]], NumericValue],
+) -> Callable[[DomainSliceSet], NumericValue]:
+    """!
+    \brief factor function aggregating the values of f over the values of Y
+
+    On the first call the dense table of f \see FactorOps.dense_table is
+    reduced along the axis of Y: the values sharing an assignment of the
+    other variables are a stride apart, so each group is a strided slice of
+    the table aggregated once by a builtin. Assignments that are not a
+    group, such as partial ones, aggregate the values of the groups they
+    are part of, and are remembered as well. Assignments that also give Y
+    a value aggregate the entries of those groups' slices at that value
+    instead, that is the rows of f containing the assignment. The factor
+    function of f is never called while answering a query.
+
+    \see FactorFactorableOps.maxout_var, FactorFactorableOps.sumout_var
+    """
+    yid = Y.id()
+    codes = {}
+    position = {}
+    ypositions = {}
+    groups = {}
+    full = []
+    layout = []
+
+    def psi(scope_product: DomainSliceSet):
+        """"""
+        if not codes:
+            sig, table = FactorOps.dense_table(f)
+            codes.update(_pair_codes(sig))
+            others = [(sid, vs) for sid, vs in sig if sid != yid]
+            for i, (sid, vs) in enumerate(others):
+                for v in vs:
+                    position[codes[(sid, v)]] = i
+            for sid, vs in sig:
+                if sid == yid:
+                    for j, v in enumerate(vs):
+                        ypositions[codes[(sid, v)]] = j
+            stride = 1
+            for sid, vs in reversed(sig):
+                if sid == yid:
+                    radix = len(vs)
+                    break
+                stride *= len(vs)
+            span = stride * radix
+            # groups come in the lexicographic order of the other variables
+            keys = product(
+                *[[codes[(sid, v)] for v in vs] for sid, vs in others]
+            )
+            flats = (
+                flat
+                for outer in range(0, len(table), span)
+                for flat in range(outer, outer + stride)
+            )
+            for key, flat in zip(keys, flats):
+                value = aggregate(table[flat : flat + span : stride])
+                groups[key] = value
+                full.append((key, value, flat))
+            layout.extend([table, stride])
+        key = _encode(codes, scope_product)
+        value = groups.get(key)
+        if value is None:
+            # a group is part of the assignment if it holds each assigned
+            # code at the position of its variable
+            wanted = []
+            ys = set()
+            for c in key:
+                if c in ypositions:
+                    ys.add(ypositions[c])
+                else:
+                    wanted.append((position.get(c), c))
+            matches = []
+            if len(ys) <= 1 and all(i is not None for i, c in wanted):
+                matches = [
+                    (v, flat)
+                    for k, v, flat in full
+                    if all(k[i] == c for i, c in wanted)
+                ]
+            if ys:
+                # rows of f holding the assigned value of Y
+                table, stride = layout
+                j = ys.pop()
+                values = [table[flat + j * stride] for v, flat in matches]
+            else:
+                values = [v for v, flat in matches]
+            value = aggregate(values)
+            groups[key] = value
+        return value
+
+    return psi
+
+
 class FactorFactorableOps:
     """!
     Operations that give take a factor and give Tuple[FactorScope, Callable]
@@ -62,12 +220,15 @@ class FactorFactorableOps:
            a2  |  b1  |  c1
 
         """
+        # assigned values are grouped by variable id once, so that each
+        # scope variable finds its assignments with a single lookup
+        values_of = {}
+        for k, value in assignments:
+            values_of.setdefault(k, []).append(value)
         svars = set()
         for sv in f.scope_vars():
-            for kval in assignments:
-                k, value = kval
-                if sv.id() == k:
-                    sv.reduce_to_value(value)
+            for value in values_of.get(sv.id(), ()):
+                sv.reduce_to_value(value)
             svars.add(sv)
         return tuple([svars, f.phi])
 
@@ -124,15 +285,7 @@ class FactorFactorableOps:
         if Y not in f.scope_vars():
             raise ValueError("argument is not in scope of this factor")
 
-        # Y_vals = Y.value_set()
-        products = FactorOps.cartesian(f)
-        fn = f.phi
-
-        def psi(scope_product: DomainSliceSet):
-            """"""
-            s = set(scope_product)
-            diffs = set([p for p in products if s.issubset(p) is True])
-            return max([fn(d) for d in diffs])
+        psi = _aggregate_out(f, Y, max)
 
         return tuple([frozenset(f.scope_vars().difference({Y})), psi])
 
@@ -169,17 +322,138 @@ class FactorFactorableOps:
             msg += " ".join(f.scope_vars())
             raise ValueError(msg)
 
-        # Y_vals = Y.value_set()
-        products = FactorOps.cartesian(f)
-        fn = f.phi
+        psi = _aggregate_out(f, Y, sum)
+
+        return tuple([frozenset(f.scope_vars().difference({Y})), psi])
+
+
+    @staticmethod
+    def product_sum_out(
+        fs: List[AbstractFactor], Ys: Set[AbstractRandomVariable]
+    ) -> Tuple[FactorScope, Callable]:
+        """!
+        \brief Sum variables out of the product of factors in a single pass
+
+        Computes \f$ \psi(X) = \sum_{Y} \prod_i \phi_i \f$, the elimination
+        step of variable elimination from Koller, Friedman 2009, p. 298,
+        without building the product factor over \f$ X \cup Y \f$. For each
+        assignment of X the products of the factor values are accumulated
+        over the assignments of Y, reading the values from the dense table
+        of each factor \see FactorOps.dense_table. Factors whose scope does
+        not meet Y are evaluated once per assignment of X and multiply the
+        accumulated sum.
+
+        With an empty Y nothing is summed out, and the result is the product
+        of the factors computed from their dense tables, without joining
+        their rows as \see FactorOps.product does.
+
+        \param fs factors whose product is marginalized
+        \param Ys variables that are summed out
+
+        Partial assignments of X are answered by summing the rows of the
+        result that contain them, as \see FactorFactorableOps.sumout_var
+        does.
+
+        \throw ValueError if there is no factor or if a variable to sum out
+        is not in the scope of any factor.
+
+        \return scope and factor function of the resulting factor
+        """
+        if not fs:
+            raise ValueError("at least one factor is needed")
+        svars = {}
+        tables = []
+        for f in fs:
+            sig, table = FactorOps.dense_table(f)
+            strides = {}
+            stride = 1
+            for sid, vs in reversed(sig):
+                strides[sid] = (stride, {v: j for j, v in enumerate(vs)})
+                stride *= len(vs)
+            tables.append((table, strides))
+            for s in f.scope_vars():
+                svars.setdefault(s.id(), s)
+        y_ids = sorted(y.id() for y in Ys)
+        for yid in y_ids:
+            if yid not in svars:
+                raise ValueError(
+                    "Argument " + yid + " is not in scope of any factor"
+                )
+        x_ids = sorted(sid for sid in svars if sid not in y_ids)
+
+        def value_offsets(sid: str) -> List[Tuple[NumericValue, tuple]]:
+            "table offsets of each value of the variable in every factor"
+            offsets = []
+            for v in dict.fromkeys(svars[sid].values()):
+                voffsets = []
+                for table, strides in tables:
+                    if sid not in strides:
+                        voffsets.append(0)
+                        continue
+                    stride, positions = strides[sid]
+                    if v not in positions:
+                        break
+                    voffsets.append(stride * positions[v])
+                else:
+                    offsets.append((v, tuple(voffsets)))
+            return offsets
+
+        def add(offsets: List[tuple]) -> List[int]:
+            return [sum(o) for o in zip(*offsets)] or [0] * len(tables)
+
+        # factors without a summed out variable are constant along Y, so
+        # they are read once per row of X rather than once per row of Y
+        inner = [
+            i
+            for i, (table, strides) in enumerate(tables)
+            if any(yid in strides for yid in y_ids)
+        ]
+        outer = [i for i in range(len(tables)) if i not in inner]
+        inner_tables = [tables[i][0] for i in inner]
+        outer_tables = [tables[i][0] for i in outer]
+        y_offsets = [
+            [yoff[i] for i in inner]
+            for yoff in (
+                add([o for v, o in row])
+                for row in product(*[value_offsets(yid) for yid in y_ids])
+            )
+        ]
+        rows = {}
+        for row in product(*[value_offsets(xid) for xid in x_ids]):
+            base = add([o for v, o in row])
+            outer_val = 1.0
+            for i, table in zip(outer, outer_tables):
+                outer_val *= table[base[i]]
+            acc = 0.0
+            if outer_val != 0:
+                inner_base = [base[i] for i in inner]
+                for yoff in y_offsets:
+                    multi = 1.0
+                    for table, b, y in zip(inner_tables, inner_base, yoff):
+                        multi *= table[b + y]
+                    acc += multi
+                acc *= outer_val
+            # x_ids are sorted, so the assignment is already canonical
+            rows[tuple(zip(x_ids, (v for v, o in row)))] = acc
+
+        partial = {}
 
         def psi(scope_product: DomainSliceSet):
             """"""
-            s = set(scope_product)
-            diffs = set([p for p in products if s.issubset(p) is True])
-            return sum([fn(d) for d in diffs])
-
-        return tuple([frozenset(f.scope_vars().difference({Y})), psi])
+            key = _canonical(scope_product)
+            if key in rows:
+                return rows[key]
+            if key not in partial:
+                # partial assignments of X sum the rows containing them
+                if any(a[0] not in svars or a[0] in y_ids for a in key):
+                    raise ValueError("Unknown assignment: " + str(key))
+                s = set(key)
+                partial[key] = sum(
+                    v for row, v in rows.items() if s.issubset(row)
+                )
+            return partial[key]
+
+        return tuple([frozenset(svars[xid] for xid in x_ids), psi])
 
 
 class FactorBoolOps:
@@ -195,17 +469,14 @@ class FactorBoolOps:
 
         \param ids identifier of random variable
 
-        \return bool
-        \parblock
-
-        a tuple whose first element is a boolean flag indicating if
-        there is indeed a variable associated to identifier and whose second
-        element is either None if the operation has failed or the random
-        variable associated to given identifier.
-
-        \endparblock
+        Factors keeping an identifier table \see Factor.domain_table are
+        answered with a single lookup.
 
+        \return true if a scope variable has the identifier
         """
+        id_to_var = getattr(f, "domain_table", None)
+        if id_to_var is not None:
+            return ids in id_to_var
         has, var = FactorOps.find_var(f, ids)
         return has
 
@@ -221,7 +492,14 @@ class FactorOps:
     ) -> Tuple[bool, Optional[AbstractRandomVariable]]:
         """!
         Find given random variable using its identifier string
+
+        Factors keeping an identifier table \see Factor.domain_table are
+        answered with a single lookup.
         """
+        id_to_var = getattr(f, "domain_table", None)
+        if id_to_var is not None:
+            var = id_to_var.get(ids)
+            return var is not None, var
         vs = [s for s in f.scope_vars() if s.id() == ids]
         if len(vs) > 1:
             raise ValueError("more than one variable matches the id string")
@@ -253,7 +531,8 @@ class FactorOps:
         \f$ \psi(X,Y,Z) =  \phi(X,Y) \cdot \phi(Y,Z) \f$
         \f$ \prod_i phi(X_i) \f$
 
-        Point wise product of two different factor functions.
+        Point wise product of two different factor functions, computed over
+        the dense tables of both factors \see FactorOps.dense_table
 
         \param product_fn actual function for computing product. This function
         can be exchanged with another function to compute log-sum for example.
@@ -279,37 +558,107 @@ class FactorOps:
         #
         svar = f.scope_vars()
         ovar = other.scope_vars()
-        var_inter = svar.intersection(ovar)
-        var_inter = list(var_inter)
-        vsets = [v.value_set() for v in var_inter]
-        inter_products = list(product(*vsets))
-        smatch = FactorOps.cartesian(f)
-        omatch = FactorOps.cartesian(other)
+
+        # both dense tables are laid out over the joint domain: each joint
+        # axis gives, for each of its values, the offset of the value in
+        # the table of f and in the table of other, zero if the variable is
+        # not in the scope of the factor. Expanding the axes in order gives
+        # the positions in both tables of every joint row in lexicographic
+        # order, so each factor is evaluated once per row of its own table.
+        fsig, ftable = FactorOps.dense_table(f)
+        osig, otable = FactorOps.dense_table(other)
+        strides = []
+        for sig in (fsig, osig):
+            sstrides = {}
+            stride = 1
+            for sid, vs in reversed(sig):
+                sstrides[sid] = (stride, {v: j for j, v in enumerate(vs)})
+                stride *= len(vs)
+            strides.append(sstrides)
+        fstrides, ostrides = strides
+        values = dict(osig)
+        values.update(fsig)
+        fpos, opos = [0], [0]
+        axes = []
+        for sid in sorted(values):
+            axis = []
+            for v in values[sid]:
+                offs = []
+                for sstrides in strides:
+                    if sid not in sstrides:
+                        offs.append(0)
+                        continue
+                    stride, positions = sstrides[sid]
+                    if v not in positions:
+                        break
+                    offs.append(stride * positions[v])
+                else:
+                    axis.append((v, offs[0], offs[1]))
+            axes.append((sid, axis))
+            fpos = [p + a[1] for p in fpos for a in axis]
+            opos = [p + a[2] for p in opos for a in axis]
+
         prod = 1.0
-        common_match = set()
-        for iproduct in inter_products:
-            for o in omatch:
-                for s in smatch:
-                    ss = set(s)
-                    ost = set(o)
-                    prod_s = set(iproduct)
-                    if prod_s.issubset(ss) and prod_s.issubset(ost):
-                        common = ss.union(ost)
-                        multi = product_fn(
-                            f.factor_fn(ss), other.factor_fn(ost)
-                        )
-                        common_match.add((multi, tuple(common)))
-                        prod = accumulator(multi, prod)
+        table = []
+        for i, j in zip(fpos, opos):
+            multi = product_fn(ftable[i], otable[j])
+            table.append(multi)
+            prod = accumulator(multi, prod)
+
+        # rows of the product are located in its table the way rows of a
+        # factor are \see BaseFactor._index_domain
+        offsets = {}
+        stride = 1
+        for k, (sid, axis) in reversed(list(enumerate(axes))):
+            offsets[sid] = (
+                1 << k,
+                {a[0]: n * stride for n, a in enumerate(axis)},
+            )
+            stride *= len(axis)
+        locate = _row_locator(len(axes))(offsets.get, (1 << len(axes)) - 1)
 
         def fx(scope_product: Set[Tuple[str, NumericValue]]):
             """"""
-            for multip, match in common_match:
-                if set(match) == set(scope_product):
-                    return multip
+            idx = locate(scope_product)
+            return None if idx is None else table[idx]
 
         f = tuple([frozenset(svar.union(ovar)), fx])
         return f, prod
 
+    @staticmethod
+    def dense_table(
+        f: AbstractFactor,
+    ) -> Tuple[
+        Tuple[Tuple[str, Tuple[NumericValue, ...]], ...], List[NumericValue]
+    ]:
+        """!
+        \brief Values of the factor over its whole domain in lexicographic
+        order
+
+        Variables are ordered by their identifiers and the last variable
+        varies fastest. Factors that keep a dense table \see
+        BaseFactor._ensure_table give it directly, other factors are
+        evaluated over their domain.
+
+        \return scope variable identifiers with their values, and the list of
+        factor values
+        """
+        ensure_table = getattr(f, "_ensure_table", None)
+        if ensure_table is not None:
+            table = ensure_table()
+            return f._domain_signature(), table
+        sig = tuple(
+            sorted(
+                (
+                    (s.id(), tuple(dict.fromkeys(s.values())))
+                    for s in f.scope_vars()
+                ),
+                key=lambda x: x[0],
+            )
+        )
+        rows = product(*[[(sid, v) for v in vs] for sid, vs in sig])
+        return sig, [f.phi(row) for row in rows]
+
     @staticmethod
     def filter_assignments(
         f: AbstractFactor,
@@ -330,20 +679,17 @@ class FactorOps:
 
         \return set of valid assignments
         """
-        assignment_d = {a[0]: a[1] for a in assignments}
-        context_ids = set([c.id() for c in context])
-        for a in assignment_d.copy().keys():
-            if a not in context_ids:
-                assignment_d.pop(a)
-        return set([(k, v) for k, v in assignment_d.items()])
+        context_ids = set(c.id() for c in context)
+        assignment_d = {k: v for k, v in assignments if k in context_ids}
+        return set(assignment_d.items())
 
     @staticmethod
     def factor_domain(
         f: AbstractFactor,
         D: Set[AbstractRandomVariable],
-        rvar_filter: Callable[[AbstractRandomVariable], bool] = lambda x: True,
-        value_filter: Callable[[NumericValue], bool] = lambda x: True,
-        value_transform: Callable[[NumericValue], NumericValue] = lambda x: x,
+        rvar_filter: Callable[[AbstractRandomVariable], bool] = _keep,
+        value_filter: Callable[[NumericValue], bool] = _keep,
+        value_transform: Callable[[NumericValue], NumericValue] = _identity,
     ) -> FactorDomain:
         """!
         \brief Get factor domain Val(D) D being a set of random variables
@@ -376,7 +722,21 @@ class FactorOps:
 
         \endcode
 
+        The domain of the whole scope with the default filters is kept by
+        factors \see BaseFactor._default_domain and is not rebuilt.
         """
+        is_default = (
+            rvar_filter is _keep
+            and value_filter is _keep
+            and value_transform is _identity
+        )
+        default_domain = getattr(f, "_default_domain", None)
+        if (
+            is_default
+            and default_domain is not None
+            and D is f.scope_vars()
+        ):
+            return list(default_domain())
         return [
             s.value_set(
                 value_filter=value_filter, value_transform=value_transform
@@ -396,8 +756,14 @@ class FactorOps:
 
         \see Factor.normalize(phi_result), Factor.phi(scope_product)
 
+        The partition value cached on the factor is used when available
+        \see BaseFactor.Z
         """
-        Z = f.partition_value(FactorOps.factor_domain(f, D=f.scope_vars()))
+        Z = getattr(f, "Z", None)
+        if Z is None:
+            Z = f.partition_value(
+                FactorOps.factor_domain(f, D=f.scope_vars())
+            )
         return f.phi(scope_product) / Z
 
     @staticmethod
@@ -429,9 +795,30 @@ class FactorOps:
         >>>  frozenset([("A", False), ("B", False)])]
 
         \endcode
+
+        Factors that keep their domain rows \see BaseFactor._cartesian give
+        a copy of them instead of recomputing the product.
+        """
+        cartesian = getattr(f, "_cartesian", None)
+        if cartesian is not None:
+            return list(cartesian())
+        return list(FactorOps.iter_cartesian(f))
+
+    @staticmethod
+    def iter_cartesian(f: AbstractFactor) -> Iterator[DomainSliceSet]:
+        """!
+        \brief iterate over the cartesian product of the factor domain
+
+        Unlike \see FactorOps.cartesian the rows are not collected into a
+        new list, which is all that is needed by callers that visit each row
+        once. Rows kept by the factor \see BaseFactor._cartesian are
+        iterated in place, other rows are produced lazily.
         """
+        cartesian = getattr(f, "_cartesian", None)
+        if cartesian is not None:
+            return iter(cartesian())
         domain_values = FactorOps.factor_domain(f, D=f.scope_vars())
-        return [frozenset(s) for s in list(product(*domain_values))]
+        return (frozenset(s) for s in product(*domain_values))
 
     @staticmethod
     def domain_scope(f: AbstractFactor, domain: FactorDomain) -> FactorScope:
@@ -494,14 +881,13 @@ class FactorOps:
 
         \endcode
         """
-        sids = set()
-        for vs in domain:
-            for vtpl in vs:
-                sids.add(vtpl[0])
+        sids = {vtpl[0] for vs in domain for vtpl in vs}
+        # factors keeping an identifier table spare us rebuilding it
+        id_to_var = getattr(f, "domain_table", None)
+        if id_to_var is None:
+            id_to_var = {s.id(): s for s in f.scope_vars()}
         # check for values out of domain of this factor
-        scope_ids = set([s.id() for s in f.scope_vars()])
-        if sids.issubset(scope_ids) is False:
+        if not sids <= id_to_var.keys():
             msg = "Given argument domain include values out of the domain of this factor"
             raise ValueError(msg)
-        svars = set([s for s in f.scope_vars() if s.id() in sids])
-        return svars
+        return {id_to_var[sid] for sid in sids}
@@ -2,9 +2,13 @@
 \file basefactor.py Basic factor that implements an AbstractFactor
 """
 
-from functools import reduce as freduce
-from itertools import combinations, product
-from typing import Callable, Optional, Set
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import product
+from math import fsum, isclose
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from uuid import uuid4
 
 from pygmodels.factor.ftype.abstractfactor import (
@@ -15,9 +19,87 @@ from pygmodels.factor.ftype.abstractfactor import (
     FactorScope,
 )
 from pygmodels.graph.gtype.graphobj import GraphObject
-from pygmodels.randvar.rtype.abstractrandvar import AbstractRandomVariable
 from pygmodels.value.value import NumericValue
-import pdb
+
+
+@lru_cache(maxsize=None)
+def _row_locator(nb_vars: int) -> Callable:
+    """!
+    \brief generate the row locating function for factors of nb_vars
+    variables
+
+    The loop of \see BaseFactor._table_index is unrolled over the given
+    number of variables, so that the generated function unpacks the
+    assignment and looks up each assigned value in straight line code.
+
+    \return factory taking the offset lookup of a factor and the bit mask of
+    all of its variables, and returning the locating function.
+    """
+    ns = range(nb_vars)
+    targets = ", ".join("(i{0}, v{0})".format(n) for n in ns)
+    lines = [
+        "def factory(get, full):",
+        "    def locate(scope_product):",
+        "        try:",
+        "            [{}] = scope_product".format(targets),
+        "        except (TypeError, ValueError):",
+        "            return None",
+    ]
+    for n in ns:
+        lines.append("        e{0} = get(i{0})".format(n))
+        lines.append("        if e{0} is None:".format(n))
+        lines.append("            return None")
+    bits = " | ".join("e{}[0]".format(n) for n in ns) or "0"
+    lines.append("        if {} != full:".format(bits))
+    lines.append("            return None")
+    for n in ns:
+        lines.append("        o{0} = e{0}[1].get(v{0})".format(n))
+        lines.append("        if o{0} is None:".format(n))
+        lines.append("            return None")
+    total = " + ".join("o{}".format(n) for n in ns) or "0"
+    lines.append("        return " + total)
+    lines.append("    return locate")
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return namespace["factory"]
+
+
+def _canonical(
+    scope_product: Iterable[Tuple[str, NumericValue]]
+) -> Tuple[Tuple[str, NumericValue], ...]:
+    """!
+    \brief canonical form of a row: its assignments as a tuple sorted by
+    variable identifier
+
+    Tuples hash and compare faster than frozensets, so rows are keyed by
+    their canonical form internally.
+    """
+    return tuple(sorted(scope_product, key=itemgetter(0)))
+
+
+def _evaluate_rows(
+    fn: Callable[[DomainSliceSet], NumericValue],
+    rows: List[Tuple[Tuple[str, NumericValue], ...]],
+) -> List[NumericValue]:
+    """!
+    \brief evaluate a factor function over rows of a domain, used by worker
+    processes \see BaseFactor._tabulate
+
+    Rows are produced in lexicographic variable order, so they are passed
+    to the factor function in their canonical form \see _canonical
+    """
+    return [fn(row) for row in rows]
+
+
+def _sum_rows(
+    fn: Callable[[DomainSliceSet], NumericValue],
+    rows: List[Tuple[Tuple[str, NumericValue], ...]],
+) -> NumericValue:
+    """!
+    \brief sum factor values over rows of a domain, used by worker
+    processes \see BaseFactor.partition_value
+    """
+    return fsum(fn(row) for row in rows)
 
 
 class BaseFactor(AbstractFactor, GraphObject):
@@ -29,12 +111,25 @@ class BaseFactor(AbstractFactor, GraphObject):
         scope_vars: FactorScope,
         factor_fn: Optional[Callable[[DomainSliceSet], NumericValue]] = None,
         data={},
+        typecode: Optional[str] = None,
     ):
-        """"""
+        """!
+        \brief Constructor for a base factor
+
+        \param typecode storage of the dense value table: "f" for single and
+        "d" for double precision arrays. Single precision halves the memory
+        of large tables for computations that are normalized in the end. By
+        default values are kept as they are given by the factor function.
+
+        \throws ValueError if the typecode is not supported or if scope
+        variables contain negative values.
+        """
+        if typecode not in (None, "f", "d"):
+            raise ValueError("typecode must be one of None, 'f' or 'd'")
         super().__init__(oid=gid, odata=data)
         for svar in scope_vars:
             vs = svar.values()
-            if any([v < 0 for v in vs]):
+            if any(v < 0 for v in vs):
                 msg = "Scope variables contain a negative value."
                 msg += " Negative factors are not allowed"
                 raise ValueError(msg)
@@ -42,22 +137,84 @@ class BaseFactor(AbstractFactor, GraphObject):
         ## random variables belonging to this factor
         self.svars = scope_vars
 
-        self.factor_fn = factor_fn
+        self._factor_fn = factor_fn
+
+        self.typecode = typecode
+
+        ## dense value table in lexicographic variable order, built lazily
+        self._table: Optional[List[NumericValue]] = None
+        self._table_signature = None
+        self._signature = None
+        self._signature_version: Optional[int] = None
+        self._offsets: Dict[str, Tuple[int, Dict[NumericValue, int]]] = {}
+        self._strides: Dict[str, int] = {}
+        self._dims: List[Tuple[int, int]] = []
+        self._locate: Optional[Callable] = None
+
+        ## partition value of the current table, computed lazily
+        self._Z: Optional[NumericValue] = None
+
+        ## factor values of rows evaluated before the table is built
+        self._phi_cache: Dict[
+            Tuple[Tuple[str, NumericValue], ...], NumericValue
+        ] = {}
+
+        ## rows of the factor domain, built lazily
+        self._rows: Optional[Tuple[DomainSliceSet, ...]] = None
+        self._rows_signature = None
+
+        ## value sets of scope variables, built lazily
+        self._value_sets: Optional[FactorDomain] = None
+        self._value_sets_signature = None
+
+    def __getstate__(self):
+        """!
+        \brief state of the factor without the generated row locating
+        function, which cannot be pickled \see _row_locator
+        """
+        state = self.__dict__.copy()
+        state["_locate"] = self._locate is not None
+        return state
+
+    def __setstate__(self, state):
+        """!
+        \brief restore the factor, rebuilding the row locating function from
+        the pickled offsets \see BaseFactor._index_domain
+        """
+        self.__dict__.update(state)
+        if self._locate:
+            offsets = self._offsets
+            self._locate = _row_locator(len(offsets))(
+                offsets.get, (1 << len(offsets)) - 1
+            )
+        else:
+            self._locate = None
 
     def __str__(self):
         """"""
         msg = "Factor: " + self.id() + "\n"
-        msg += "Scope variables: " + str({s.id(): s for s in self.scope_vars()})
+        msg += "Scope variables: " + str({s.id(): s for s in self.svars})
         msg += "Factor function: " + str(self.factor_fn)
         return msg
 
     def __hash__(self):
-        return hash(self.__str__())
+        """!
+        \brief hash of the identifier and scope variable identifiers
+
+        Unlike the text given by \see BaseFactor.__str__, neither depends on
+        the memory address of the factor function.
+        """
+        return hash((self.id(), frozenset(s.id() for s in self.svars)))
 
     def __eq__(self, n: AbstractFactor):
         """!
         Check factor equality based on their domain and codomain values
 
+        Factors over different variables or values are told apart without
+        evaluating them, as are factors sharing their function over the same
+        domain. Otherwise values are compared row by row with
+        math.isclose.
+
         \warning this function works for categorical/discrete factors. For
         continuous domain factors, this won't work.
 
@@ -65,33 +222,21 @@ class BaseFactor(AbstractFactor, GraphObject):
         """
         if not isinstance(n, AbstractFactor):
             return False
-        #
-        def rvar_filter(x: AbstractRandomVariable) -> bool:
+        if n is self:
             return True
-
-        def value_filter(x: NumericValue) -> bool:
-            return True
-
-        def value_transform(x: NumericValue) -> NumericValue:
-            return x
-
-        other_domain = [
-            s.value_set(value_filter=value_filter, value_transform=value_transform)
-            for s in n.scope_vars()
-            if rvar_filter(s)
-        ]
-        this_domain = [
-            s.value_set(value_filter=value_filter, value_transform=value_transform)
-            for s in self.scope_vars()
-            if rvar_filter(s)
-        ]
+        this_domain = {s.id(): frozenset(s.values()) for s in self.svars}
+        other_domain = {s.id(): frozenset(s.values()) for s in n.scope_vars()}
         if other_domain != this_domain:
             return False
+        # the same function over the same domain gives the same values
+        if self.factor_fn is getattr(n, "factor_fn", None):
+            return True
         #
-        for dval in product(*other_domain):
-            other_phi = n.phi(dval)
-            this_phi = self.phi(dval)
-            if this_phi != other_phi:
+        rows = product(
+            *[[(sid, v) for v in vs] for sid, vs in this_domain.items()]
+        )
+        for dval in rows:
+            if not isclose(self.phi(dval), n.phi(dval)):
                 return False
         return True
 
@@ -103,11 +248,14 @@ class BaseFactor(AbstractFactor, GraphObject):
             return False
         return self.id() == n.id()
 
-    def scope_vars(self, f=lambda x: x) -> FactorScope:
+    def scope_vars(
+        self, f: Optional[Callable[[FactorScope], FactorScope]] = None
+    ) -> FactorScope:
         """!
         \brief get variables that are inside the scope of this factor
 
-        \param f is a function that transforms the scope of this factor.
+        \param f is a function that transforms the scope of this factor. If
+        it is not given, the scope itself is returned.
 
         \code{.py}
 
@@ -120,6 +268,8 @@ class BaseFactor(AbstractFactor, GraphObject):
 
         \endcode
         """
+        if f is None:
+            return self.svars
         return f(self.svars)
 
     @classmethod
@@ -129,7 +279,7 @@ class BaseFactor(AbstractFactor, GraphObject):
         """
         svar = f.scope_vars()
         fn = f.phi
-        return BaseFactor(gid=f.id(), data=f.data(), factor_fn=fn, scope_vars=svar)
+        return cls(gid=f.id(), data=f.data(), factor_fn=fn, scope_vars=svar)
 
     @classmethod
     def from_joint_vars(cls, svars: FactorScope):
@@ -155,7 +305,7 @@ class BaseFactor(AbstractFactor, GraphObject):
 
         \endcode
         """
-        return BaseFactor(gid=str(uuid4()), scope_vars=svars)
+        return cls(gid=str(uuid4()), scope_vars=svars)
 
     @classmethod
     def from_scope_variables_with_fn(
@@ -166,7 +316,7 @@ class BaseFactor(AbstractFactor, GraphObject):
         """!
         \brief Make a factor from scope variables and a preference function
         """
-        return BaseFactor(gid=str(uuid4()), scope_vars=svars, factor_fn=fn)
+        return cls(gid=str(uuid4()), scope_vars=svars, factor_fn=fn)
 
     def phi(self, scope_product: DomainSliceSet) -> float:
         """!
@@ -191,9 +341,370 @@ class BaseFactor(AbstractFactor, GraphObject):
 
         \endcode
         """
-        return self.factor_fn(scope_product)
+        if self._table is not None:
+            idx = self._table_index(scope_product)
+            if idx is not None:
+                return self._table[idx]
+        key = _canonical(scope_product)
+        value = self._phi_cache.get(key)
+        if value is None:
+            value = self.factor_fn(scope_product)
+            # only rows of the domain are kept, so that the memo is bounded
+            # by the size of the table
+            if self._in_domain(key):
+                self._phi_cache[key] = value
+        return value
+
+    def _in_domain(self, key: Tuple[Tuple[str, NumericValue], ...]) -> bool:
+        """!
+        \brief check if a row in canonical form \see _canonical assigns a
+        known value to each scope variable exactly once
+        """
+        sig = self._domain_signature()
+        return len(key) == len(sig) and all(
+            kid == sid and v in vs for (kid, v), (sid, vs) in zip(key, sig)
+        )
+
+    @property
+    def factor_fn(self) -> Callable[[DomainSliceSet], NumericValue]:
+        """!
+        \brief function giving the value of a row of the factor
+
+        Replacing it forgets the values computed from the previous function
+        \see BaseFactor.invalidate_cache
+        """
+        return self._factor_fn
+
+    @factor_fn.setter
+    def factor_fn(self, fn: Callable[[DomainSliceSet], NumericValue]):
+        """!"""
+        self._factor_fn = fn
+        self.invalidate_cache()
+
+    def invalidate_cache(self) -> None:
+        """!
+        \brief forget the factor values computed so far
 
-    def partition_value(self, domain_subsets: FactorDomain):
+        Called when the factor function is replaced, since the memoized
+        values, the dense table and the partition value are all computed
+        from it.
+        """
+        self._phi_cache = {}
+        self._table = None
+        self._table_signature = None
+        self._Z = None
+
+    def _domain_signature(
+        self,
+    ) -> Tuple[Tuple[str, Tuple[NumericValue, ...]], ...]:
+        """!
+        \brief scope variable identifiers with their values sorted by
+        identifier
+
+        Repeated outcome values are kept once, in the order they are first
+        given, so that each row of the domain is a single table entry.
+
+        The signature is kept until the data of a graph object is updated
+        \see GraphObject.update_data, for example by
+        \see NumCatRVariable.reduce_to_value.
+        """
+        version = GraphObject.data_version
+        if self._signature_version == version:
+            return self._signature
+        self._signature = tuple(
+            sorted(
+                (
+                    (s.id(), tuple(dict.fromkeys(s.values())))
+                    for s in self.svars
+                ),
+                key=lambda x: x[0],
+            )
+        )
+        self._signature_version = version
+        return self._signature
+
+    def _ensure_table(self, nb_workers: int = 1) -> List[NumericValue]:
+        """!
+        \brief obtain the dense table of factor values
+
+        The table is a flat list indexed by the lexicographic order of scope
+        variable identifiers: the value of a row is found at
+        \f$ \sum_i stride_i \cdot index_i \f$ where \f$ index_i \f$ is the
+        position of the assigned value among the values of the i-th variable.
+        It is computed once by evaluating the factor function over the whole
+        domain and is rebuilt only if the values of the scope variables have
+        changed since, for example after a reduction.
+
+        \param nb_workers number of worker processes evaluating the factor
+        function \see BaseFactor._tabulate
+
+        \return list of factor values
+        """
+        sig = self._domain_signature()
+        if self._table is not None and self._table_signature == sig:
+            return self._table
+        table = self._tabulate(sig, nb_workers)
+        if self.typecode is not None:
+            table = array(self.typecode, table)
+        self._index_domain(sig)
+        self._table_signature = sig
+        self._table = table
+        self._Z = None
+        return table
+
+    def _cartesian(self) -> Tuple[DomainSliceSet, ...]:
+        """!
+        \brief rows of the factor domain in lexicographic order
+
+        The rows are computed once and recomputed only if the values of the
+        scope variables have changed since. They are kept in a tuple, so
+        that callers sharing them cannot alter them.
+        """
+        sig = self._domain_signature()
+        if self._rows is None or self._rows_signature != sig:
+            rows = product(*[[(sid, v) for v in vs] for sid, vs in sig])
+            self._rows = tuple(frozenset(row) for row in rows)
+            self._rows_signature = sig
+        return self._rows
+
+    def _default_domain(self) -> FactorDomain:
+        """!
+        \brief value sets of the scope variables
+
+        The value sets are computed once and recomputed only if the values
+        of the scope variables have changed since.
+        """
+        sig = self._domain_signature()
+        if self._value_sets is None or self._value_sets_signature != sig:
+            self._value_sets = [s.value_set() for s in self.svars]
+            self._value_sets_signature = sig
+        return self._value_sets
+
+    def _table_sum(self, nb_workers: int = 1) -> NumericValue:
+        """!
+        \brief sum of the factor values over its whole domain
+
+        Values are accumulated with math.fsum, so that the sum does not
+        drift with the size of the table, and values of single precision
+        tables are accumulated in double precision.
+
+        The sum is kept until the table is rebuilt.
+
+        \param nb_workers number of worker processes used if the table has
+        to be built \see BaseFactor._tabulate
+        """
+        table = self._ensure_table(nb_workers)
+        if self._Z is None:
+            self._Z = fsum(table)
+        return self._Z
+
+    @property
+    def Z(self) -> NumericValue:
+        """!
+        \brief partition value of the factor over its whole domain
+
+        Computed on first access and recomputed only if the values of the
+        scope variables have changed since \see BaseFactor._table_sum
+        """
+        return self._table_sum()
+
+    @property
+    def scope_products(self) -> Tuple[DomainSliceSet, ...]:
+        """!
+        \brief rows of the factor domain, computed on first access
+        \see BaseFactor._cartesian
+        """
+        return self._cartesian()
+
+    @property
+    def scope_order(self) -> Tuple[str, ...]:
+        """!
+        \brief identifiers of the scope variables in the order of the axes
+        of the value table \see BaseFactor.axes
+        """
+        return tuple(sid for sid, vs in self._domain_signature())
+
+    @property
+    def table(self) -> List[NumericValue]:
+        """!
+        \brief dense value table of the factor, built on first access
+
+        Values are stored in lexicographic order of the value positions along
+        \see BaseFactor.scope_order, the last variable varying fastest, so
+        that a row given by value positions is a single integer index \see
+        BaseFactor.phi_by_index. The table is shared, not copied.
+        """
+        return self._ensure_table()
+
+    def _index_domain(
+        self, sig: Tuple[Tuple[str, Tuple[NumericValue, ...]], ...]
+    ) -> None:
+        """!
+        \brief compute mixed radix strides of the domain given by the
+        signature
+
+        Each variable is also given a bit flag and the table offset of each
+        of its values, that is the position of the value times the stride of
+        the variable, so that locating a row needs a single lookup per
+        assigned value.
+        """
+        strides = {}
+        stride = 1
+        for sid, vs in reversed(sig):
+            strides[sid] = stride
+            stride *= len(vs)
+        self._offsets = {
+            sid: (1 << i, {v: j * strides[sid] for j, v in enumerate(vs)})
+            for i, (sid, vs) in enumerate(sig)
+        }
+        self._strides = strides
+        self._dims = [(strides[sid], len(vs)) for sid, vs in sig]
+        self._locate = _row_locator(len(sig))(
+            self._offsets.get, (1 << len(sig)) - 1
+        )
+
+    def _tabulate(
+        self,
+        sig: Tuple[Tuple[str, Tuple[NumericValue, ...]], ...],
+        nb_workers: int = 1,
+    ) -> List[NumericValue]:
+        """!
+        \brief evaluate the factor function over the domain given by the
+        signature in lexicographic order
+
+        Rows sharing the value of the outermost variable are contiguous in
+        the table. When nb_workers is larger than one, each such block is
+        evaluated by a pool of processes and the blocks are concatenated
+        back in order. The factor function must then be picklable, that is
+        defined at the top level of a module.
+
+        \param nb_workers number of worker processes
+        """
+        domains = [[(sid, v) for v in vs] for sid, vs in sig]
+        if nb_workers <= 1 or not domains or len(domains[0]) <= 1:
+            return _evaluate_rows(self.factor_fn, product(*domains))
+        blocks = [
+            list(product([outer], *domains[1:])) for outer in domains[0]
+        ]
+        with ProcessPoolExecutor(max_workers=nb_workers) as executor:
+            tables = list(
+                executor.map(
+                    _evaluate_rows, [self.factor_fn] * len(blocks), blocks
+                )
+            )
+        return [value for table in tables for value in table]
+
+    def _table_index(self, scope_product: DomainSliceSet) -> Optional[int]:
+        """!
+        \brief position of a complete assignment in the dense table
+
+        The offsets of the assigned values are summed by a function
+        generated for the number of scope variables \see _row_locator.
+        Since the bit flags of variables are distinct, the assignment covers
+        each variable exactly once when their union is the full mask.
+
+        \return table index or None if the argument does not assign exactly
+        one known value to each scope variable.
+        """
+        return self._locate(scope_product)
+
+    def _flat_index(self, idx: Tuple[int, ...]) -> int:
+        """!
+        \brief position in the dense table of a row given by value positions
+
+        \throws IndexError if idx does not hold a valid value position for
+        each scope variable
+        """
+        return self._flat_indices([idx])[0]
+
+    def phi_by_index(self, idx: Tuple[int, ...]) -> NumericValue:
+        """!
+        \brief obtain a factor value for a row given by value positions
+
+        Skips the translation of assigned values that \see BaseFactor.phi
+        has to do.
+
+        \param idx position of the assigned value among the values of each
+        scope variable, variables being ordered by their identifiers.
+
+        \throws IndexError if idx does not hold a valid value position for
+        each scope variable
+
+        \return factor value of the row
+        """
+        table = self._ensure_table()
+        return table[self._flat_index(idx)]
+
+    def phi_batch(self, idxs: Iterable[Tuple[int, ...]]) -> List[NumericValue]:
+        """!
+        \brief obtain factor values for many rows given by value positions
+
+        Rows are located against the dense table in one pass, saving a call
+        of \see BaseFactor.phi_by_index per row.
+
+        \param idxs rows as tuples of value positions \see
+        BaseFactor.phi_by_index
+
+        \throws IndexError if a row does not hold a valid value position for
+        each scope variable
+
+        \return factor values of the rows in the given order
+        """
+        table = self._ensure_table()
+        return [table[flat] for flat in self._flat_indices(idxs)]
+
+    def axes(self) -> Tuple[Tuple[str, Tuple[NumericValue, ...]], ...]:
+        """!
+        \brief axes of the value table \see BaseFactor.phi_table
+
+        \return scope variable identifiers with their values, ordered by
+        identifier. Value positions used by \see BaseFactor.phi_by_index
+        refer to these value tuples.
+        """
+        return self._domain_signature()
+
+    def phi_table(self) -> list:
+        """!
+        \brief factor values of the whole domain as nested lists
+
+        The value of the row assigning the value at position \f$ i_j \f$ of
+        the j-th axis \see BaseFactor.axes is found at
+        table[i_1][i_2]...[i_k], so that callers can slice the values of a
+        variable without locating rows one by one.
+
+        \return nested lists, one level per scope variable
+        """
+        table = list(self._ensure_table())
+        for sid, vs in reversed(self._domain_signature()[1:]):
+            size = len(vs)
+            table = [
+                table[i : i + size] for i in range(0, len(table), size)
+            ]
+        return table
+
+    def _flat_indices(self, idxs: Iterable[Tuple[int, ...]]) -> List[int]:
+        """!
+        \brief positions in the dense table of rows given by value positions
+        \see BaseFactor._flat_index
+        """
+        dims = self._dims
+        nb_dims = len(dims)
+        flats = []
+        for idx in idxs:
+            if len(idx) != nb_dims:
+                msg = "a value position is needed for each variable"
+                raise IndexError(msg)
+            flat = 0
+            for (stride, radix), pos in zip(dims, idx):
+                if not 0 <= pos < radix:
+                    raise IndexError("value position out of range")
+                flat += stride * pos
+            flats.append(flat)
+        return flats
+
+    def partition_value(
+        self, domain_subsets: FactorDomain, nb_workers: int = 1
+    ):
         """!
         \brief compute partition value aka normalizing value for the factor
         from Koller, Friedman 2009 p. 105
@@ -212,6 +723,17 @@ class BaseFactor(AbstractFactor, GraphObject):
 
         \param domains list of domain set of the involved random variables.
 
+        \param nb_workers number of worker processes. When it is larger than
+        one, rows sharing their value of the first domain subset are summed
+        by a pool of processes, each row being evaluated by \see
+        BaseFactor.phi. The factor must then be picklable, that is its
+        factor function must be defined at the top level of a module.
+
+        When the domain subsets cover the whole domain of the factor, the
+        sum is obtained from \see BaseFactor._table_sum, so that it is
+        computed as the partition value \see BaseFactor.Z of the factor
+        whichever number of workers is given.
+
         \code{.py}
 
         >>> input_data = {
@@ -250,5 +772,21 @@ class BaseFactor(AbstractFactor, GraphObject):
         """
         if not all(isinstance(d, frozenset) for d in domain_subsets):
             raise TypeError("All domain subsets must be frozenset")
-        scope_matches = list(product(*domain_subsets))
-        return sum([self.phi(scope_product=sv) for sv in scope_matches])
+        domain = self._default_domain()
+        if len(domain_subsets) == len(domain) and set(domain_subsets) == set(
+            domain
+        ):
+            return self._table_sum(nb_workers)
+        if nb_workers <= 1 or not domain_subsets:
+            return fsum(
+                self.phi(scope_product=sv) for sv in product(*domain_subsets)
+            )
+        blocks = [
+            list(product([outer], *domain_subsets[1:]))
+            for outer in domain_subsets[0]
+        ]
+        with ProcessPoolExecutor(max_workers=nb_workers) as executor:
+            sums = executor.map(
+                _sum_rows, [self.phi] * len(blocks), blocks
+            )
+            return fsum(sums)
@@ -0,0 +1,247 @@
+"""!
+\file sparsefactor.py
+
+A factor that keeps only the nonzero rows of its value table
+"""
+
+from array import array
+from math import fsum
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+from uuid import uuid4
+
+from pygmodels.factor.factor import Factor
+from pygmodels.factor.ftype.basefactor import _canonical
+from pygmodels.pgm.pgmtype.randomvariable import NumCatRVariable
+from pygmodels.value.value import NumericValue
+
+
+class SparseFactor(Factor):
+    """!
+    \brief Factor whose value table stores only nonzero rows
+
+    Rows are packed into integers using the mixed radix strides of the dense
+    table \see BaseFactor._ensure_table and only the rows with a nonzero
+    value are kept. Partition value and products then iterate over nonzero
+    rows only. When the share of nonzero rows exceeds the density threshold,
+    the factor keeps the dense table instead.
+    """
+
+    def __init__(
+        self,
+        gid: str,
+        scope_vars: Set[NumCatRVariable],
+        factor_fn: Optional[
+            Callable[[Set[Tuple[str, NumCatRVariable]]], float]
+        ] = None,
+        data={},
+        density_threshold: float = 0.5,
+        typecode: Optional[str] = None,
+    ):
+        """!
+        \brief Constructor for a sparse factor
+
+        \param density_threshold largest share of nonzero rows for which the
+        sparse table is kept.
+
+        \throws ValueError if the density threshold is not in [0, 1]
+
+        \see Factor for other parameters
+        """
+        if not 0.0 <= density_threshold <= 1.0:
+            raise ValueError("density threshold must be in [0, 1]")
+        super().__init__(
+            gid=gid,
+            scope_vars=scope_vars,
+            factor_fn=factor_fn,
+            data=data,
+            typecode=typecode,
+        )
+        self.density_threshold = density_threshold
+
+        ## packed row index to nonzero value, None if the table is dense
+        self._nonzeros: Optional[Dict[int, NumericValue]] = None
+        self._nonzeros_signature = None
+
+    def _ensure_nonzeros(
+        self, nb_workers: int = 1
+    ) -> Optional[Dict[int, NumericValue]]:
+        """!
+        \brief obtain the nonzero rows of the value table
+
+        \param nb_workers number of worker processes used if the table has
+        to be built \see BaseFactor._tabulate
+
+        \return dict from packed row index to its value or None if the
+        factor is too dense to be stored sparsely.
+        """
+        sig = self._domain_signature()
+        if self._nonzeros_signature == sig:
+            return self._nonzeros
+        table = self._ensure_table(nb_workers)
+        nonzeros = {i: v for i, v in enumerate(table) if v != 0}
+        if len(nonzeros) <= self.density_threshold * len(table):
+            self._nonzeros = nonzeros
+            self._table = None
+            self._table_signature = None
+        else:
+            self._nonzeros = None
+        self._nonzeros_signature = sig
+        return self._nonzeros
+
+    def _ensure_table(self, nb_workers: int = 1) -> List[NumericValue]:
+        """!
+        \brief obtain the dense table of factor values
+
+        While the nonzero rows are kept, the dense table is filled from them
+        on each call and is not stored, so that the factor stays sparse.
+
+        \see BaseFactor._ensure_table
+        """
+        sig = self._domain_signature()
+        nonzeros = self._nonzeros
+        if nonzeros is None or self._nonzeros_signature != sig:
+            return super()._ensure_table(nb_workers)
+        size = 1
+        for sid, vs in sig:
+            size *= len(vs)
+        table = [0.0] * size
+        for i, v in nonzeros.items():
+            table[i] = v
+        if self.typecode is not None:
+            table = array(self.typecode, table)
+        return table
+
+    def _nonzero_rows(self) -> Iterator[Tuple[Dict[str, NumericValue], float]]:
+        """!
+        \brief iterate over nonzero rows as variable id to value dicts
+        """
+        nonzeros = self._ensure_nonzeros()
+        if nonzeros is None:
+            items = ((i, v) for i, v in enumerate(self._table) if v != 0)
+        else:
+            items = iter(nonzeros.items())
+        sig = self._nonzeros_signature
+        strides = self._strides
+        for key, value in items:
+            row = {
+                sid: vs[(key // strides[sid]) % len(vs)] for sid, vs in sig
+            }
+            yield row, value
+
+    def phi(self, scope_product) -> float:
+        """!
+        \brief factor value of a row, zero for rows that are not stored
+
+        \see BaseFactor.phi
+        """
+        nonzeros = self._nonzeros
+        if nonzeros is not None:
+            idx = self._table_index(scope_product)
+            if idx is not None:
+                return nonzeros.get(idx, 0.0)
+        return super().phi(scope_product)
+
+    def phi_by_index(self, idx: Tuple[int, ...]) -> NumericValue:
+        """!
+        \brief factor value of a row given by value positions, zero for rows
+        that are not stored
+
+        \see BaseFactor.phi_by_index
+        """
+        nonzeros = self._ensure_nonzeros()
+        if nonzeros is None:
+            return super().phi_by_index(idx)
+        return nonzeros.get(self._flat_index(idx), 0.0)
+
+    def phi_batch(self, idxs: Iterable[Tuple[int, ...]]) -> List[NumericValue]:
+        """!
+        \brief factor values of many rows given by value positions, zero for
+        rows that are not stored
+
+        \see BaseFactor.phi_batch
+        """
+        nonzeros = self._ensure_nonzeros()
+        if nonzeros is None:
+            return super().phi_batch(idxs)
+        return [nonzeros.get(flat, 0.0) for flat in self._flat_indices(idxs)]
+
+    def invalidate_cache(self) -> None:
+        """!
+        \brief forget the factor values computed so far, including the
+        nonzero rows \see BaseFactor.invalidate_cache
+        """
+        super().invalidate_cache()
+        self._nonzeros = None
+        self._nonzeros_signature = None
+
+    def _table_sum(self, nb_workers: int = 1) -> NumericValue:
+        """!
+        \brief sum of the nonzero values \see BaseFactor._table_sum
+        """
+        nonzeros = self._ensure_nonzeros(nb_workers)
+        if nonzeros is None:
+            return super()._table_sum(nb_workers)
+        if self._Z is None:
+            self._Z = fsum(nonzeros.values())
+        return self._Z
+
+    def product(self, other: "SparseFactor") -> "SparseFactor":
+        """!
+        \brief Factor product over nonzero rows
+
+        Nonzero rows of the other factor are grouped by their values on the
+        shared variables. Each nonzero row of this factor is then joined with
+        the group matching its own shared values, so rows whose product would
+        be zero are never visited.
+
+        \param other sparse factor to multiply with
+
+        \return sparse factor over the union of both scopes
+        """
+        shared = sorted(
+            set(self.domain_table).intersection(other.domain_table)
+        )
+        groups: Dict[tuple, List[Tuple[Dict[str, NumericValue], float]]] = {}
+        for row, value in other._nonzero_rows():
+            key = tuple(row[sid] for sid in shared)
+            groups.setdefault(key, []).append((row, value))
+        rows = {}
+        for row, value in self._nonzero_rows():
+            for orow, ovalue in groups.get(
+                tuple(row[sid] for sid in shared), []
+            ):
+                multi = value * ovalue
+                if multi != 0:
+                    joined = dict(row)
+                    joined.update(orow)
+                    rows[_canonical(joined.items())] = multi
+
+        scope = dict(other.domain_table)
+        scope.update(self.domain_table)
+
+        def fn(scope_product):
+            return rows.get(_canonical(scope_product), 0.0)
+
+        result = SparseFactor(
+            gid=str(uuid4()),
+            scope_vars=set(scope.values()),
+            factor_fn=fn,
+            density_threshold=self.density_threshold,
+            typecode=self.typecode,
+        )
+        sig = result._domain_signature()
+        result._index_domain(sig)
+        result._nonzeros = {
+            result._table_index(row): value for row, value in rows.items()
+        }
+        result._nonzeros_signature = sig
+        return result
@@ -645,6 +645,58 @@ class BaseGraphAnalyzer:
     Analyze base graphs
     """
 
+    @staticmethod
+    def find_connected_components(g: AbstractGraph) -> Dict[str, Set[str]]:
+        """!
+        \brief find connected components of graph with union find
+
+        We sweep the edge set once and merge the end vertices of each edge
+        using union by rank and path compression. The sweep stops early as
+        soon as all vertices that have neighbours belong to a single set,
+        since the remaining edges can not merge anything else. This covers
+        the case of a single large component surrounded by isolated
+        vertices. Edge directions are not taken into account.
+
+        \return component root identifier mapped to the identifiers of the
+        component's vertices
+        """
+        ids: List[str] = sorted(v.id() for v in g.V)
+        idx_of_id: Dict[str, int] = {nid: i for i, nid in enumerate(ids)}
+        parent: List[int] = list(range(len(ids)))
+        rank: List[int] = [0] * len(ids)
+
+        def find(i: int) -> int:
+            root = i
+            while parent[root] != root:
+                root = parent[root]
+            while parent[i] != root:
+                parent[i], i = root, parent[i]
+            return root
+
+        adj = getattr(g, "_adj", None)
+        if adj is None:
+            adj = BaseGraphOps.to_adjacency(g)
+        nb_isolated = sum(1 for nbs in adj.values() if len(nbs) == 0)
+        nb_sets = len(ids)
+        for edge in g.E:
+            if nb_sets <= nb_isolated + 1:
+                break
+            ru = find(idx_of_id[edge.start().id()])
+            rv = find(idx_of_id[edge.end().id()])
+            if ru == rv:
+                continue
+            if rank[ru] < rank[rv]:
+                ru, rv = rv, ru
+            parent[rv] = ru
+            if rank[ru] == rank[rv]:
+                rank[ru] += 1
+            nb_sets -= 1
+        #
+        components: Dict[str, Set[str]] = {}
+        for i, nid in enumerate(ids):
+            components.setdefault(ids[find(i)], set()).add(nid)
+        return components
+
     @staticmethod
     def get_component(
         root_node_id: str,
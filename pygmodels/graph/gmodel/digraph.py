@@ -13,7 +13,7 @@ Whenever possible we simply change the edge generation strategy in order to use
 the parent's algorithm.
 
 """
-from typing import Callable, Set
+from typing import Callable, Dict, Set
 from uuid import uuid4
 
 from pygmodels.graph.ganalysis.graphanalyzer import BaseGraphAnalyzer
@@ -108,14 +108,34 @@ class DiGraph(AbstractDiGraph, BaseGraph):
         \todo directed graphs don't yield shortest path with bfs but with
         optimal branching.
         """
-        return BaseGraphSearcher.breadth_first_search(
-            self,
-            n1=n,
-            edge_generator=lambda x: BaseGraphEdgeOps.outgoing_edges_of(
-                self, x
-            ),
+        return BaseGraphSearcher.breadth_first_search_csr(
+            self, n1=n, csr=self._ensure_csr()
         )
 
+    def find_shortest_path_lengths(
+        self, nb_workers: int = 1
+    ) -> Dict[str, Dict[str, float]]:
+        """!
+        \brief Find shortest path lengths between every pair of nodes.
+
+        Instead of running a breadth first search per node, sources are
+        handled in batches by a bit parallel breadth first search.
+        \see BaseGraphSearcher.all_pairs_bfs_csr()
+
+        \param nb_workers number of processes among which batches are
+        distributed
+
+        \return source identifier mapped to the distance of every node
+        identifier from the source
+        """
+        csr = self._ensure_csr()
+        id_of_idx = csr[2]
+        rows = BaseGraphSearcher.all_pairs_bfs_csr(csr, nb_workers=nb_workers)
+        return {
+            id_of_idx[i]: dict(zip(id_of_idx, row))
+            for i, row in enumerate(rows)
+        }
+
     def check_for_path(self, n1: Node, n2: Node) -> bool:
         "check if there is a path between nodes"
         path_props = self.path_props[n1.id()]
@@ -2,7 +2,9 @@
 Path in a given graph
 """
 
+import heapq
 import math
+from itertools import count
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 from uuid import uuid4
 
@@ -20,6 +22,11 @@ from pygmodels.graph.gtype.edge import Edge, EdgeType
 from pygmodels.graph.gtype.node import Node
 from pygmodels.graph.gtype.queue import PriorityQueue
 
+# edge identifiers generated for trees are a per process random tag
+# followed by a counter, which is much cheaper than a uuid per edge
+_EDGE_ID_PREFIX = uuid4().hex[:8] + "-"
+_edge_id_counter = count()
+
 
 class Tree(BaseGraph, AbstractTree):
     """!
@@ -38,6 +45,8 @@ class Tree(BaseGraph, AbstractTree):
                 nodes.add(eend)
         super().__init__(gid=gid, data=data, nodes=nodes, edges=edges)
         self.__root = None
+        self.__node_table: Optional[Dict[str, Dict[str, bool]]] = None
+        self.__leaves: Optional[Set[Node]] = None
         es = [e.type() for e in self.E]
         if es[0] == EdgeType.DIRECTED:
 
@@ -66,7 +75,7 @@ class Tree(BaseGraph, AbstractTree):
             child = e[0]
             parent = e[1]
             edge = Edge(
-                edge_id=str(uuid4()),
+                edge_id=_EDGE_ID_PREFIX + str(next(_edge_id_counter)),
                 start_node=parent,
                 end_node=child,
                 edge_type=e[2],
@@ -80,17 +89,24 @@ class Tree(BaseGraph, AbstractTree):
         return Tree(gid=str(uuid4()), edges=eset)
 
     def node_table(self):
-        """"""
-        node_table = {
-            v.id(): {"child": False, "parent": False} for v in self.V
-        }
-        for e in self.E:
-            estart_id = e.start().id()
-            eend_id = e.end().id()
-            node_table[estart_id]["parent"] = True
-            node_table[eend_id]["child"] = True
-        #
-        return node_table
+        """!
+        \brief register for each node whether it is a parent and/or a child
+
+        Trees do not change after construction, so the table is computed
+        once and kept. A copy of it is returned, as for \see Tree.leaves
+        """
+        if self.__node_table is None:
+            node_table = {
+                v.id(): {"child": False, "parent": False} for v in self.V
+            }
+            for e in self.E:
+                estart_id = e.start().id()
+                eend_id = e.end().id()
+                node_table[estart_id]["parent"] = True
+                node_table[eend_id]["child"] = True
+            #
+            self.__node_table = node_table
+        return {k: dict(v) for k, v in self.__node_table.items()}
 
     def get_root(self):
         """"""
@@ -105,14 +121,18 @@ class Tree(BaseGraph, AbstractTree):
 
     def leaves(self) -> Set[Node]:
         """"""
-        node_table = self.node_table()
-        #
-        leave_ids = [
-            k
-            for k, v in node_table.items()
-            if v["child"] is True and v["parent"] is False
-        ]
-        return set([v for v in self.V if v.id() in leave_ids])
+        if self.__leaves is None:
+            node_table = self.node_table()
+            #
+            leave_ids = set(
+                [
+                    k
+                    for k, v in node_table.items()
+                    if v["child"] is True and v["parent"] is False
+                ]
+            )
+            self.__leaves = set([v for v in self.V if v.id() in leave_ids])
+        return set(self.__leaves)
 
     @property
     def root(self) -> Node:
@@ -234,45 +254,106 @@ class Tree(BaseGraph, AbstractTree):
 
     @classmethod
     def find_mst_prim(
-        cls, g: BaseGraph, edge_generator: Callable[[Node], Set[Node]]
+        cls,
+        g: BaseGraph,
+        edge_generator: Callable[[Node], Set[Edge]],
+        weight_function: Callable[[Edge], float] = lambda x: 1,
     ) -> AbstractTree:
         """!
         Find minimum spanning tree as per Prim's algorithm
         Even and Guy Even 2012, p. 32
+
+        The edges crossing the cut between the tree and the rest of the graph
+        are kept in a binary heap ordered by their weights, so that the
+        cheapest crossing edge is found in logarithmic time.
+
+        \param g graph whose minimum spanning tree we want to find
+        \param edge_generator generates incident edges of a given node
+        \param weight_function weighting function for edges
+
+        \throws ValueError if the graph is not connected
         """
-        l_e = 1  # length of an edge
-        l_vs = {}
-        vs = []
-        eps = {}
-
-        for v in g.V:
-            l_vs[v] = math.inf
-            vs.append(v)
-        #
+        V: Dict[str, Node] = {v.id(): v for v in g.V}
+        vs = sorted(V)
         s = vs[0]
-        l_vs[s] = 0
-        eps[s] = set()
-        TEMP = vs.copy()
+        v_prim: Set[str] = set([s])
         T: Set[Edge] = set()
-        while TEMP:
-            minv = None
-            minl = math.inf
-            for v in TEMP:
-                if l_vs[v] < minl:
-                    minl = l_vs[v]
-                    minv = v
-            TEMP = [v for v in TEMP if v != minv]
-            if minv is None:
+        heap: List[Tuple[float, str, str, Edge]] = []
+
+        def push_edges_of(vid: str):
+            vnode = V[vid]
+            for edge in edge_generator(vnode):
+                u = edge.get_other(vnode).id()
+                if u not in v_prim:
+                    heapq.heappush(
+                        heap, (weight_function(edge), edge.id(), u, edge)
+                    )
+
+        push_edges_of(s)
+        while heap and len(v_prim) < len(V):
+            w, eid, u, edge = heapq.heappop(heap)
+            if u in v_prim:
+                continue
+            v_prim.add(u)
+            T.add(edge)
+            push_edges_of(u)
+        if len(v_prim) < len(V):
+            raise ValueError(
+                "Min vertex is not found. Graph is probably not connected"
+            )
+        return cls.from_edgeset(eset=T)
+
+    @classmethod
+    def find_mst_prim_dense(
+        cls,
+        g: BaseGraph,
+        weight_function: Callable[[Edge], float] = lambda x: 1,
+    ) -> AbstractTree:
+        """!
+        Find minimum spanning tree as per Prim's algorithm in its array form
+        Even and Guy Even 2012, p. 32
+
+        Instead of a heap, the cheapest known connection of every node to the
+        tree is kept in a list, and nodes already in the tree are set to
+        infinity. The next node is then found with the builtin min and
+        list.index, which scan the list in C. This takes O(V^2) steps, which
+        suits dense graphs better than find_mst_prim().
+
+        \param g graph whose minimum spanning tree we want to find
+        \param weight_function weighting function for edges
+
+        \throws ValueError if the graph is not connected
+        """
+        wcsr = BaseGraphOps.to_weighted_csr(g, weight_fn=weight_function)
+        indptr, indices, weights, id_of_idx = wcsr[:4]
+        nb_nodes = len(id_of_idx)
+        key: List[float] = [math.inf] * nb_nodes
+        pred: List[int] = [-1] * nb_nodes
+        in_tree = bytearray(nb_nodes)
+        key[0] = 0
+        for _ in range(nb_nodes):
+            kmin = min(key)
+            if kmin == math.inf:
                 raise ValueError(
                     "Min vertex is not found. Graph is probably not connected"
                 )
-            T = T.union(eps[minv])
-            for edge in edge_generator(g.V[minv]):
-                unode = edge.get_other(g.V[minv])
-                u = unode.id()
-                if u in TEMP and l_vs[u] > l_e:
-                    l_vs[u] = l_e
-                    eps[u] = set([edge])
+            u = key.index(kmin)
+            key[u] = math.inf
+            in_tree[u] = 1
+            for j in range(indptr[u], indptr[u + 1]):
+                v = indices[j]
+                if not in_tree[v] and weights[j] < key[v]:
+                    key[v] = weights[j]
+                    pred[v] = u
+        #
+        V: Dict[str, Node] = {v.id(): v for v in g.V}
+        T: Set[Edge] = set()
+        for v, u in enumerate(pred):
+            if u >= 0:
+                edges = BaseGraphEdgeOps.edge_by_vertices(
+                    g, start=V[id_of_idx[u]], end=V[id_of_idx[v]]
+                )
+                T.add(min(edges, key=lambda e: (weight_function(e), e.id())))
         return cls.from_edgeset(eset=T)
 
     @classmethod
@@ -323,25 +404,37 @@ class Tree(BaseGraph, AbstractTree):
         parent: Dict[str, str],
         counter: int,
         generative_fn: Callable[[Node], Set[Node]],
-    ):
-        """"""
+    ) -> int:
+        """!
+        \brief number nodes in depth first order starting from v
+
+        First pass of Erciyes 2018, p. 230, algorithm 8.3. The traversal uses
+        an explicit stack of (node id, neighbour iterator) frames and a
+        single counter, so that the numbering follows the visiting order.
+
+        \return the last number that is assigned
+        """
+        V: Dict[str, Node] = {n.id(): n for n in self.V}
         counter += 1
         num[v] = counter
         visited[v] = True
-        vnode = self.V[v]
-        for unode in generative_fn(vnode):
-            u = unode.id()
-            cond = visited.get(u)
-            if cond is None or cond is False:
-                parent[u] = v
-                self.assign_num(
-                    u,
-                    num=num,
-                    generative_fn=generative_fn,
-                    visited=visited,
-                    parent=parent,
-                    counter=counter,
-                )
+        stack = [(v, iter(generative_fn(V[v])))]
+        while stack:
+            x, neighbours = stack[-1]
+            descended = False
+            for unode in neighbours:
+                u = unode.id()
+                if not visited.get(u, False):
+                    parent[u] = x
+                    counter += 1
+                    num[u] = counter
+                    visited[u] = True
+                    stack.append((u, iter(generative_fn(V[u]))))
+                    descended = True
+                    break
+            if not descended:
+                stack.pop()
+        return counter
 
     #
     def check_ap(
@@ -355,28 +448,37 @@ class Tree(BaseGraph, AbstractTree):
         aset: Set[str],
         generative_fn: Callable[[Node], Set[Node]],
     ):
-        """"""
+        """!
+        \brief compute low points and collect articulation points
+
+        Second pass of Erciyes 2018, p. 230, algorithm 8.3 over the dfs tree
+        recorded in parent by assign_num(). The low point of a node is
+        propagated to its parent once all neighbours of the node are
+        exhausted.
+        """
+        V: Dict[str, Node] = {n.id(): n for n in self.V}
         low[v] = num[v]
-        vnode = self.V[v]
-        for unode in generative_fn(vnode):
-            u = unode.id()
-            if num[u] >= num[v]:
-                self.check_ap(
-                    v=u,
-                    num=num,
-                    visited=visited,
-                    parent=parent,
-                    low=low,
-                    counter=counter,
-                    generative_fn=generative_fn,
-                    aset=aset,
-                )
-                if low[u] >= num[v]:
-                    aset.add(v)
-                #
-                low[v] = min(low[v], low[u])
-            elif parent[v] != u:
-                low[v] = min(low[v], num[u])
+        stack = [(v, iter(generative_fn(V[v])))]
+        while stack:
+            x, neighbours = stack[-1]
+            descended = False
+            for unode in neighbours:
+                u = unode.id()
+                if parent.get(u) == x:
+                    low[u] = num[u]
+                    stack.append((u, iter(generative_fn(V[u]))))
+                    descended = True
+                    break
+                elif parent.get(x) != u:
+                    low[x] = min(low[x], num[u])
+            if descended:
+                continue
+            stack.pop()
+            if stack:
+                p = stack[-1][0]
+                if low[x] >= num[p]:
+                    aset.add(p)
+                low[p] = min(low[p], low[x])
 
     def find_separating_vertices(
         self, generative_fn: Callable[[Node], Set[Node]]
@@ -384,31 +486,10 @@ class Tree(BaseGraph, AbstractTree):
         """!
         find separating vertices of graph
         as in Erciyes 2018, p. 230, algorithm 8.3
+
+        \see BaseGraph._tarjan_ap_iter
         """
-        num: Dict[str, float] = {n: math.inf for n in self.V}
-        low: Dict[str, float] = {n: math.inf for n in self.V}
-        visited: Dict[str, bool] = {}
-        parent: Dict[str, str] = {n: "" for n in self.V}
-        aset: Set[str] = set()
-
-        counter = 1
-        v = [node for node in self.V][0]
-        self.assign_num(
-            v=v,
-            num=num,
-            visited=visited,
-            parent=parent,
-            counter=counter,
-            generative_fn=generative_fn,
-        )
-        self.check_ap(
-            v=v,
-            num=num,
-            visited=visited,
-            generative_fn=generative_fn,
-            parent=parent,
-            low=low,
-            counter=counter,
-            aset=aset,
-        )
-        return set([self.V[a] for a in aset])
+        V = self._ensure_node_index()
+        start = self.root.id()
+        aset = self._tarjan_ap_iter(start=start, neighbours_fn=generative_fn)
+        return set([V[a] for a in aset])
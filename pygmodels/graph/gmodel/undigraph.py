@@ -9,20 +9,18 @@ parent class include in most cases a specific edge related function to pass
 along to the parent's method in order to adapt its functionality.
 
 """
-from typing import Callable, Dict, List, Set, Union
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
 from uuid import uuid4
 
 from pygmodels.graph.ganalysis.graphanalyzer import (
     BaseGraphAnalyzer,
     BaseGraphBoolAnalyzer,
-    BaseGraphEdgeAnalyzer,
-    BaseGraphNodeAnalyzer,
     BaseGraphNumericAnalyzer,
 )
 from pygmodels.graph.gmodel.graph import Graph
 from pygmodels.graph.gmodel.tree import Tree
-from pygmodels.graph.graphops.graphalg import BaseGraphAlgOps
 from pygmodels.graph.graphops.graphops import (
+    BaseGraphBoolOps,
     BaseGraphEdgeOps,
     BaseGraphNodeOps,
     BaseGraphOps,
@@ -64,6 +62,9 @@ class UndiGraph(AbstractUndiGraph, BaseGraph):
                     )
         super().__init__(gid=gid, data=data, nodes=nodes, edges=edges)
         self._props = None
+        self._lows: Optional[
+            Tuple[List[int], List[int], List[int], Set[int]]
+        ] = None
 
     @property
     def graph_props(self):
@@ -102,11 +103,66 @@ class UndiGraph(AbstractUndiGraph, BaseGraph):
         edge generating function. We consider every edge that is incident with
         nodes not just incoming or outgoing edges.
         """
-        return BaseGraphSearcher.breadth_first_search(
-            self,
-            n1=n1,
-            edge_generator=lambda x: BaseGraphEdgeOps.edges_of(self, x),
+        return BaseGraphSearcher.breadth_first_search_csr(
+            self, n1=n1, csr=self._ensure_csr()
+        )
+
+    def find_connected_components(self) -> Dict[str, Set[str]]:
+        """!
+        \brief find connected components of the graph instance
+
+        \see BaseGraphAnalyzer.find_connected_components()
+        """
+        return BaseGraphAnalyzer.find_connected_components(self)
+
+    def find_shortest_path_lengths(
+        self, nb_workers: int = 1
+    ) -> Dict[str, Dict[str, float]]:
+        """!
+        \brief Find shortest path lengths between every pair of nodes.
+
+        Instead of running a breadth first search per node, sources are
+        handled in batches by a bit parallel breadth first search.
+        \see BaseGraphSearcher.all_pairs_bfs_csr()
+
+        \param nb_workers number of processes among which batches are
+        distributed
+
+        \return source identifier mapped to the distance of every node
+        identifier from the source
+        """
+        csr = self._ensure_csr()
+        id_of_idx = csr[2]
+        rows = BaseGraphSearcher.all_pairs_bfs_csr(csr, nb_workers=nb_workers)
+        return {
+            id_of_idx[i]: dict(zip(id_of_idx, row))
+            for i, row in enumerate(rows)
+        }
+
+    def sssp_delta_stepping(
+        self,
+        source: Node,
+        weight_fn: Callable[[Edge], float] = lambda x: 1,
+        delta: float = 1.0,
+    ) -> Dict[str, float]:
+        """!
+        \brief Find weighted shortest path lengths from the given node.
+
+        \param source source node
+        \param weight_fn weighting function for edges
+        \param delta bucket width of delta stepping
+
+        \throws ValueError if source is not in graph
+        \see BaseGraphSearcher.delta_stepping()
+        """
+        if not BaseGraphBoolOps.is_in(self, source):
+            raise ValueError("argument node is not in graph")
+        wcsr = BaseGraphOps.to_weighted_csr(self, weight_fn=weight_fn)
+        id_of_idx, idx_of_id = wcsr[3], wcsr[4]
+        dist = BaseGraphSearcher.delta_stepping(
+            wcsr, source=idx_of_id[source.id()], delta=delta
         )
+        return dict(zip(id_of_idx, dist))
 
     def check_for_path(self, n1: Node, n2: Node) -> bool:
         """!
@@ -147,7 +203,7 @@ class UndiGraph(AbstractUndiGraph, BaseGraph):
         # t = Tree.find_mst_prim(self, edge_generator=self.edges_of)
         t, L = Tree.find_mnmx_st(
             self,
-            edge_generator=lambda x: BaseGraphOps.edges_of(self, x),
+            edge_generator=lambda x: BaseGraphEdgeOps.edges_of(self, x),
             weight_function=weight_fn,
         )
         return t, L
@@ -163,43 +219,83 @@ class UndiGraph(AbstractUndiGraph, BaseGraph):
         # t = Tree.find_mst_prim(self, edge_generator=self.edges_of)
         t, L = Tree.find_mnmx_st(
             self,
-            edge_generator=lambda x: BaseGraphOps.edges_of(self, x),
+            edge_generator=lambda x: BaseGraphEdgeOps.edges_of(self, x),
             weight_function=weight_fn,
             is_min=False,
         )
         return t, L
 
-    def find_articulation_points(self) -> Set[Node]:
+    def _lowpoints(
+        self,
+    ) -> Tuple[List[int], List[int], List[int], Set[int]]:
         """!
-        \brief find articulation points in the given graph instance
+        \brief visit numbers, low points and dfs parents of every node
+
+        Runs a single Hopcroft-Tarjan depth first traversal over the graph's
+        CSR snapshot with one seed per component. Articulation points and
+        bridges are both read off the same result, which is computed once
+        and kept.
 
-        Applies the parent's Graph.find_articulation_points() function with
-        a different graph making function.
-        \see Graph.find_articulation_points() for more information
+        \see BaseGraphSearcher.dfs_lowpoints_csr() for more information
+
+        \return (num, low, parent, roots) where roots holds the seeds with
+        more than one child in the dfs tree
         """
+        if self._lows is None:
+            csr = self._ensure_csr()
+            nb_nodes = len(csr[2])
+            num = [-1] * nb_nodes
+            low = [-1] * nb_nodes
+            parent = [-1] * nb_nodes
+            roots: Set[int] = set()
+            for i in range(nb_nodes):
+                if num[i] < 0:
+                    nb_children = BaseGraphSearcher.dfs_lowpoints_csr(
+                        csr, start=i, num=num, low=low, parent=parent
+                    )
+                    if nb_children > 1:
+                        roots.add(i)
+            self._lows = (num, low, parent, roots)
+        return self._lows
 
-        def gmaker(x):
-            return self.from_graph(BaseGraphAlgOps.subtract(self, x))
+    def find_articulation_points(self) -> Set[Node]:
+        """!
+        \brief find articulation points in the given graph instance
 
-        return BaseGraphNodeAnalyzer.find_articulation_points(
-            g=self, graph_maker=gmaker, result=self.graph_props
-        )
+        A seed is an articulation point if it has more than one child in the
+        dfs tree, any other node p is one if some child v of p can not reach
+        above p, that is low[v] >= num[p].
+        \see _lowpoints()
+        """
+        num, low, parent, points = self._lowpoints()
+        points = set(points)
+        for v, p in enumerate(parent):
+            if p >= 0 and parent[p] >= 0 and low[v] >= num[p]:
+                points.add(p)
+        id_of_idx = self._ensure_csr()[2]
+        V: Dict[str, Node] = {v.id(): v for v in self.V}
+        return set([V[id_of_idx[i]] for i in points])
 
     def find_bridges(self) -> Set[Edge]:
         """!
         \brief find bridges in the given graph instance
 
-        Applies the parent's Graph.find_bridges() function with
-        a different graph making function.
-        \see Graph.find_bridges() for more information
+        A tree edge (p, v) of the dfs is a bridge if v can not reach p or
+        above without it, that is low[v] > num[p]. Parallel edges are never
+        bridges.
+        \see _lowpoints()
         """
-
-        def gmaker(x):
-            return self.from_graph(BaseGraphAlgOps.subtract(self, x))
-
-        return BaseGraphEdgeAnalyzer.find_bridges(
-            g=self, graph_maker=gmaker, result=self.graph_props
-        )
+        num, low, parent, _ = self._lowpoints()
+        id_of_idx = self._ensure_csr()[2]
+        bridges: Set[Edge] = set()
+        for v, p in enumerate(parent):
+            if p >= 0 and low[v] > num[p]:
+                a, b = id_of_idx[p], id_of_idx[v]
+                key = (a, b) if a <= b else (b, a)
+                edges = self._edge_index[key]
+                if len(edges) == 1:
+                    bridges.add(edges[0])
+        return bridges
 
     def bron_kerbosch(
         self, P: Set[Node], R: Set[Node], X: Set[Node], Cs: List[Set[Node]]
@@ -411,19 +411,19 @@ class BaseGraphEdgeOps:
         \throws ValueError if any of argument nodes are not inside the graph.
         \throws ValueError if there are no edges that consist of argument nodes.
         """
-        if not BaseGraphBoolOps.is_in(g, start) or not BaseGraphBoolOps.is_in(
-            g, end
-        ):
-            raise ValueError("one of the nodes is not present in graph")
+        index = getattr(g, "_edge_index", None)
+        if index is None:
+            index = BaseGraphOps.to_edge_index(g)
         n1id = start.id()
         n2id = end.id()
-        gdata = BaseGraphOps.to_edgelist(g)
-        first_eset = set(gdata[n1id])
-        second_eset = set(gdata[n2id])
-        common_edge_ids = first_eset.intersection(second_eset)
-        if len(common_edge_ids) == 0:
+        key = (n1id, n2id) if n1id <= n2id else (n2id, n1id)
+        edges = index.get(key)
+        if edges is None:
+            start_in = BaseGraphBoolOps.is_in(g, start)
+            if not start_in or not BaseGraphBoolOps.is_in(g, end):
+                raise ValueError("one of the nodes is not present in graph")
             raise ValueError("No common edges between given nodes")
-        return set([e for e in g.E if e.id() in common_edge_ids])
+        return set(edges)
 
 
 class BaseGraphNodeOps:
@@ -523,13 +523,13 @@ class BaseGraphNodeOps:
 
         \endcode
         """
-        if not BaseGraphBoolOps.is_in(g, n1):
+        adj = getattr(g, "_adj", None)
+        if adj is None:
+            adj = BaseGraphOps.to_adjacency(g)
+        nid = n1.id()
+        if nid not in adj:
             raise ValueError("node is not in graph")
-        neighbours = set()
-        for n2 in g.V:
-            if BaseGraphBoolOps.is_neighbour_of(g, n1=n1, n2=n2) is True:
-                neighbours.add(n2)
-        return neighbours
+        return set(adj[nid].values())
 
     @staticmethod
     def vertex_by_id(g: AbstractGraph, node_id: str) -> AbstractNode:
@@ -583,6 +583,115 @@ class BaseGraphOps:
                     gdata[node_id].append(edge.id())
         return gdata
 
+    @staticmethod
+    def to_adjacency(
+        g: AbstractGraph,
+    ) -> Dict[str, Dict[str, AbstractNode]]:
+        """!
+        \brief Create adjacency index of graph
+
+        For each node identifier we register the identifiers of nodes with
+        which it shares an edge along with the nodes themselves. The
+        direction of edges is not taken into account, which is in line with
+        BaseGraphBoolOps.is_neighbour_of()
+        """
+        adj: Dict[str, Dict[str, AbstractNode]] = {v.id(): {} for v in g.V}
+        for edge in g.E:
+            estart = edge.start()
+            eend = edge.end()
+            sid = estart.id()
+            eid = eend.id()
+            adj.setdefault(sid, {})[eid] = eend
+            adj.setdefault(eid, {})[sid] = estart
+        return adj
+
+    @staticmethod
+    def to_edge_index(
+        g: AbstractGraph,
+    ) -> Dict[Tuple[str, str], List[AbstractEdge]]:
+        """!
+        \brief Create an index of edges by the identifiers of their vertices
+
+        Keys are the sorted pair of vertex identifiers, so that the direction
+        of edges is not taken into account.
+        """
+        index: Dict[Tuple[str, str], List[AbstractEdge]] = {}
+        for edge in g.E:
+            sid = edge.start().id()
+            eid = edge.end().id()
+            key = (sid, eid) if sid <= eid else (eid, sid)
+            index.setdefault(key, []).append(edge)
+        return index
+
+    @staticmethod
+    def to_csr(
+        g: AbstractGraph,
+    ) -> Tuple[List[int], List[int], List[str], Dict[str, int]]:
+        """!
+        \brief Create compressed sparse row representation of graph
+
+        Nodes are numbered by the sorted order of their identifiers. The
+        neighbours of node with index i are found in
+        indices[indptr[i]:indptr[i+1]]. Undirected edges are registered in
+        both directions, directed edges only from their start to their end.
+
+        \return tuple of (indptr, indices, id_of_idx, idx_of_id)
+        """
+        id_of_idx: List[str] = sorted(v.id() for v in g.V)
+        idx_of_id: Dict[str, int] = {
+            nid: i for i, nid in enumerate(id_of_idx)
+        }
+        adj: List[List[int]] = [[] for _ in id_of_idx]
+        for edge in g.E:
+            s = idx_of_id[edge.start().id()]
+            e = idx_of_id[edge.end().id()]
+            adj[s].append(e)
+            if edge.type() == EdgeType.UNDIRECTED and s != e:
+                adj[e].append(s)
+        indptr: List[int] = [0]
+        indices: List[int] = []
+        for neighbours in adj:
+            indices.extend(neighbours)
+            indptr.append(len(indices))
+        return indptr, indices, id_of_idx, idx_of_id
+
+    @staticmethod
+    def to_weighted_csr(
+        g: AbstractGraph, weight_fn: Callable[[AbstractEdge], float]
+    ) -> Tuple[List[int], List[int], List[float], List[str], Dict[str, int]]:
+        """!
+        \brief Create compressed sparse row representation of graph along
+        with edge weights
+
+        Same layout as to_csr() with an additional weights list that is
+        parallel to indices.
+
+        \param weight_fn weighting function for edges
+
+        \return tuple of (indptr, indices, weights, id_of_idx, idx_of_id)
+        """
+        id_of_idx: List[str] = sorted(v.id() for v in g.V)
+        idx_of_id: Dict[str, int] = {
+            nid: i for i, nid in enumerate(id_of_idx)
+        }
+        adj: List[List[Tuple[int, float]]] = [[] for _ in id_of_idx]
+        for edge in g.E:
+            s = idx_of_id[edge.start().id()]
+            e = idx_of_id[edge.end().id()]
+            w = weight_fn(edge)
+            adj[s].append((e, w))
+            if edge.type() == EdgeType.UNDIRECTED and s != e:
+                adj[e].append((s, w))
+        indptr: List[int] = [0]
+        indices: List[int] = []
+        weights: List[float] = []
+        for neighbours in adj:
+            for v, w in neighbours:
+                indices.append(v)
+                weights.append(w)
+            indptr.append(len(indices))
+        return indptr, indices, weights, id_of_idx, idx_of_id
+
     @staticmethod
     def to_adjmat(g: AbstractGraph, vtype=int) -> Dict[Tuple[str, str], int]:
         """!
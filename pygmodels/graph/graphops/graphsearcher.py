@@ -1,7 +1,10 @@
 """!
 Traverse graphs in some fashion
 """
+import heapq
 import math
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from typing import Callable, Dict, List, Optional, Set, Tuple, Union
 
 from pygmodels.graph.graphops.graphops import (
@@ -18,8 +21,8 @@ from pygmodels.graph.gtype.abstractobj import (
 from pygmodels.graph.gtype.gsearchresult import (
     BaseGraphBFSResult,
     BaseGraphDFSResult,
+    SearchNode,
 )
-from pygmodels.graph.gtype.queue import PriorityQueue
 
 
 class BaseGraphSearcher:
@@ -223,7 +226,7 @@ class BaseGraphSearcher:
         if not BaseGraphBoolOps.is_in(g, n1):
             raise ValueError("argument node is not in graph")
         nid = n1.id()
-        Q = [nid]
+        Q = deque([nid])
         V: Dict[str, AbstractNode] = {v.id(): v for v in g.V}
         l_vs = {v: math.inf for v in V}
         l_vs[nid] = 0
@@ -231,7 +234,7 @@ class BaseGraphSearcher:
         P: Dict[str, Dict[str, str]] = {}
         P[nid] = {}
         while Q:
-            u = Q.pop(0)
+            u = Q.popleft()
             unode = V[u]
             for edge in edge_generator(unode):
                 vnode = edge.get_other(unode)
@@ -251,6 +254,290 @@ class BaseGraphSearcher:
             data={},
         )
 
+    @staticmethod
+    def breadth_first_search_csr(
+        g: AbstractGraph,
+        n1: AbstractNode,
+        csr: Tuple[List[int], List[int], List[str], Dict[str, int]],
+    ) -> BaseGraphBFSResult:
+        """!
+        \brief find shortest path from given node to all other nodes
+
+        Same as breadth_first_search() but the traversal walks the integer
+        indices of a compressed sparse row snapshot instead of generating
+        edges for each visited node. The search is level synchronous: the
+        neighbours of a whole frontier are gathered by slicing the index
+        list, and only the unseen ones make up the next frontier.
+        Visited nodes are flagged in a bytearray indexed by node index.
+        Identifiers are restored when the result is built.
+
+        \param csr (indptr, indices, id_of_idx, idx_of_id) as returned by
+        BaseGraphOps.to_csr
+
+        \throws ValueError if given node is not found in graph instance
+        """
+        if not BaseGraphBoolOps.is_in(g, n1):
+            raise ValueError("argument node is not in graph")
+        indptr, indices, id_of_idx, idx_of_id = csr
+        nid = n1.id()
+        s = idx_of_id[nid]
+        level: List[float] = [math.inf] * len(id_of_idx)
+        level[s] = 0
+        seen = bytearray(len(id_of_idx))
+        seen[s] = 1
+        reached = [s]
+        frontier = [s]
+        depth = 0
+        P: Dict[str, Dict[str, str]] = {nid: {}}
+        tree = P[nid]
+        while frontier:
+            depth += 1
+            next_frontier: List[int] = []
+            for u in frontier:
+                for v in indices[indptr[u] : indptr[u + 1]]:
+                    if not seen[v]:
+                        seen[v] = 1
+                        level[v] = depth
+                        tree[id_of_idx[u]] = id_of_idx[v]
+                        next_frontier.append(v)
+            reached.extend(next_frontier)
+            frontier = next_frontier
+        #
+        V: Dict[str, AbstractNode] = {v.id(): v for v in g.V}
+        T = set([V[id_of_idx[i]] for i in reached])
+        l_vs = {id_of_idx[i]: lv for i, lv in enumerate(level)}
+        path_props = {"bfs-tree": P, "path-set": T, "top-sort": l_vs}
+        return BaseGraphBFSResult(
+            props=path_props,
+            result_id="bfs-result-of-" + g.id(),
+            search_name="breadth_first_search",
+            data={},
+        )
+
+    @staticmethod
+    def dfs_lowpoints_csr(
+        csr: Tuple[List[int], List[int], List[str], Dict[str, int]],
+        start: int,
+        num: List[int],
+        low: List[int],
+        parent: List[int],
+    ) -> int:
+        """!
+        \brief compute visit numbers and low points of the component
+        containing start
+
+        Iterative depth first search working only on the integer indices of
+        the compressed sparse row snapshot. Each frame of the stack resumes
+        from a cursor into the index list, so nodes are neither hashed nor
+        looked up through their identifiers.
+
+        \param csr (indptr, indices, id_of_idx, idx_of_id) as returned by
+        BaseGraphOps.to_csr
+        \param start index of the seed node
+        \param num visit numbers, -1 for nodes that are not visited yet
+        \param low low points, filled for visited nodes
+        \param parent dfs tree parents, -1 for the seed
+
+        \return number of children of the seed in the dfs tree
+        """
+        indptr, indices = csr[0], csr[1]
+        num[start] = 0
+        low[start] = 0
+        parent[start] = -1
+        counter = 1
+        nb_children = 0
+        stack = [start]
+        cursor: Dict[int, int] = {start: indptr[start]}
+        while stack:
+            v = stack[-1]
+            j = cursor[v]
+            end = indptr[v + 1]
+            descended = False
+            while j < end:
+                u = indices[j]
+                j += 1
+                if num[u] < 0:
+                    # tree edge
+                    parent[u] = v
+                    num[u] = counter
+                    low[u] = counter
+                    counter += 1
+                    if v == start:
+                        nb_children += 1
+                    cursor[v] = j
+                    cursor[u] = indptr[u]
+                    stack.append(u)
+                    descended = True
+                    break
+                elif u != parent[v] and num[u] < low[v]:
+                    # back edge
+                    low[v] = num[u]
+            if descended:
+                continue
+            stack.pop()
+            p = parent[v]
+            if p >= 0 and low[v] < low[p]:
+                low[p] = low[v]
+        return nb_children
+
+    @staticmethod
+    def multi_source_bfs_csr(
+        csr: Tuple[List[int], List[int], List[str], Dict[str, int]],
+        sources: List[int],
+        width: int = 64,
+    ) -> List[List[float]]:
+        """!
+        \brief find unweighted distances from several sources at once
+
+        Bit parallel breadth first search. Sources are packed into integer
+        bitmasks, one bit per source, for batches of at most width sources.
+        Each level propagates the masks of the frontier across the snapshot
+        with bitwise or, so that one traversal serves the whole batch.
+
+        \param csr (indptr, indices, id_of_idx, idx_of_id) as returned by
+        BaseGraphOps.to_csr
+        \param sources node indices of the sources
+        \param width number of sources handled by a single traversal
+
+        \return a row of distances per source, indexed by node index.
+        Unreachable nodes are at infinite distance.
+        """
+        indptr, indices, id_of_idx, idx_of_id = csr
+        nb_nodes = len(id_of_idx)
+        rows: List[List[float]] = [[math.inf] * nb_nodes for _ in sources]
+        for offset in range(0, len(sources), width):
+            batch = sources[offset : offset + width]
+            visited: List[int] = [0] * nb_nodes
+            frontier: Dict[int, int] = {}
+            for k, src in enumerate(batch):
+                visited[src] |= 1 << k
+                frontier[src] = frontier.get(src, 0) | (1 << k)
+                rows[offset + k][src] = 0
+            level = 0
+            while frontier:
+                level += 1
+                reached: Dict[int, int] = {}
+                for u, mask in frontier.items():
+                    for v in indices[indptr[u] : indptr[u + 1]]:
+                        reached[v] = reached.get(v, 0) | mask
+                frontier = {}
+                for v, mask in reached.items():
+                    new = mask & ~visited[v]
+                    if new == 0:
+                        continue
+                    visited[v] |= new
+                    frontier[v] = new
+                    while new:
+                        low = new & -new
+                        rows[offset + low.bit_length() - 1][v] = level
+                        new ^= low
+        return rows
+
+    @staticmethod
+    def all_pairs_bfs_csr(
+        csr: Tuple[List[int], List[int], List[str], Dict[str, int]],
+        nb_workers: int = 1,
+        width: int = 64,
+    ) -> List[List[float]]:
+        """!
+        \brief find unweighted distances between every pair of nodes
+
+        Sources are cut into batches of width nodes, each batch being
+        handled by multi_source_bfs_csr(). Batches are independent of each
+        other, so when nb_workers is larger than one they are dispatched to a
+        pool of processes, each receiving its own copy of the snapshot.
+
+        \param csr (indptr, indices, id_of_idx, idx_of_id) as returned by
+        BaseGraphOps.to_csr
+        \param nb_workers number of worker processes
+        \param width number of sources handled by a single traversal
+
+        \return a row of distances per node, indexed by node index
+        """
+        nb_nodes = len(csr[2])
+        batches = [
+            list(range(start, min(start + width, nb_nodes)))
+            for start in range(0, nb_nodes, width)
+        ]
+        if nb_workers <= 1 or len(batches) <= 1:
+            rows_per_batch = [
+                BaseGraphSearcher.multi_source_bfs_csr(csr, b, width)
+                for b in batches
+            ]
+        else:
+            with ProcessPoolExecutor(max_workers=nb_workers) as executor:
+                rows_per_batch = list(
+                    executor.map(
+                        BaseGraphSearcher.multi_source_bfs_csr,
+                        [csr] * len(batches),
+                        batches,
+                        [width] * len(batches),
+                    )
+                )
+        return [row for rows in rows_per_batch for row in rows]
+
+    @staticmethod
+    def delta_stepping(
+        wcsr: Tuple[
+            List[int], List[int], List[float], List[str], Dict[str, int]
+        ],
+        source: int,
+        delta: float = 1.0,
+    ) -> List[float]:
+        """!
+        \brief single source shortest path lengths with delta stepping
+
+        Meyer and Sanders 2003. Tentative distances are kept in buckets of
+        width delta. The smallest non empty bucket is settled by relaxing
+        light edges, those not heavier than delta, until the bucket stays
+        empty. Heavy edges of the settled nodes are relaxed once afterwards.
+
+        \param wcsr (indptr, indices, weights, id_of_idx, idx_of_id) as
+        returned by BaseGraphOps.to_weighted_csr
+        \param source index of the source node
+        \param delta bucket width
+
+        \throws ValueError if delta is not positive or a weight is negative
+
+        \return distances from source indexed by node index
+        """
+        if delta <= 0:
+            raise ValueError("delta must be positive")
+        indptr, indices, weights = wcsr[0], wcsr[1], wcsr[2]
+        if any(w < 0 for w in weights):
+            raise ValueError("delta stepping requires non negative weights")
+        dist: List[float] = [math.inf] * len(wcsr[3])
+        buckets: Dict[int, Set[int]] = {}
+
+        def relax(v: int, d: float):
+            if d < dist[v]:
+                if dist[v] != math.inf:
+                    old = buckets.get(int(dist[v] // delta))
+                    if old is not None:
+                        old.discard(v)
+                dist[v] = d
+                buckets.setdefault(int(d // delta), set()).add(v)
+
+        relax(source, 0)
+        while buckets:
+            i = min(buckets)
+            settled: Set[int] = set()
+            while buckets.get(i):
+                requests = buckets.pop(i)
+                settled.update(requests)
+                for u in requests:
+                    du = dist[u]
+                    for j in range(indptr[u], indptr[u + 1]):
+                        if weights[j] <= delta:
+                            relax(indices[j], du + weights[j])
+            buckets.pop(i, None)
+            for u in settled:
+                du = dist[u]
+                for j in range(indptr[u], indptr[u + 1]):
+                    if weights[j] > delta:
+                        relax(indices[j], du + weights[j])
+        return dist
+
     @staticmethod
     def uniform_cost_search(
         g: AbstractGraph,
@@ -262,58 +549,64 @@ class BaseGraphSearcher:
         costfn: Callable[[AbstractEdge, float], float] = lambda x, y: y + 1.0,
         is_min=True,
         problem_set: Optional[Set[AbstractEdge]] = None,
-    ) -> Tuple[
-        Dict[str, Union[int, AbstractNode, AbstractEdge, str]],
-        Tuple[AbstractEdge],
-    ]:
+    ) -> Tuple[Tuple[AbstractEdge], SearchNode]:
         """!
         Apply uniform cost search to given problem set
+
+        The frontier is a binary heap of (key, tiebreaker, search node)
+        entries. Instead of looking for a node inside the frontier, we keep
+        the best cost found so far for each state and push a new entry only
+        when a strictly better cost is found. Outdated entries are skipped
+        when they are popped. Search nodes are SearchNode records linked to
+        their parents.
         """
         if not BaseGraphBoolOps.is_in(g, start) or not BaseGraphBoolOps.is_in(
             g, goal
         ):
             raise ValueError("Start node or goal node is not in graph")
         problem_set = g.E if problem_set is None else problem_set
-        pnode = {"cost": 0, "state": start.id(), "parent": None, "edge": None}
-        frontier = PriorityQueue(is_min=is_min)
-        frontier.insert(key=pnode["cost"], val=pnode)
+        goal_id = goal.id()
+        sign = 1 if is_min else -1
+        pnode = SearchNode(state=start.id(), cost=0, parent=None, edge=None)
+        tiebreaker = 0
+        frontier: List[Tuple[float, int, SearchNode]] = [
+            (0, tiebreaker, pnode)
+        ]
+        best_cost: Dict[str, float] = {pnode.state: 0}
         explored: Set[str] = set()
-        while len(frontier) != 0:
-            key, pn = frontier.pop()
-            if pn["state"] == goal.id():
+        while frontier:
+            key, _, pn = heapq.heappop(frontier)
+            state = pn.state
+            if state in explored:
+                continue
+            if state == goal_id:
                 return BaseGraphSearcher.from_ucs_result(pn), pn
-            explored.add(pn["state"])
-            for child_edge in filter_fn(problem_set, pn["state"]):
-                child: AbstractNode = child_edge.get_other(pn["state"])
-                cnode = {
-                    "cost": costfn(child_edge, pn["cost"]),
-                    "state": child.id(),
-                    "parent": pn,
-                    "edge": child_edge,
-                }
-                if (child.id() not in explored) or (
-                    frontier.is_in(child, cmp_f=lambda x: x["state"]) is False
-                ):
-                    frontier.insert(cnode["cost"], cnode)
-                elif frontier.is_in(child, cmp_f=lambda x: x["state"]) is True:
-                    # node is already in frontier
-                    ckey = frontier.key(child, f=lambda x: x["state"])
-                    if ckey > cnode["cost"]:
-                        frontier.insert(
-                            cnode["cost"], cnode, f=lambda x: x["state"]
-                        )
+            explored.add(state)
+            for child_edge in filter_fn(problem_set, state):
+                child: AbstractNode = child_edge.get_other(state)
+                cid = child.id()
+                if cid in explored:
+                    continue
+                ccost = costfn(child_edge, pn.cost)
+                if sign * ccost < sign * best_cost.get(cid, sign * math.inf):
+                    best_cost[cid] = ccost
+                    cnode = SearchNode(
+                        state=cid, cost=ccost, parent=pn, edge=child_edge
+                    )
+                    tiebreaker += 1
+                    heapq.heappush(
+                        frontier, (sign * ccost, tiebreaker, cnode)
+                    )
 
     @staticmethod
-    def from_ucs_result(
-        ucs_solution: Dict[str, Union[int, AbstractNode, AbstractEdge, str]]
-    ) -> Tuple[AbstractEdge]:
+    def from_ucs_result(ucs_solution: SearchNode) -> Tuple[AbstractEdge]:
         """!
         parse uniform cost search solution to create a path
         """
-        edges = [ucs_solution["edge"]]
-        while ucs_solution["parent"] is not None:
-            ucs_solution = ucs_solution["parent"]
-            edges.append(ucs_solution["edge"])
+        edges = [ucs_solution.edge]
+        while ucs_solution.parent is not None:
+            ucs_solution = ucs_solution.parent
+            edges.append(ucs_solution.edge)
         edges.pop()  # last element edge is None
         edges = tuple(reversed(edges))
         return edges
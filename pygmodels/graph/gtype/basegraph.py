@@ -2,7 +2,16 @@
 \file basegraph.py Absolute basic graph which implements the most basic
 functionality for doing graph theoretical operations
 """
-from typing import Callable, Dict, FrozenSet, List, Optional, Set, Union
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 from uuid import uuid4
 
 from pygmodels.graph.graphops.graphops import (
@@ -44,6 +53,16 @@ class BaseGraph(GraphObject, AbstractGraph):
         self._edges: FrozenSet[AbstractEdge] = frozenset(edges)
         #
         self.gdata: Dict[str, List[str]] = BaseGraphOps.to_edgelist(self)
+        self._adj: Dict[
+            str, Dict[str, AbstractNode]
+        ] = BaseGraphOps.to_adjacency(self)
+        self._edge_index: Dict[
+            Tuple[str, str], List[AbstractEdge]
+        ] = BaseGraphOps.to_edge_index(self)
+        self._csr: Optional[
+            Tuple[List[int], List[int], List[str], Dict[str, int]]
+        ] = None
+        self._node_index: Optional[Dict[str, AbstractNode]] = None
         if self._nodes is not None:
             self.is_empty = len(self._nodes) == 0
         else:
@@ -171,6 +190,110 @@ class BaseGraph(GraphObject, AbstractGraph):
             raise ValueError("Edges are None for this graph")
         return self._edges
 
+    def neighbours_ids(self, u_id: str) -> Set[str]:
+        """!
+        \brief Obtain identifiers of neighbours of the given node
+
+        \param u_id identifier of the node whose neighbours we want
+
+        \throws ValueError if node is not in graph
+        """
+        if u_id not in self._adj:
+            raise ValueError("node is not in graph")
+        return set(self._adj[u_id])
+
+    def _tarjan_ap_iter(
+        self,
+        start: str,
+        neighbours_fn: Callable[[AbstractNode], Set[AbstractNode]],
+    ) -> Set[str]:
+        """!
+        \brief find articulation points of the component containing start
+        with a single iterative depth first search
+
+        Hopcroft-Tarjan algorithm as in Erciyes 2018, p. 230, algorithm 8.3.
+        Instead of recursing, we keep an explicit stack of (node id,
+        neighbour iterator) frames, so that deep graphs do not hit the
+        recursion limit. The visit number and the low point of a node are set
+        when it is first reached, and the low point of its parent is updated
+        once its neighbours are exhausted. The root is a separating vertex
+        only if it has more than one child in the dfs tree.
+
+        \param start identifier of the node from which we start the search
+        \param neighbours_fn generates neighbours of a given node
+
+        \return identifiers of separating vertices
+        """
+        V = self._ensure_node_index()
+        num: Dict[str, int] = {start: 0}
+        low: Dict[str, int] = {start: 0}
+        parent: Dict[str, Optional[str]] = {start: None}
+        aset: Set[str] = set()
+        counter = 1
+        nb_root_children = 0
+        stack = [(start, iter(neighbours_fn(V[start])))]
+        while stack:
+            v, neighbours = stack[-1]
+            descended = False
+            for unode in neighbours:
+                u = unode.id()
+                if u not in num:
+                    # tree edge
+                    parent[u] = v
+                    num[u] = counter
+                    low[u] = counter
+                    counter += 1
+                    if v == start:
+                        nb_root_children += 1
+                    stack.append((u, iter(neighbours_fn(V[u]))))
+                    descended = True
+                    break
+                elif u != parent[v]:
+                    # back edge
+                    low[v] = min(low[v], num[u])
+            if descended:
+                continue
+            stack.pop()
+            p = parent[v]
+            if p is not None:
+                low[p] = min(low[p], low[v])
+                if p != start and low[v] >= num[p]:
+                    aset.add(p)
+        if nb_root_children > 1:
+            aset.add(start)
+        return aset
+
+    def _ensure_csr(
+        self,
+    ) -> Tuple[List[int], List[int], List[str], Dict[str, int]]:
+        """!
+        \brief Obtain the compressed sparse row snapshot of the graph
+
+        The snapshot is built on first use and kept afterwards. Node and
+        edge sets of a graph do not change after construction, so there is
+        nothing to invalidate.
+
+        \see BaseGraphOps.to_csr
+        """
+        csr = getattr(self, "_csr", None)
+        if csr is None:
+            csr = BaseGraphOps.to_csr(self)
+            self._csr = csr
+        return csr
+
+    def _ensure_node_index(self) -> Dict[str, AbstractNode]:
+        """!
+        \brief Obtain the nodes of the graph keyed by their identifiers
+
+        The index is built on first use and kept afterwards, like the
+        compressed sparse row snapshot \see BaseGraph._ensure_csr
+        """
+        index = getattr(self, "_node_index", None)
+        if index is None:
+            index = {v.id(): v for v in self.V}
+            self._node_index = index
+        return index
+
     @classmethod
     def from_edgeset(cls, edges: Set[AbstractEdge]):
         """!
@@ -1,6 +1,7 @@
 """
 object contained in a graph
 """
+import sys
 from copy import deepcopy
 
 from pygmodels.graph.gtype.abstractobj import AbstractGraphObj
@@ -9,8 +10,20 @@ from pygmodels.graph.gtype.abstractobj import AbstractGraphObj
 class GraphObject(AbstractGraphObj):
     """!object contained in a graph"""
 
+    ## number of data updates made to any graph object, so that values
+    ## derived from the data of objects can tell whether it has changed
+    data_version = 0
+
     def __init__(self, oid: str, odata={}):
-        """!"""
+        """!
+        \brief graph object with an identifier and data
+
+        String identifiers are interned, so that the many dicts keyed by
+        identifiers, for example the tables of factors, match them by
+        identity.
+        """
+        if type(oid) is str:
+            oid = sys.intern(oid)
         self.object_id = oid
         self.object_data = odata
 
@@ -28,7 +41,9 @@ class GraphObject(AbstractGraphObj):
     def clear_data(self):
         """!"""
         self.object_data.clear()
+        GraphObject.data_version += 1
 
     def update_data(self, ndata: dict):
         """!"""
         self.object_data.update(ndata)
+        GraphObject.data_version += 1
@@ -1,6 +1,7 @@
 """!
 Graph search result
 """
+from collections import namedtuple
 from typing import Callable, Dict, List, Optional, Set, Tuple, Union
 
 from pygmodels.graph.gtype.abstractobj import (
@@ -12,6 +13,25 @@ from pygmodels.graph.gtype.abstractobj import (
 from pygmodels.graph.gtype.graphobj import GraphObject
 
 
+class SearchNode(
+    namedtuple("SearchNode", ["state", "cost", "parent", "edge"])
+):
+    """!
+    \brief Search node of uniform cost search
+
+    A fixed field record for the nodes expanded during a search. Fields can
+    be read as attributes or by name as in search_node["cost"], which is how
+    the dict based search nodes used to be read.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return getattr(self, key)
+        return super().__getitem__(key)
+
+
 class BaseGraphSearchResult(GraphObject, AbstractSearchResult):
     """"""
 
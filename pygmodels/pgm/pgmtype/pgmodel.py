@@ -95,6 +95,12 @@ class PGModel(Graph):
         else:
             self.Fs = factors
 
+        ## minimum spanning trees of the model keyed by their weight function,
+        ## each kept with the edge weights it was computed from. The edge set
+        ## of a model does not change after construction, but edge data may,
+        ## so users compare the weights before reusing a tree.
+        self._mst_cache: Dict[Callable, Tuple[tuple, tuple]] = {}
+
     def markov_blanket(self, t: NumCatRVariable) -> Set[NumCatRVariable]:
         """!
         get markov blanket of a node from K. Murphy, 2012, p. 662
@@ -426,7 +432,7 @@ class PGModel(Graph):
         """
         assignments, factors, z_phi = self.max_product_ve(evidences=evidences)
         probs = set()
-        for f in FactorOps.cartesian(z_phi):
+        for f in FactorOps.iter_cartesian(z_phi):
             probs.add(z_phi.phi(f))
         return max(probs)
 
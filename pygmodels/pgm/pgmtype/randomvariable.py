@@ -3,8 +3,7 @@ Implementation of a random variable
 """
 
 import math
-from random import choice
-from typing import Any, Callable, Dict, FrozenSet, List, Set, Tuple
+from typing import Any, Callable, Dict, FrozenSet, List, Set, Tuple, Union
 from uuid import uuid4
 
 from pygmodels.graph.gtype.node import Node
@@ -64,8 +63,8 @@ class CatRandomVariable(RandomVariable):
         node_id: str,
         input_data: Dict[str, Any],
         f: Callable[[Outcome], CodomainValue] = lambda x: x,
-        marginal_distribution: Callable[
-            [CodomainValue], float
+        marginal_distribution: Union[
+            Callable[[CodomainValue], float], Dict[CodomainValue, float]
         ] = lambda x: 1.0,
     ):
         """!
@@ -74,7 +73,10 @@ class CatRandomVariable(RandomVariable):
         \param marginal_distribution a function that takes in a value from
         codomain of the random variable and outputs a value in the range [0,1].
         Notice that is not a local distribution, it should be the marginal
-        distribution that is independent of local structure.
+        distribution that is independent of local structure. A tabulated
+        distribution can also be given as a dict from values to
+        probabilities. Its lookup is then used as the distribution function
+        directly, which avoids an intermediate python function call.
 
         \throws ValueError We raise a value error if the probability values
         associated to outcomes add up to a value bigger than one.
@@ -111,13 +113,17 @@ class CatRandomVariable(RandomVariable):
 
         \endcode
         """
-        data = {}
-        data.update(input_data)
+        data = dict(input_data)
         if "possible-outcomes" in input_data:
-            data["outcome-values"] = frozenset(
-                [f(v) for v in input_data["possible-outcomes"].data]
+            # distinct outcome values in the order they are first obtained
+            data["outcome-values"] = tuple(
+                dict.fromkeys(
+                    f(v) for v in input_data["possible-outcomes"].data
+                )
             )
         super().__init__(node_id=node_id, data=data, f=f)
+        if isinstance(marginal_distribution, dict):
+            marginal_distribution = marginal_distribution.__getitem__
         if "outcome-values" in data:
             psum = sum(
                 list(map(marginal_distribution, data["outcome-values"]))
@@ -181,7 +187,7 @@ class CatRandomVariable(RandomVariable):
         >>>    marginal_distribution=grade_distribution
         >>> )
         >>> rvar.values()
-        >>> frozenset(["A", "F"])
+        >>> ("A", "F")
 
         \endcode
         """
@@ -343,10 +349,13 @@ class NumCatRVariable(CatRandomVariable):
 
         \endcode
         """
+        # class identity is the common case and avoids walking the mro
+        if other.__class__ is NumCatRVariable:
+            return
         if isinstance(other, NumCatRVariable) is False:
             raise TypeError(
                 "other arg must be of type NumCatRVariable, it is "
-                + type(other)
+                + type(other).__name__
             )
 
     def has_evidence(self) -> None:
@@ -433,8 +442,7 @@ class NumCatRVariable(CatRandomVariable):
 
         \endcode
         """
-        mx, mxv = self.min_max_marginal_with_outcome(is_min=False)
-        return mx
+        return max(map(self.marginal, self.values()), default=float("-inf"))
 
     def min(self) -> float:
         """!
@@ -470,8 +478,7 @@ class NumCatRVariable(CatRandomVariable):
         \endcode
 
         """
-        mx, mxv = self.min_max_marginal_with_outcome(is_min=True)
-        return mx
+        return min(map(self.marginal, self.values()), default=float("inf"))
 
     def min_max_marginal_with_outcome(
         self, is_min: bool
@@ -481,11 +488,15 @@ class NumCatRVariable(CatRandomVariable):
 
         \param is_min flag for specifying whether to return lowest or highest
         probability-outcome pair
+
+        If several outcomes share the highest/lowest probability, the first
+        of them in the order of the outcome values is returned.
         """
         mx = float("inf") if is_min else float("-inf")
         mxv = None
+        _marginal = self.marginal
         for v in self.values():
-            marginal = self.marginal(v)
+            marginal = _marginal(v)
             cond = mx > marginal if is_min else mx < marginal
             if cond:
                 mx = marginal
@@ -571,6 +582,10 @@ class NumCatRVariable(CatRandomVariable):
         Implements the following from Biagini and Campanino 2016, p. 35:
         \f$ \sum_{j=1}^n p(x_i) p(y_j) = p(x_i) \sum_{j=1}^n p(y_j) \f$
 
+        Since the marginal of the evidence is a constant factor, we take it
+        out of the sum and multiply it with the expected value of the other
+        random variable.
+
         \code{.py}
         >>> input_data = {
         >>>    "intelligence": {"outcome-values": [0.1, 0.9], "evidence": 0.9},
@@ -609,8 +624,7 @@ class NumCatRVariable(CatRandomVariable):
         \endcode
         """
         self.type_check(other)
-        marginal = self.marginal(evidence_value)
-        return other.p_x_fn(phi=lambda x: x * marginal)
+        return self.marginal(evidence_value) * other.expected_value()
 
     def marginal_over_evidence_key(self, other):
         """!
@@ -795,7 +809,10 @@ class NumCatRVariable(CatRandomVariable):
         """
         if not self.is_numeric(val):
             raise TypeError("Reduction value must be numeric (int, float)")
-        vs = frozenset([v for v in self.values() if v == val])
+        # outcome values given directly may repeat, the first match is kept
+        # once, as a tuple like the outcome values set at construction
+        match = next((v for v in self.values() if v == val), None)
+        vs = () if match is None else (match,)
         vdata = self.data()
         vdata["outcome-values"] = vs
         self.update_data(vdata)
@@ -916,7 +933,8 @@ class NumCatRVariable(CatRandomVariable):
         implements:
         \f$\sum_{i=1}^n \phi(x_i) p(x_i) \f$
         """
-        return sum(self.apply(lambda x: phi(x) * self.p(x)))
+        _p = self.p
+        return sum(phi(v) * _p(v) for v in self.values())
 
     def apply(self, phi: Callable[[NumericValue], NumericValue]):
         """!
@@ -934,19 +952,36 @@ class NumCatRVariable(CatRandomVariable):
         """!"""
         return self.p_x_fn(phi)
 
+    def _moments(self) -> Tuple[float, float]:
+        """!
+        \brief first and second moments \f$ (E[X], E[X^2]) \f$ computed in a
+        single pass over outcome values
+        """
+        e_x = 0.0
+        e_x2 = 0.0
+        _p = self.p
+        for v in self.values():
+            vp = v * _p(v)
+            e_x += vp
+            e_x2 += v * vp
+        return e_x, e_x2
+
     def variance(self):
         """!
         Koller, Friedman 2009, p. 33
         \f$ E[X^2] - (E[X])^2 \f$
         """
-        E_X2 = self.expected_apply(phi=lambda x: x * x)
-        return E_X2 - (self.expected_value() ** 2)
+        E_X, E_X2 = self._moments()
+        return E_X2 - (E_X ** 2)
 
     def standard_deviation(self):
         """!
         standard deviation Koller, Friedman 2009, p. 33
+
+        Rounding errors can make a zero variance slightly negative, hence we
+        clamp it before taking the square root.
         """
-        return math.sqrt(self.variance())
+        return math.sqrt(max(self.variance(), 0.0))
 
     def mk_new_rvar(self, phi: Callable[[float], float]):
         """!
@@ -956,7 +991,7 @@ class NumCatRVariable(CatRandomVariable):
             node_id=str(uuid4()),
             f=phi,
             input_data=self.data(),
-            distribution=self.dist,
+            marginal_distribution=self.dist,
         )
 
     def joint(self, v):
@@ -984,7 +1019,48 @@ class NumCatRVariable(CatRandomVariable):
         return self.joint(other) / other.P_X_e()
 
     def max_conditional(self, other):
-        """!"""
+        """!
+        max conditional probability
+
+        Since \f$ joint / p \f$ decreases as \f$ p > 0 \f$ increases, the
+        maximum is obtained by dividing the max joint with the smallest
+        positive marginal of the other random variable.
+        """
         self.type_check(other)
         joint = self.max_joint(other)
-        return max([v for v in other.apply_to_marginals(lambda x: joint / x)])
+        min_marginal = min(
+            m for m in map(other.marginal, other.values()) if m > 0
+        )
+        return joint / min_marginal
+
+    @classmethod
+    def batch_joint(cls, rvars: List["NumCatRVariable"]) -> List[List[float]]:
+        """!
+        \brief pairwise joint probabilities of given random variables
+
+        Each \f$ P(X_e) \f$ is evaluated once, and the joint of every pair is
+        read from their outer product, that is the entry \f$ (i, j) \f$ is
+        equal to rvars[i].joint(rvars[j]).
+
+        \param rvars random variables whose joint probabilities we compute
+
+        \throws TypeError if any of the arguments is not a NumCatRVariable
+        """
+        for r in rvars:
+            cls.type_check(r)
+        ps = [r.P_X_e() for r in rvars]
+        return [[pi * pj for pj in ps] for pi in ps]
+
+    @classmethod
+    def batch_conditional(
+        cls, rvars: List["NumCatRVariable"]
+    ) -> List[List[float]]:
+        """!
+        \brief pairwise conditional probabilities of given random variables
+
+        The entry \f$ (i, j) \f$ is equal to rvars[i].conditional(rvars[j]).
+        \see NumCatRVariable.batch_joint
+        """
+        ps = [r.P_X_e() for r in rvars]
+        joints = cls.batch_joint(rvars)
+        return [[jij / pj for jij, pj in zip(ji, ps)] for ji in joints]
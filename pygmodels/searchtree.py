@@ -11,6 +11,33 @@ from gmodels.pgmtypes.pgmodel import PGModel
 from gmodels.pgmtypes.randomvariable import ANDNode, NumCatRVariable, ORNode
 
 
+def _factor_weight(x: Edge) -> float:
+    """!
+    weight of an edge for the spanning tree of the search tree
+    """
+    return x.data()["factor"] if "factor" in x.data() else 1
+
+
+def _minimum_spanning_tree(pmodel: PGModel):
+    """!
+    minimum spanning tree of the model weighted by \see _factor_weight
+
+    The result is cached on the model \see PGModel._mst_cache, so that
+    building several search trees from the same model, say for different
+    evidences, computes the spanning tree only once. It is computed again
+    if the weights of the edges have changed since.
+    """
+    weights = tuple(_factor_weight(e) for e in pmodel.E)
+    cached = pmodel._mst_cache.get(_factor_weight)
+    if cached is None or cached[0] != weights:
+        cached = (
+            weights,
+            pmodel.find_minimum_spanning_tree(weight_fn=_factor_weight),
+        )
+        pmodel._mst_cache[_factor_weight] = cached
+    return cached[1]
+
+
 class OrTree(Tree):
     """!
     Or search tree from pgmodel
@@ -18,32 +45,41 @@ class OrTree(Tree):
 
     def __init__(self, pmodel: PGModel):
         self.model = pmodel
-        (self.mst, self.edge_order) = self.model.find_minimum_spanning_tree(
-            weight_fn=lambda x: x.data()["factor"]
-            if "factor" in x.data()
-            else 1
-        )
+        (self.mst, self.edge_order) = _minimum_spanning_tree(self.model)
         # expand mst to cover values
-        es = set()
+        _uuid4 = uuid4
+        with_evidence = self._with_evidence
+        es = []
         for e in self.mst.edges():
             n = e.start()
             ndata = n.data()
             if "evidence" in ndata:
-                es.add(e)
+                es.append(e)
             else:
-                values = ndata["outcome-values"]
-                for v in values:
-                    ncp = deepcopy(n)
-                    ncp.add_evidence(v)
-                    ne = Edge(
-                        edge_id=str(uuid4()),
-                        edge_type=e.type(),
-                        start_node=ncp,
-                        end_node=e.end(),
-                    )
-                    es.add(ne)
-        #
-        super().__init__(gid=str(uuid4()), edges=es)
+                es.extend(
+                    [
+                        Edge(
+                            edge_id=_uuid4().hex,
+                            edge_type=e.type(),
+                            start_node=with_evidence(n, v),
+                            end_node=e.end(),
+                        )
+                        for v in ndata["outcome-values"]
+                    ]
+                )
+        # Edge hashes its whole string representation. BaseGraph freezes
+        # the edges it receives, and freezing a frozenset is a no-op, so
+        # passing a frozenset hashes every edge exactly once.
+        super().__init__(gid=str(uuid4()), edges=frozenset(es))
+
+    @staticmethod
+    def _with_evidence(n: NumCatRVariable, v) -> NumCatRVariable:
+        """!
+        copy of the given random variable with v as its evidence
+        """
+        ncp = deepcopy(n)
+        ncp.add_evidence(v)
+        return ncp
 
     def highest_probability_path(self, leaf: NumCatRVariable) -> Path:
         """!
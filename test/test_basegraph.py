@@ -65,6 +65,13 @@ class BaseGraphTest(unittest.TestCase):
             self.assertEqual(eid in E, eid in edges)
             self.assertEqual(E[eid], edges[eid])
 
+    def test_neighbours_ids(self):
+        """"""
+        self.assertEqual(self.graph.neighbours_ids("n2"), set(["n1", "n3"]))
+        self.assertEqual(self.graph.neighbours_ids("n4"), set())
+        with self.assertRaises(ValueError):
+            self.graph.neighbours_ids("n5")
+
 
 def suite(verbose=False):
     """"""
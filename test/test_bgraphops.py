@@ -223,6 +223,18 @@ class BaseGraphOpsTest(unittest.TestCase):
             for v in vs:
                 self.assertEqual(v in mdata[k], v in gdata[k])
 
+    def test_to_csr(self):
+        """"""
+        indptr, indices, id_of_idx, idx_of_id = BaseGraphOps.to_csr(
+            self.graph
+        )
+        self.assertEqual(id_of_idx, ["n1", "n2", "n3", "n4"])
+        self.assertEqual(idx_of_id, {"n1": 0, "n2": 1, "n3": 2, "n4": 3})
+        self.assertEqual(indptr, [0, 1, 3, 4, 4])
+        self.assertEqual(indices[0:1], [1])
+        self.assertEqual(sorted(indices[1:3]), [0, 2])
+        self.assertEqual(indices[3:4], [1])
+
     #
     def test_edges_of(self):
         """"""
@@ -262,6 +274,21 @@ class BaseGraphOpsTest(unittest.TestCase):
         e = BaseGraphEdgeOps.edge_by_vertices(self.graph, self.n2, self.n3)
         self.assertEqual(e, set([self.e2]))
 
+    def test_edge_by_vertices_reversed(self):
+        e = BaseGraphEdgeOps.edge_by_vertices(self.graph, self.n3, self.n2)
+        self.assertEqual(e, set([self.e2]))
+
+    def test_to_edge_index(self):
+        index = BaseGraphOps.to_edge_index(self.graph_2)
+        self.assertEqual(
+            index,
+            {
+                ("n1", "n2"): [self.e1],
+                ("n2", "n3"): [self.e2],
+                ("n3", "n4"): [self.e3],
+            },
+        )
+
     def test_edge_by_vertices_n(self):
         check = False
         try:
@@ -212,6 +212,13 @@ class DiGraphTest(unittest.TestCase):
             path_props.path_set, set([self.n1, self.n2, self.n3, self.n4])
         )
 
+    def test_find_shortest_path_lengths(self):
+        """"""
+        lengths = self.dgraph4.find_shortest_path_lengths()
+        self.assertEqual(lengths["n1"]["n4"], 1)
+        self.assertEqual(lengths["n1"]["n3"], 2)
+        self.assertEqual(lengths["n4"]["n1"], float("inf"))
+
     def test_check_for_path_false(self):
         v = self.dgraph4.check_for_path(self.n1, self.a)
         self.assertFalse(v)
@@ -2,16 +2,36 @@
 test for factor.py
 """
 import math
+import pickle
 import unittest
 from random import choice
 
-from pygmodels.factor.factor import Factor
+from pygmodels.factor.factor import Factor, _joint_product
 from pygmodels.factor.factorf.factoranalyzer import FactorNumericAnalyzer
-from pygmodels.factor.factorf.factorops import FactorBoolOps, FactorOps
+from pygmodels.factor.factorf.factorops import (
+    FactorBoolOps,
+    FactorFactorableOps,
+    FactorOps,
+    _decode,
+    _encode,
+    _pair_codes,
+)
+from pygmodels.factor.ftype.basefactor import BaseFactor, _canonical
+from pygmodels.factor.sparsefactor import SparseFactor
 from pygmodels.graph.gtype.edge import Edge, EdgeType
 from pygmodels.pgm.pgmtype.randomvariable import NumCatRVariable
 
 
+def phi_value_sum(scope_product):
+    "module level factor function, so that worker processes can load it"
+    return sum(v for k, v in scope_product)
+
+
+def uniform_half(value):
+    "module level marginal, so that worker processes can load it"
+    return 0.5
+
+
 class TestFactor(unittest.TestCase):
     """!"""
 
@@ -251,6 +271,17 @@ class TestFactor(unittest.TestCase):
         )
         self.assertEqual(set(d), set([self.Af, self.Bf]))
 
+    def test_domain_scope_out_of_domain(self):
+        """"""
+        d = FactorOps.domain_scope(self.AB, domain=[set([("A", 50)])])
+        self.assertEqual(d, set([self.Af]))
+        self.assertRaises(
+            ValueError,
+            FactorOps.domain_scope,
+            self.AB,
+            domain=[set([("A", 50), ("C", 50)])],
+        )
+
     def test_find_var(self):
         """"""
         intuple = FactorOps.find_var(self.f, ids="dice")
@@ -282,12 +313,23 @@ class TestFactor(unittest.TestCase):
     def test_in_scope_f_str(self):
         self.assertFalse("fdsfdsa" in self.f)
 
+    def test_in_scope_type_error(self):
+        self.assertRaises(TypeError, self.f.__contains__, 1)
+
     def test_scope_vars(self):
         self.assertTrue(
             self.f.scope_vars(),
             set([self.dice, self.intelligence, self.grade]),
         )
 
+    def test_scope_vars_transform(self):
+        """"""
+        self.assertIs(self.f.scope_vars(), self.f.svars)
+        self.assertEqual(
+            self.AB.scope_vars(f=lambda x: set(s.id() for s in x)),
+            set(["A", "B"]),
+        )
+
     def test_marginal_joint(self):
         """ """
         mjoint = self.f.marginal_joint(
@@ -298,6 +340,34 @@ class TestFactor(unittest.TestCase):
         gmarg = self.grade.marginal(0.4)
         self.assertTrue(mjoint, dmarg * imarg * gmarg)
 
+    def test_marginal_joint_table(self):
+        """"""
+        mjoint = self.f.marginal_joint(
+            set([("int", 0.9), ("grade", 0.6), ("dice", 3)])
+        )
+        self.assertAlmostEqual(mjoint, 0.38 * (1.0 / 6.0) * 0.3)
+        # values outside of the outcomes are given to the variable
+        self.assertEqual(self.f.marginal_joint(set([("dice", 7)])), 0)
+        self.assertRaises(
+            ValueError, self.f.marginal_joint, set([("fdice", 1)])
+        )
+
+    def test_marginal_joint_unrolled(self):
+        """"""
+        self.assertIs(_joint_product(3), _joint_product(3))
+        row = (("dice", 3), ("grade", 0.6), ("int", 0.9))
+        # the unrolled function is built on first use
+        self.assertIsNone(self.f._joint)
+        self.assertAlmostEqual(
+            self.f.marginal_joint(row), 0.38 * (1.0 / 6.0) * 0.3
+        )
+        self.assertAlmostEqual(self.f._joint(row), 0.38 * (1.0 / 6.0) * 0.3)
+        self.assertRaises(ValueError, self.f._joint, row[:2])
+        # partial rows are evaluated by the general loop
+        self.assertAlmostEqual(
+            self.f.marginal_joint(row[:2]), (1.0 / 6.0) * 0.38
+        )
+
     def test_partition_value(self):
         """"""
         pval = self.f.partition_value(
@@ -323,6 +393,551 @@ class TestFactor(unittest.TestCase):
             (dmarg * imarg * gmarg) / FactorNumericAnalyzer.zval(self.f),
         )
 
+    def test_zval_table(self):
+        """"""
+        self.assertEqual(FactorNumericAnalyzer.zval(self.AB), 46)
+        # rows follow the lexicographic order of variable ids
+        self.assertEqual(self.AB._ensure_table(), [30, 5, 1, 10])
+        self.assertEqual(self.AB.phi(set([("B", 10), ("A", 50)])), 1)
+        self.assertRaises(ValueError, self.AB.phi, set([("A", 50)]))
+        FactorFactorableOps.reduced(self.AB, set([("A", 10)]))
+        self.assertEqual(FactorNumericAnalyzer.zval(self.AB), 35)
+
+    def test_Z_cached(self):
+        """"""
+        self.assertIsNone(self.AB._table)
+        self.assertEqual(self.AB.Z, 46)
+        self.assertEqual(self.AB._Z, 46)
+        self.assertEqual(len(self.AB.scope_products), 4)
+        rows = self.AB.scope_products
+        self.assertEqual(FactorNumericAnalyzer.zval(self.AB), 46)
+        self.assertIs(self.AB.scope_products, rows)
+        self.assertIsInstance(rows, tuple)
+        self.assertEqual(
+            FactorOps.phi_normal(self.AB, set([("A", 10), ("B", 10)])),
+            30 / 46,
+        )
+        FactorFactorableOps.reduced(self.AB, set([("A", 10)]))
+        self.assertEqual(self.AB.Z, 35)
+        self.assertEqual(len(self.AB.scope_products), 2)
+
+    def test_single_precision_table(self):
+        """"""
+        f = Factor(
+            gid="f32",
+            scope_vars=set([self.grade, self.dice, self.intelligence]),
+            typecode="f",
+        )
+        self.assertEqual(f._ensure_table().itemsize, 4)
+        self.assertAlmostEqual(FactorNumericAnalyzer.zval(f), 1.0, places=6)
+        self.assertEqual(Factor.from_base_factor(f).typecode, "f")
+        self.assertRaises(
+            ValueError,
+            Factor,
+            gid="f",
+            scope_vars=set([self.dice]),
+            typecode="i",
+        )
+
+    def test_factor_domain_cached(self):
+        """"""
+        domain = FactorOps.factor_domain(self.AB, D=self.AB.scope_vars())
+        self.assertEqual(
+            set(domain), set([s.value_set() for s in self.AB.scope_vars()])
+        )
+        self.assertIs(self.AB._default_domain(), self.AB._default_domain())
+        FactorFactorableOps.reduced(self.AB, set([("B", 50)]))
+        domain = FactorOps.factor_domain(self.AB, D=self.AB.scope_vars())
+        self.assertIn(frozenset([("B", 50)]), domain)
+        domain = FactorOps.factor_domain(
+            self.AB, D=self.AB.scope_vars(), rvar_filter=lambda x: False
+        )
+        self.assertEqual(domain, [])
+
+    def test_cartesian_cached(self):
+        """"""
+        rows = FactorOps.cartesian(self.AB)
+        self.assertEqual(len(rows), 4)
+        self.assertIs(self.AB._cartesian(), self.AB._cartesian())
+        rows.pop()
+        self.assertEqual(len(FactorOps.cartesian(self.AB)), 4)
+        self.assertEqual(
+            tuple(FactorOps.iter_cartesian(self.AB)), self.AB._cartesian()
+        )
+        FactorFactorableOps.reduced(self.AB, set([("B", 50)]))
+        self.assertEqual(
+            set(FactorOps.cartesian(self.AB)),
+            set(
+                [
+                    frozenset([("A", 10), ("B", 50)]),
+                    frozenset([("A", 50), ("B", 50)]),
+                ]
+            ),
+        )
+
+    def test_cartesian_cached_across_ops(self):
+        """"""
+        rows = self.AB._cartesian()
+        domain = self.AB._default_domain()
+        FactorOps.product(self.AB, self.AB)
+        scope, psi = FactorFactorableOps.sumout_var(self.AB, self.Bf)
+        psi(set([("A", 10)]))
+        FactorOps.phi_normal(self.AB, set([("A", 10), ("B", 10)]))
+        self.assertIs(self.AB._cartesian(), rows)
+        self.assertIs(self.AB._default_domain(), domain)
+
+    def test_call(self):
+        """"""
+        row = set([("A", 10), ("B", 50)])
+        self.assertEqual(self.AB(row), self.AB.phi(row))
+        self.assertEqual(self.AB(row), 5)
+
+    def test_zval_workers(self):
+        """"""
+        svars = set([self.grade, self.dice, self.intelligence])
+        f1 = Factor(gid="f1", scope_vars=svars, factor_fn=phi_value_sum)
+        f2 = Factor(gid="f2", scope_vars=svars, factor_fn=phi_value_sum)
+        self.assertEqual(
+            round(FactorNumericAnalyzer.zval(f1, nb_workers=2), 8),
+            round(FactorNumericAnalyzer.zval(f2), 8),
+        )
+        self.assertEqual(f1._ensure_table(), f2._ensure_table())
+
+    def test_zval_exact_sum(self):
+        """"""
+
+        def fn(scope_product):
+            return 1e16 if set(scope_product) == set([("dice", 1)]) else 1.0
+
+        f = Factor(gid="f", scope_vars=set([self.dice]), factor_fn=fn)
+        # adding ones one by one to 1e16 would not change it
+        self.assertGreater(FactorNumericAnalyzer.zval(f), 1e16)
+        domain = FactorOps.factor_domain(f, D=f.scope_vars())
+        self.assertGreater(f.partition_value(domain), 1e16)
+
+    def test_partition_value_workers(self):
+        """"""
+        f = Factor(
+            gid="f",
+            scope_vars=set([self.grade, self.dice, self.intelligence]),
+            factor_fn=phi_value_sum,
+        )
+        domain = FactorOps.factor_domain(f, D=f.scope_vars())
+        self.assertAlmostEqual(
+            f.partition_value(domain, nb_workers=2), f.partition_value(domain)
+        )
+
+    def test_partition_value_workers_default(self):
+        """"""
+        svars = set(
+            NumCatRVariable(
+                node_id=nid,
+                input_data={"outcome-values": [10, 50]},
+                marginal_distribution=uniform_half,
+            )
+            for nid in ["A", "B", "C"]
+        )
+        f = Factor(gid="f", scope_vars=svars)
+        self.assertEqual(
+            f.phi(set([("A", 10), ("B", 50), ("C", 10)])), 0.125
+        )
+        self.assertEqual(
+            f.partition_value(f._default_domain(), nb_workers=2), 1.0
+        )
+        # the unrolled joint function is rebuilt after pickling
+        g = pickle.loads(pickle.dumps(f))
+        self.assertEqual(
+            g.phi(set([("A", 50), ("B", 50), ("C", 10)])), 0.125
+        )
+
+    def test_pickle_table(self):
+        """"""
+        svars = set(
+            NumCatRVariable(
+                node_id=nid,
+                input_data={"outcome-values": [10, 50, 20]},
+                marginal_distribution=uniform_half,
+            )
+            for nid in ["A", "B"]
+        )
+        f = Factor(gid="f", scope_vars=svars, factor_fn=phi_value_sum)
+        self.assertEqual(f.phi_by_index((2, 1)), 70)
+        g = pickle.loads(pickle.dumps(f))
+        # the row locator is rebuilt for the pickled table
+        self.assertIsNotNone(g._table)
+        self.assertEqual(g.phi(set([("A", 20), ("B", 50)])), 70)
+        self.assertIsNone(g._table_index([("A", 20)]))
+
+    def test_phi_by_index(self):
+        """"""
+        # variables are ordered as A, B and values as 10, 50
+        self.assertEqual(self.AB.phi_by_index((0, 1)), 5)
+        self.assertEqual(self.AB.phi_by_index((1, 0)), 1)
+        self.assertEqual(self.AB.phi(set([("B", 50), ("A", 10)])), 5)
+        self.assertIsNone(self.AB._table_index([("A", 10), ("A", 50)]))
+        self.assertRaises(IndexError, self.AB.phi_by_index, (0, 2))
+        self.assertRaises(IndexError, self.AB.phi_by_index, (0,))
+
+    def test_domain_signature_cached(self):
+        """"""
+        sig = self.AB._domain_signature()
+        self.assertEqual(self.AB.phi_by_index((0, 1)), 5)
+        self.assertIs(self.AB._domain_signature(), sig)
+        self.Af.reduce_to_value(50)
+        self.assertEqual(
+            self.AB._domain_signature(), (("A", (50,)), ("B", (10, 50)))
+        )
+        self.assertEqual(self.AB.phi_by_index((0, 0)), 1)
+        self.Bf.update_data({"outcome-values": (50,)})
+        self.assertEqual(self.AB.axes(), (("A", (50,)), ("B", (50,))))
+        self.assertEqual(self.AB.phi_by_index((0, 0)), 10)
+
+    def test_eq(self):
+        """"""
+        AB = Factor(
+            gid="AB2",
+            scope_vars=set([self.Af, self.Bf]),
+            factor_fn=self.AB.factor_fn,
+        )
+        self.assertEqual(self.AB, self.AB)
+        self.assertEqual(self.AB, AB)
+        self.assertNotEqual(self.AB, self.BC)
+        self.assertNotEqual(self.AB, Factor.from_joint_vars(AB.scope_vars()))
+        self.assertNotEqual(self.AB, 1)
+
+    def test_negative_values(self):
+        """"""
+        N = NumCatRVariable(
+            node_id="N",
+            input_data={"outcome-values": [1, -1, 2]},
+            marginal_distribution=lambda x: 1.0 / 3.0,
+        )
+        self.assertRaises(ValueError, Factor, gid="N", scope_vars=set([N]))
+
+    def test_hash(self):
+        """"""
+        AB = Factor(
+            gid="AB",
+            scope_vars=set([self.Af, self.Bf]),
+            factor_fn=lambda scope_product: 1.0,
+        )
+        self.assertEqual(hash(self.AB), hash(AB))
+        self.assertNotEqual(hash(self.AB), hash(self.BC))
+        self.assertEqual(len(set([self.AB, self.AB, self.BC])), 2)
+
+    def test_canonical_rows(self):
+        """"""
+        rows = []
+
+        def fn(scope_product):
+            rows.append(scope_product)
+            return 1.0
+
+        f = Factor(
+            gid="f", scope_vars=set([self.dice, self.grade]), factor_fn=fn
+        )
+        self.assertEqual(FactorNumericAnalyzer.zval(f), 18)
+        self.assertEqual(rows[0], (("dice", 1), ("grade", 0.2)))
+        self.assertTrue(all(row == _canonical(row) for row in rows))
+        self.assertEqual(
+            _canonical(set([("grade", 0.2), ("dice", 1)])), rows[0]
+        )
+
+    def test_phi_memoized(self):
+        """"""
+        calls = []
+
+        def fn(scope_product):
+            calls.append(scope_product)
+            return 2.0
+
+        f = Factor(
+            gid="f", scope_vars=set([self.dice, self.grade]), factor_fn=fn
+        )
+        row = set([("dice", 1), ("grade", 0.2)])
+        self.assertEqual(f.phi(row), 2.0)
+        self.assertEqual(f.phi([("grade", 0.2), ("dice", 1)]), 2.0)
+        self.assertEqual(len(calls), 1)
+        f.factor_fn = lambda scope_product: 3.0
+        self.assertEqual(f.phi(row), 3.0)
+        self.assertEqual(f.Z, 54.0)
+
+    def test_phi_memo_domain_rows(self):
+        """"""
+        f = Factor(
+            gid="f",
+            scope_vars=set([self.dice, self.grade]),
+            factor_fn=lambda scope_product: 2.0,
+        )
+        f.phi(set([("dice", 1), ("grade", 0.2)]))
+        f.phi(set([("dice", 1)]))
+        f.phi(set([("dice", 7), ("grade", 0.2)]))
+        f.phi(set([("dice", 1), ("int", 0.1)]))
+        self.assertEqual(list(f._phi_cache), [(("dice", 1), ("grade", 0.2))])
+        self.assertEqual(f.Z, 36.0)
+        f.factor_fn = lambda scope_product: 1.0
+        self.assertEqual(f._phi_cache, {})
+        self.assertIsNone(f._table)
+        self.assertEqual(f.Z, 18.0)
+
+    def test_phi_table(self):
+        """"""
+        self.assertEqual(
+            self.AB.axes(), (("A", (10, 50)), ("B", (10, 50)))
+        )
+        self.assertEqual(self.AB.phi_table(), [[30, 5], [1, 10]])
+        table = self.f.phi_table()
+        # dice, grade, int with 6, 3 and 2 values
+        self.assertEqual(
+            (len(table), len(table[0]), len(table[0][0])), (6, 3, 2)
+        )
+        self.assertEqual(table[2][2][1], self.f.phi_by_index((2, 2, 1)))
+
+    def test_scope_order_table(self):
+        """"""
+        self.assertEqual(self.AB.scope_order, ("A", "B"))
+        self.assertEqual(list(self.AB.table), [30, 5, 1, 10])
+        self.assertIs(self.AB.table, self.AB.table)
+        self.assertEqual(self.f.scope_order, ("dice", "grade", "int"))
+        # strides of dice, grade and int are 6, 2 and 1
+        self.assertEqual(
+            self.f.table[2 * 6 + 2 * 2 + 1], self.f.phi_by_index((2, 2, 1))
+        )
+
+    def test_repeated_outcome_values(self):
+        """"""
+        X = NumCatRVariable(
+            node_id="X",
+            input_data={"outcome-values": [0.4, 0.4, 0.6]},
+            marginal_distribution=lambda x: 0.5,
+        )
+        f = Factor(gid="f", scope_vars=set([X]), factor_fn=lambda sp: 1.0)
+        # repeated values are a single row of the domain
+        self.assertEqual(f.axes(), (("X", (0.4, 0.6)),))
+        self.assertEqual(FactorNumericAnalyzer.zval(f), 2.0)
+        self.assertEqual(len(FactorOps.cartesian(f)), 2)
+        g = Factor(
+            gid="g", scope_vars=set([X, self.Bf]), factor_fn=lambda sp: 1.0
+        )
+        scope, psi = FactorFactorableOps.sumout_var(g, X)
+        self.assertEqual(psi(set([("B", 10)])), 2.0)
+        scope, psi = FactorFactorableOps.product_sum_out([f, g], set([X]))
+        self.assertEqual(psi(set([("B", 10)])), 2.0)
+        self.assertEqual(len(FactorOps.dense_table(g)[1]), 4)
+
+    def test_zval_single_enumeration(self):
+        """"""
+        calls = []
+
+        def fn(scope_product):
+            calls.append(scope_product)
+            return 1.0
+
+        f = Factor(
+            gid="f", scope_vars=set([self.dice, self.grade]), factor_fn=fn
+        )
+        self.assertEqual(FactorNumericAnalyzer.zval(f), 18)
+        self.assertEqual(FactorNumericAnalyzer.zval(f), 18)
+        self.assertEqual(f.Z, 18)
+        self.assertEqual(len(calls), 18)
+        self.assertEqual(len(set(calls)), 18)
+
+    def test_table_index(self):
+        """"""
+        self.f._ensure_table()
+        row = set([("int", 0.9), ("grade", 0.6), ("dice", 3)])
+        # dice, grade, int with 6, 3 and 2 values
+        self.assertEqual(self.f._table_index(row), 2 * 6 + 2 * 2 + 1)
+        self.assertIsNone(self.f._table_index(row | set([("A", 10)])))
+        self.assertIsNone(
+            self.f._table_index(
+                [("int", 0.9), ("grade", 0.6), ("grade", 0.2)]
+            )
+        )
+        self.assertIsNone(self.f._table_index([("int", 0.9), ("dice", 3)]))
+        self.assertIsNone(
+            self.f._table_index(
+                set([("int", 0.9), ("grade", 0.6), ("dice", 7)])
+            )
+        )
+
+    def test_phi_batch(self):
+        """"""
+        self.assertEqual(
+            self.AB.phi_batch([(0, 0), (1, 1), (0, 1)]), [30, 10, 5]
+        )
+        self.assertEqual(self.AB.phi_batch([]), [])
+        self.assertRaises(IndexError, self.AB.phi_batch, [(0, 0), (2, 0)])
+
+    def test_zval_marginal_joint_table(self):
+        """"""
+        table = self.f._ensure_table()
+        rows = [
+            self.f.marginal_joint(row) for row in FactorOps.cartesian(self.f)
+        ]
+        self.assertEqual(len(table), 36)
+        self.assertEqual(
+            sorted(round(t, 10) for t in table),
+            sorted(round(r, 10) for r in rows),
+        )
+        self.assertEqual(round(FactorNumericAnalyzer.zval(self.f), 10), 1.0)
+
+    def test_phi_by_index_marginal_joint(self):
+        """"""
+        # dice, grade, int with 6, 3 and 2 values
+        row = set([("int", 0.9), ("grade", 0.6), ("dice", 3)])
+        self.assertAlmostEqual(
+            self.f.phi_by_index((2, 2, 1)), self.f.marginal_joint(row)
+        )
+        self.assertEqual(len(self.f.phi_batch([(0, 0, 0), (5, 2, 1)])), 2)
+        self.assertIsNone(self.f._table)
+        self.assertRaises(IndexError, self.f.phi_by_index, (6, 0, 0))
+        self.assertRaises(IndexError, self.f.phi_batch, [(0, 0)])
+
+    def test_marginal_vectors_cached(self):
+        """"""
+        sig = self.f._domain_signature()
+        vecs = self.f._marginal_vectors(sig)
+        self.f.phi_by_index((0, 0, 0))
+        self.f.phi_batch([(1, 1, 1)])
+        self.assertAlmostEqual(self.f.Z, 1.0)
+        self.assertIs(self.f._marginal_vectors(sig), vecs)
+        self.dice.reduce_to_value(3)
+        self.assertEqual(self.f.axes()[0], ("dice", (3,)))
+        self.assertAlmostEqual(
+            self.f.phi_by_index((0, 0, 0)), 1.0 / 6.0 * 0.25 * 0.7
+        )
+        self.assertAlmostEqual(self.f.Z, 1.0 / 6.0)
+
+    def test_zval_marginal_joint_vectors(self):
+        """"""
+        self.assertAlmostEqual(FactorNumericAnalyzer.zval(self.f), 1.0)
+        # the partition value is the product of the marginal sums
+        self.assertIsNone(self.f._table)
+        FactorFactorableOps.reduced(self.f, set([("dice", 3)]))
+        self.assertAlmostEqual(self.f.Z, 1.0 / 6.0)
+
+    def test_sumout_maxout_grouped(self):
+        """"""
+        scope, psi = FactorFactorableOps.sumout_var(self.AB, self.Bf)
+        self.assertEqual(scope, frozenset([self.Af]))
+        self.assertEqual(psi(set([("A", 10)])), 35)
+        self.assertEqual(psi(set([("A", 50)])), 11)
+        # assignments that are not a group are summed over matching rows
+        self.assertEqual(psi(set()), 46)
+        self.assertEqual(psi(set([("A", 20)])), 0)
+        scope, psi = FactorFactorableOps.maxout_var(self.AB, self.Af)
+        self.assertEqual(psi(set([("B", 10)])), 30)
+        self.assertEqual(psi(set([("B", 50)])), 10)
+        self.assertRaises(ValueError, psi, set([("B", 20)]))
+
+    def test_pair_codes(self):
+        """"""
+        sig = (("A", (10, 50)), ("B", (10, 50, 20)))
+        codes = _pair_codes(sig)
+        self.assertEqual(codes[("A", 50)], 1)
+        self.assertEqual(codes[("B", 10)], 2)
+        # keys do not depend on the order of assignments
+        self.assertEqual(
+            _encode(codes, [("B", 20), ("A", 10)]),
+            _encode(codes, set([("A", 10), ("B", 20)])),
+        )
+        self.assertEqual(_encode(codes, [("B", 20), ("A", 10)]), (0, 4))
+        self.assertEqual(_encode(codes, [("C", 10)]), (-1,))
+
+    def test_decode(self):
+        """"""
+        sig = (("A", (10, 50)), ("B", (10, 50, 20)))
+        rows = [_decode(sig, i) for i in range(6)]
+        self.assertEqual(rows[0], frozenset([("A", 10), ("B", 10)]))
+        self.assertEqual(rows[5], frozenset([("A", 50), ("B", 20)]))
+        self.assertEqual(len(set(rows)), 6)
+        self.assertEqual(_decode((), 0), frozenset())
+
+    def test_sumout_maxout_assigned_var(self):
+        """"""
+        # assignments giving a value to the summed out variable aggregate
+        # the rows containing them
+        scope, psi = FactorFactorableOps.sumout_var(self.AB, self.Bf)
+        self.assertEqual(psi(set([("A", 10), ("B", 50)])), 5)
+        self.assertEqual(psi(set([("B", 10)])), 31)
+        self.assertEqual(psi(set([("A", 10)])), 35)
+        self.assertEqual(psi(set([("B", 10), ("B", 50)])), 0)
+        scope, psi = FactorFactorableOps.maxout_var(self.AB, self.Bf)
+        self.assertEqual(psi(set([("A", 50), ("B", 10)])), 1)
+        self.assertEqual(psi(set([("B", 50)])), 10)
+        self.assertEqual(psi(set([("A", 50)])), 10)
+        self.assertRaises(ValueError, psi, set([("A", 50), ("B", 20)]))
+
+    def test_sumout_maxout_inner_axis(self):
+        """"""
+        f = Factor(
+            gid="f",
+            scope_vars=set([self.grade, self.dice, self.intelligence]),
+            factor_fn=phi_value_sum,
+        )
+        # grade is the middle axis of the table
+        scope, psi = FactorFactorableOps.sumout_var(f, self.grade)
+        self.assertAlmostEqual(
+            psi(set([("dice", 3), ("int", 0.9)])), 3 * (3 + 0.9) + 1.2
+        )
+        scope, psi = FactorFactorableOps.maxout_var(f, self.dice)
+        self.assertAlmostEqual(psi(set([("grade", 0.4), ("int", 0.1)])), 6.5)
+
+    def test_sumout_partial_no_phi(self):
+        """"""
+        calls = []
+
+        def fn(scope_product):
+            calls.append(scope_product)
+            return phi_value_sum(scope_product)
+
+        f = Factor(
+            gid="f",
+            scope_vars=set([self.grade, self.dice, self.intelligence]),
+            factor_fn=fn,
+        )
+        scope, psi = FactorFactorableOps.sumout_var(f, self.grade)
+        psi(set([("dice", 3), ("int", 0.9)]))
+        nb_calls = len(calls)
+        expected = sum(
+            d + g + 0.9
+            for d in self.dice.values()
+            for g in self.grade.values()
+        )
+        self.assertAlmostEqual(psi(set([("int", 0.9)])), expected)
+        self.assertAlmostEqual(psi([("int", 0.9)]), expected)
+        self.assertEqual(psi(set([("int", 0.5)])), 0)
+        self.assertEqual(len(calls), nb_calls)
+
+    def test_sumout_maxout_buckets(self):
+        """"""
+        f = Factor(
+            gid="f",
+            scope_vars=set([self.grade, self.dice, self.intelligence]),
+            factor_fn=phi_value_sum,
+        )
+        rows = FactorOps.cartesian(f)
+        for Y in (self.grade, self.dice, self.intelligence):
+            buckets = {}
+            for row in rows:
+                key = frozenset(a for a in row if a[0] != Y.id())
+                buckets.setdefault(key, []).append(f.phi(row))
+            scope, sum_psi = FactorFactorableOps.sumout_var(f, Y)
+            scope, max_psi = FactorFactorableOps.maxout_var(f, Y)
+            for key, values in buckets.items():
+                self.assertAlmostEqual(sum_psi(key), sum(values))
+                self.assertAlmostEqual(max_psi(key), max(values))
+
+    def test_from_joint_vars_class(self):
+        """"""
+        svars = set([self.Af, self.Bf])
+        self.assertIs(type(BaseFactor.from_joint_vars(svars)), BaseFactor)
+        f = Factor.from_joint_vars(svars)
+        self.assertIs(type(f), Factor)
+        self.assertEqual(f.factor_fn, f.marginal_joint)
+        self.assertIs(type(SparseFactor.from_joint_vars(svars)), SparseFactor)
+
     def test_from_scope_variables_with_fn(self):
         """"""
         A = NumCatRVariable(
@@ -313,6 +313,16 @@ class TestFactorAlg(unittest.TestCase):
             ),
         )
 
+    def test_filter_assignments(self):
+        """"""
+        assignments = set([("A", 10), ("C", 50), ("E", 10)])
+        filtered = FactorAlgebra.filter_assignments(self.AB, assignments)
+        self.assertEqual(filtered, set([("A", 10)]))
+        filtered = FactorOps.filter_assignments(
+            self.AB, assignments, context=set([self.Af, self.Cf])
+        )
+        self.assertEqual(filtered, set([("A", 10), ("C", 50)]))
+
     def test_sumout_var(self):
         "from Koller, Friedman 2009, p. 297 figure 9.7"
         aB_c, prod = FactorAlgebra.product(f=self.aB, other=self.bc)
@@ -356,3 +366,194 @@ class TestFactorAlg(unittest.TestCase):
                 self.assertEqual(f, 0.15)
             elif diff == set([("C", 50), ("A", 20)]):
                 self.assertEqual(f, 0.21)
+
+    def test_product_join(self):
+        """"""
+        (scope, fx), prod = FactorOps.product(self.AB, self.BC)
+        self.assertEqual(scope, frozenset([self.Af, self.Bf, self.Cf]))
+        self.assertEqual(fx(set([("A", 10), ("B", 10), ("C", 50)])), 30)
+        self.assertEqual(fx(set([("A", 50), ("B", 50), ("C", 50)])), 1000)
+        self.assertIsNone(fx(set([("A", 10), ("B", 10)])))
+        # factors without shared variables are joined row by row
+        (scope, fx), prod = FactorOps.product(self.AB, self.CD)
+        self.assertEqual(len(scope), 4)
+        self.assertEqual(
+            fx(set([("A", 10), ("B", 50), ("C", 10), ("D", 50)])), 500
+        )
+
+    def test_product_dense_tables(self):
+        """"""
+        # factors whose scopes are disjoint, shared and nested
+        for f, other in [
+            (self.AB, self.CD),
+            (self.AB, self.DA),
+            (self.AB, self.AB),
+        ]:
+            (scope, fx), prod = FactorOps.product(f, other)
+            expected = 1.0
+            for row in FactorOps.cartesian(Factor(gid="g", scope_vars=scope)):
+                frow = set(a for a in row if a[0] in f.domain_table)
+                orow = set(a for a in row if a[0] in other.domain_table)
+                value = f.phi(frow) * other.phi(orow)
+                self.assertEqual(fx(row), value)
+                expected *= value
+            self.assertEqual(prod, expected)
+
+    def test_product_lookup(self):
+        """"""
+        calls = []
+
+        def phi(scope_product):
+            calls.append(scope_product)
+            return 2.0
+
+        f = Factor(gid="f", scope_vars=set([self.Af, self.Bf]), factor_fn=phi)
+        (scope, fx), prod = FactorOps.product(f, self.BC)
+        # each row of f is evaluated once although it is joined twice
+        self.assertEqual(len(calls), 4)
+        for row in FactorOps.cartesian(Factor(gid="g", scope_vars=scope)):
+            self.assertIn(fx(row), (2.0, 200.0))
+        # rows of the product are looked up, not evaluated again
+        self.assertEqual(len(calls), 4)
+
+    def test_product_fx_row_forms(self):
+        """"""
+        (scope, fx), prod = FactorOps.product(self.AB, self.BC)
+        row = [("A", 10), ("B", 50), ("C", 10)]
+        value = fx(set(row))
+        self.assertEqual(fx(row), value)
+        self.assertEqual(fx(tuple(reversed(row))), value)
+        self.assertEqual(fx(a for a in row), value)
+        self.assertIsNone(fx([("A", 10), ("B", 50)]))
+        self.assertIsNone(fx([("A", 10), ("B", 50), ("C", 20)]))
+
+    def test_product_sum_out(self):
+        "from Koller, Friedman 2009, p. 297 figure 9.7"
+        a_c = FactorAlgebra.product_sum_out([self.aB, self.bc], set([self.Bf]))
+        self.assertEqual(
+            set(s.id() for s in a_c.scope_vars()), set(["A", "C"])
+        )
+        expected = {
+            frozenset([("C", 10), ("A", 10)]): 0.33,
+            frozenset([("C", 50), ("A", 10)]): 0.51,
+            frozenset([("C", 10), ("A", 50)]): 0.05,
+            frozenset([("C", 50), ("A", 50)]): 0.07,
+            frozenset([("C", 10), ("A", 20)]): 0.24,
+            frozenset([("C", 50), ("A", 20)]): 0.39,
+        }
+        for p in FactorOps.cartesian(a_c):
+            self.assertEqual(round(a_c.phi(p), 4), expected[p])
+
+    def test_product_sum_out_dense_product(self):
+        """"""
+        (scope, fx), prod = FactorOps.product(self.AB, self.BC)
+        abc = FactorAlgebra.product_sum_out([self.AB, self.BC], set())
+        self.assertEqual(
+            set(s.id() for s in abc.scope_vars()), set(s.id() for s in scope)
+        )
+        for row in FactorOps.cartesian(abc):
+            self.assertEqual(abc.phi(row), fx(row))
+
+    def test_product_sum_out_all(self):
+        """"""
+        z = FactorAlgebra.product_sum_out(
+            [self.AB, self.BC], set([self.Af, self.Bf, self.Cf])
+        )
+        self.assertEqual(z.phi(frozenset()), 46 * 101)
+        self.assertRaises(
+            ValueError,
+            FactorAlgebra.product_sum_out,
+            [self.AB],
+            set([self.Cf]),
+        )
+
+    def test_sumout_vars(self):
+        """"""
+        ABC, prod = FactorAlgebra.product(self.AB, self.BC)
+        Ys = set([self.Af, self.Cf])
+        b = FactorAlgebra.sumout_vars(ABC, Ys)
+        self.assertEqual(len(Ys), 2)
+        self.assertEqual(set(s.id() for s in b.scope_vars()), set(["B"]))
+        self.assertEqual(b.phi(set([("B", 10)])), 31 * 101)
+        self.assertEqual(b.phi(set([("B", 50)])), 15 * 101)
+
+    def test_sumout_vars_partial_rows(self):
+        """"""
+        ABC, prod = FactorAlgebra.product(self.AB, self.BC)
+        ABCD, prod = FactorAlgebra.product(ABC, self.CD)
+        bd = FactorAlgebra.sumout_vars(ABCD, set([self.Af, self.Cf]))
+        b10 = sum(bd.phi(set([("B", 10), ("D", d)])) for d in [10, 50])
+        self.assertEqual(bd.phi(set([("B", 10)])), b10)
+        total = sum(
+            bd.phi(set([("B", b), ("D", d)]))
+            for b in [10, 50]
+            for d in [10, 50]
+        )
+        self.assertEqual(bd.phi(set()), total)
+        # both paths of sumout_vars answer partial rows alike
+        bcd = FactorAlgebra.sumout_vars(ABCD, set([self.Af]))
+        self.assertEqual(bcd.phi(set()), total)
+        self.assertRaises(ValueError, bd.phi, set([("A", 10)]))
+
+    def test_sumout_vars_typecode(self):
+        """"""
+        ABC, prod = FactorAlgebra.product(self.AB, self.BC, typecode="f")
+        self.assertEqual(ABC.typecode, "f")
+        b = FactorAlgebra.sumout_vars(
+            ABC, set([self.Af, self.Cf]), typecode="f"
+        )
+        self.assertEqual(b.typecode, "f")
+        self.assertEqual(b.phi(set([("B", 10)])), 31 * 101)
+        b = FactorAlgebra.sumout_vars(b, set([self.Bf]), typecode="d")
+        self.assertEqual(b.typecode, "d")
+
+    def test_result_ids(self):
+        """"""
+        a = FactorAlgebra.sumout_var(self.AB, self.Af)
+        b = FactorAlgebra.sumout_var(self.AB, self.Af)
+        self.assertNotEqual(a.id(), b.id())
+        self.assertEqual(a.id().split("-")[0], b.id().split("-")[0])
+
+    def test_elimination_order(self):
+        """"""
+        fs = [self.AB, self.BC]
+        order = FactorAlgebra.elimination_order(fs, set([self.Bf, self.Cf]))
+        # C has a single neighbour, B has two
+        self.assertEqual([s.id() for s in order], ["C", "B"])
+        fs = [self.AB, self.BC, self.CD, self.DA]
+        order = FactorAlgebra.elimination_order(fs, set([self.Cf, self.Af]))
+        self.assertEqual([s.id() for s in order], ["A", "C"])
+
+    def test_eliminate_vars(self):
+        """"""
+        fs = [self.AB, self.BC, self.CD, self.DA]
+        Ys = set([self.Af, self.Cf])
+        joint = FactorAlgebra.product_sum_out(fs, Ys)
+        for order in (None, [self.Cf, self.Af]):
+            rest = FactorAlgebra.eliminate_vars(fs, Ys, order=order)
+            for b in [10, 50]:
+                for d in [10, 50]:
+                    value = 1
+                    for f in rest:
+                        row = set(
+                            (s.id(), {"B": b, "D": d}[s.id()])
+                            for s in f.scope_vars()
+                        )
+                        value *= f.phi(row)
+                    self.assertEqual(
+                        value, joint.phi(set([("B", b), ("D", d)]))
+                    )
+        self.assertRaises(
+            ValueError, FactorAlgebra.eliminate_vars, [self.AB], Ys
+        )
+
+    def test_product_sum_out_constant_factor(self):
+        """"""
+        # DA does not depend on C, it is factored out of the sum over C
+        a_bd = FactorAlgebra.product_sum_out(
+            [self.BC, self.CD, self.DA], set([self.Cf])
+        )
+        row = set([("A", 10), ("B", 10), ("D", 10)])
+        self.assertEqual(a_bd.phi(row), (100 * 1 + 1 * 100) * 100)
+        row = set([("A", 50), ("B", 50), ("D", 10)])
+        self.assertEqual(a_bd.phi(row), (1 * 1 + 100 * 100) * 1)
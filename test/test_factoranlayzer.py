@@ -10,6 +10,7 @@ from pygmodels.factor.factorf.factoranalyzer import (
     FactorAnalyzer,
     FactorNumericAnalyzer,
 )
+from pygmodels.factor.factorf.factorops import FactorFactorableOps
 from pygmodels.graph.gtype.edge import Edge, EdgeType
 from pygmodels.pgm.pgmtype.randomvariable import NumCatRVariable
 
@@ -57,6 +58,30 @@ class TestFactorAnalyzer(unittest.TestCase):
         mval = FactorAnalyzer.max_value(self.bc)
         self.assertEqual(mval, set([("B", 10), ("C", 50)]))
 
+    def test_max_value_reduced(self):
+        """"""
+        FactorFactorableOps.reduced(self.bc, set([("B", 50)]))
+        mval = FactorAnalyzer.max_value(self.bc)
+        self.assertEqual(mval, set([("B", 50), ("C", 50)]))
+        mval = FactorAnalyzer.min_value(self.bc_b)
+        self.assertEqual(mval, set([("B", 50), ("C", 10)]))
+
+    def test_extreme_value_ties(self):
+        """"""
+        f = Factor(
+            gid="f",
+            scope_vars=set([self.Bf, self.Cf]),
+            factor_fn=lambda scope_product: 0.25,
+        )
+        # ties keep the first row in the order of the table
+        first = set([("B", 10), ("C", 10)])
+        self.assertEqual(FactorAnalyzer.max_value(f), first)
+        self.assertEqual(FactorAnalyzer.min_value(f), first)
+        self.assertEqual(
+            FactorAnalyzer._max_prob_value(f),
+            FactorAnalyzer._compare_prob_value(f),
+        )
+
     def test_max_probability(self):
         """"""
         mval = FactorNumericAnalyzer.max_probability(self.bc)
@@ -72,10 +97,22 @@ class TestFactorAnalyzer(unittest.TestCase):
         mval = FactorNumericAnalyzer.min_probability(self.bc)
         self.assertEqual(mval, 0.1)
 
-    @unittest.skip("FactorAnalyzer.normalize not yet implemented")
     def test_normalize(self):
         """"""
-        pass
+        calls = []
+
+        def phi(scope_product):
+            calls.append(scope_product)
+            return self.bc.phi(scope_product)
+
+        f = Factor(gid="f", scope_vars=set([self.Bf, self.Cf]), factor_fn=phi)
+        self.assertAlmostEqual(FactorNumericAnalyzer.normalize(f, 0.3), 0.2)
+        nb_calls = len(calls)
+        self.assertAlmostEqual(FactorNumericAnalyzer.normalize(f, 1.5), 1.0)
+        self.assertEqual(len(calls), nb_calls)
+        self.assertAlmostEqual(
+            FactorNumericAnalyzer.normalize(self.bc_b, 0.75), 0.5
+        )
 
 
 if __name__ == "__main__":
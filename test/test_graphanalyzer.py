@@ -488,6 +488,38 @@ class BaseGraphAnalyzerTest(unittest.TestCase):
         ndes = BaseGraphNumericAnalyzer.nb_neighbours_of(self.graph_2, self.n2)
         self.assertEqual(ndes, 2)
 
+    def test_find_connected_components(self):
+        """"""
+        comps = BaseGraphAnalyzer.find_connected_components(self.ugraph4)
+        self.assertEqual(
+            set([frozenset(c) for c in comps.values()]),
+            set(
+                [
+                    frozenset(["a", "b", "e", "f"]),
+                    frozenset(["n1", "n2", "n3", "n4"]),
+                ]
+            ),
+        )
+        for root, comp in comps.items():
+            self.assertIn(root, comp)
+        comps = BaseGraphAnalyzer.find_connected_components(self.ugraph1)
+        self.assertEqual(len(comps), 2)
+
+    def test_find_connected_components_isolated(self):
+        """"""
+        isolated = [Node("i" + str(i), {}) for i in range(5)]
+        g = BaseGraph(
+            "isolated",
+            nodes=set(self.graph_2.V).union(isolated),
+            edges=set(self.graph_2.E),
+        )
+        comps = BaseGraphAnalyzer.find_connected_components(g)
+        self.assertEqual(len(comps), 6)
+        self.assertIn(
+            frozenset(["n1", "n2", "n3", "n4"]),
+            set([frozenset(c) for c in comps.values()]),
+        )
+
     @unittest.skip("test not implemented")
     def test_get_component_nodes(self):
         pass
@@ -208,6 +208,65 @@ class BaseGraphSearcherTests(unittest.TestCase):
         # print(comps)
         first = comps.pop(0)
 
+    def test_breadth_first_search_csr(self):
+        """"""
+        result = BaseGraphSearcher.breadth_first_search_csr(
+            g=self.ugraph, n1=self.n2, csr=self.ugraph._ensure_csr()
+        )
+        self.assertEqual(
+            result.path_set,
+            set(
+                [
+                    self.n1,
+                    self.n2,
+                    self.n3,
+                    self.n4,
+                    self.n5,
+                    self.n6,
+                    self.n7,
+                    self.n8,
+                ]
+            ),
+        )
+        self.assertEqual(result.top_sort["n2"], 0)
+        self.assertEqual(result.top_sort["n8"], 1)
+        self.assertEqual(result.top_sort["n4"], 2)
+        self.assertEqual(result.top_sort["n9"], float("inf"))
+
+    def test_dfs_lowpoints_csr(self):
+        """"""
+        csr = self.ugraph._ensure_csr()
+        indptr, indices, id_of_idx, idx_of_id = csr
+        num = [-1] * len(id_of_idx)
+        low = [-1] * len(id_of_idx)
+        parent = [-1] * len(id_of_idx)
+        nb_children = BaseGraphSearcher.dfs_lowpoints_csr(
+            csr, start=idx_of_id["n1"], num=num, low=low, parent=parent
+        )
+        # n2 and n8 share a subtree through the cycle n1 n2 n8
+        self.assertEqual(nb_children, 6)
+        self.assertEqual(low[idx_of_id["n2"]], 0)
+        self.assertEqual(low[idx_of_id["n8"]], 0)
+        self.assertEqual(num[idx_of_id["n9"]], -1)
+
+    def test_all_pairs_bfs_csr(self):
+        """"""
+        csr = self.ugraph._ensure_csr()
+        rows = BaseGraphSearcher.all_pairs_bfs_csr(csr, width=4)
+        prows = BaseGraphSearcher.all_pairs_bfs_csr(
+            csr, nb_workers=2, width=4
+        )
+        self.assertEqual(rows, prows)
+        idx_of_id = csr[3]
+        for n in self.ugraph.V:
+            result = BaseGraphSearcher.breadth_first_search_csr(
+                g=self.ugraph, n1=n, csr=csr
+            )
+            self.assertEqual(
+                rows[idx_of_id[n.id()]],
+                [result.top_sort[nid] for nid in csr[2]],
+            )
+
     def test_uniform_cost_search(self):
         """"""
         start_node = self.b
@@ -225,3 +284,29 @@ class BaseGraphSearcherTests(unittest.TestCase):
             edges.append(solution["edge"])
         edges.pop()  # last element edge is None
         self.assertEqual(list(reversed(edges)), [self.bf, self.fm])
+
+    def test_uniform_cost_search_weighted(self):
+        """"""
+        s = Node("s")
+        x = Node("x")
+        y = Node("y")
+        t = Node("t")
+        sx = Edge.directed("sx", start_node=s, end_node=x, data={"w": 1})
+        xt = Edge.directed("xt", start_node=x, end_node=t, data={"w": 5})
+        sy = Edge.directed("sy", start_node=s, end_node=y, data={"w": 2})
+        yt = Edge.directed("yt", start_node=y, end_node=t, data={"w": 1})
+        g = BaseGraph(
+            "diamond",
+            nodes=set([s, x, y, t]),
+            edges=set([sx, xt, sy, yt]),
+        )
+        elist, solution = BaseGraphSearcher.uniform_cost_search(
+            g=g,
+            start=s,
+            goal=t,
+            costfn=lambda e, c: c + e.data()["w"],
+        )
+        self.assertEqual(elist, (sy, yt))
+        self.assertEqual(solution["cost"], 3)
+        self.assertEqual(solution.cost, 3)
+        self.assertEqual(solution.parent.state, "y")
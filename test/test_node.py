@@ -32,6 +32,11 @@ class NodeTest(unittest.TestCase):
         n1 = Node("mnode", {"my": "data", "is": "awesome"})
         self.assertEqual(hash(n1), hash(mstr))
 
+    def test_id_interned(self):
+        n1 = Node("".join(["m", "node"]), {})
+        n2 = Node("".join(["mn", "ode"]), {})
+        self.assertIs(n1.id(), n2.id())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -90,7 +90,18 @@ class NumCatRVariableTest(unittest.TestCase):
         self.assertEqual(self.grade.id(), "rvar2")
 
     def test_values(self):
-        self.assertEqual(self.rvar.values(), frozenset(["A", "F"]))
+        self.assertIsInstance(self.rvar.values(), tuple)
+        self.assertEqual(set(self.rvar.values()), set(["A", "F"]))
+
+    def test_tabulated_distribution(self):
+        """"""
+        coin = NumCatRVariable(
+            node_id="coin",
+            input_data={"outcome-values": [0, 1]},
+            marginal_distribution={0: 0.4, 1: 0.6},
+        )
+        self.assertEqual(coin.p(1), 0.6)
+        self.assertEqual(coin.expected_value(), 0.6)
 
     def test_value_set(self):
         self.assertEqual(
@@ -101,9 +112,35 @@ class NumCatRVariableTest(unittest.TestCase):
             frozenset([("myrandomvar", "f")]),
         )
 
+    def test_type_check(self):
+        """"""
+        self.assertIsNone(NumCatRVariable.type_check(self.grade))
+        with self.assertRaises(TypeError):
+            NumCatRVariable.type_check("my numeric categorical variable")
+
+    def test_reduce_to_value(self):
+        """"""
+        self.grade.reduce_to_value(0.4)
+        self.assertEqual(self.grade.values(), (0.4,))
+        self.dice.reduce_to_value(7)
+        self.assertEqual(self.dice.values(), ())
+        rvar = NumCatRVariable(
+            node_id="rvar",
+            input_data={"outcome-values": [0.4, 0.4, 0.6]},
+            marginal_distribution=lambda x: 0.5,
+        )
+        rvar.reduce_to_value(0.4)
+        self.assertEqual(rvar.values(), (0.4,))
+
     def test_max_marginal_value(self):
         self.assertEqual(self.intelligence.max_marginal_value(), 0.1)
 
+    def test_max_marginal_value_ties(self):
+        """"""
+        # the first of the tied outcomes is kept
+        self.assertEqual(self.dice.max_marginal_value(), 1)
+        self.assertEqual(self.dice.min_marginal_value(), 1)
+
     def test_max(self):
         self.assertEqual(self.intelligence.max(), 0.7)
 
@@ -153,6 +190,34 @@ class NumCatRVariableTest(unittest.TestCase):
         dice.pop_evidence()
         self.assertEqual(dice.joint(dice), 3.5 * 3.5)
 
+    def test_max_conditional(self):
+        """"""
+        self.assertEqual(
+            self.intelligence.max_conditional(self.grade),
+            0.3 * 0.25 / 0.25,
+        )
+
+    def test_batch_joint(self):
+        """"""
+        rvars = [self.intelligence, self.grade]
+        joints = NumCatRVariable.batch_joint(rvars)
+        self.assertEqual(joints[0][1], self.intelligence.joint(self.grade))
+        self.assertEqual(joints[1][1], self.grade.joint(self.grade))
+
+    def test_batch_conditional(self):
+        """"""
+        rvars = [self.intelligence, self.grade]
+        conds = NumCatRVariable.batch_conditional(rvars)
+        self.assertEqual(
+            conds[0][1], self.intelligence.conditional(self.grade)
+        )
+
+    def test_mk_new_rvar(self):
+        """"""
+        nvar = self.grade.mk_new_rvar(lambda x: x * 2)
+        self.assertEqual(nvar.values(), self.grade.values())
+        self.assertEqual(nvar.p(0.4), 0.37)
+
     def test_variance(self):
         self.assertEqual(round(self.dice.variance(), 3), 2.917)
 
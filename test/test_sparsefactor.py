@@ -0,0 +1,167 @@
+"""!
+test for sparsefactor.py
+"""
+import unittest
+
+from pygmodels.factor.factorf.factoranalyzer import FactorNumericAnalyzer
+from pygmodels.factor.factorf.factorops import FactorOps
+from pygmodels.factor.sparsefactor import SparseFactor
+from pygmodels.pgm.pgmtype.randomvariable import NumCatRVariable
+
+
+def phi_diagonal(scope_product):
+    "module level factor function, so that worker processes can load it"
+    values = set(v for k, v in scope_product)
+    return 0.5 if len(values) == 1 else 0
+
+
+def uniform_half(value):
+    "module level marginal, so that worker processes can load it"
+    return 0.5
+
+
+class TestSparseFactor(unittest.TestCase):
+    """!"""
+
+    def setUp(self):
+        """"""
+        self.A = NumCatRVariable(
+            node_id="A",
+            input_data={"outcome-values": [10, 50, 20]},
+            marginal_distribution=lambda x: 0.4 if x != 20 else 0.2,
+        )
+        self.B = NumCatRVariable(
+            node_id="B",
+            input_data={"outcome-values": [10, 50]},
+            marginal_distribution=lambda x: 0.5,
+        )
+        self.C = NumCatRVariable(
+            node_id="C",
+            input_data={"outcome-values": [10, 50]},
+            marginal_distribution=lambda x: 0.5,
+        )
+
+        def phiAB(scope_product):
+            """"""
+            sfs = set(scope_product)
+            if sfs == set([("A", 10), ("B", 10)]):
+                return 0.5
+            elif sfs == set([("A", 20), ("B", 50)]):
+                return 0.9
+            return 0
+
+        def phiBC(scope_product):
+            """"""
+            sfs = set(scope_product)
+            if sfs == set([("B", 10), ("C", 50)]):
+                return 0.7
+            elif sfs == set([("B", 50), ("C", 50)]):
+                return 0.2
+            return 0
+
+        self.AB = SparseFactor(
+            gid="AB", scope_vars=set([self.A, self.B]), factor_fn=phiAB
+        )
+        self.BC = SparseFactor(
+            gid="BC", scope_vars=set([self.B, self.C]), factor_fn=phiBC
+        )
+
+    def test_zval(self):
+        """"""
+        self.assertEqual(round(FactorNumericAnalyzer.zval(self.AB), 5), 1.4)
+        self.assertEqual(len(self.AB._ensure_nonzeros()), 2)
+        self.assertEqual(self.AB.phi(set([("A", 20), ("B", 50)])), 0.9)
+        self.assertEqual(self.AB.phi(set([("A", 50), ("B", 50)])), 0.0)
+        self.assertEqual(self.AB(set([("A", 20), ("B", 50)])), 0.9)
+
+    def test_phi_by_index(self):
+        """"""
+        # variables are ordered as A, B and values as they are given
+        self.assertEqual(self.AB.phi_by_index((0, 0)), 0.5)
+        self.assertEqual(self.AB.phi_by_index((2, 1)), 0.9)
+        self.assertEqual(self.AB.phi_by_index((1, 1)), 0.0)
+        self.assertEqual(
+            self.AB.phi_batch([(0, 0), (1, 1), (2, 1)]), [0.5, 0.0, 0.9]
+        )
+
+    def test_dense_table_kept_sparse(self):
+        """"""
+        self.AB._ensure_nonzeros()
+        self.assertIsNone(self.AB._table)
+        sig, table = FactorOps.dense_table(self.AB)
+        self.assertEqual(sig, (("A", (10, 50, 20)), ("B", (10, 50))))
+        self.assertEqual(table, [0.5, 0, 0, 0, 0, 0.9])
+        self.assertEqual(self.AB.table, table)
+        self.assertEqual(self.AB.phi_table(), [[0.5, 0], [0, 0], [0, 0.9]])
+        self.assertIsNone(self.AB._table)
+        self.assertEqual(len(self.AB._nonzeros), 2)
+
+    def test_dense_fallback(self):
+        """"""
+        # the table of BC is half full
+        fac = SparseFactor(
+            gid="BC",
+            scope_vars=set([self.B, self.C]),
+            factor_fn=self.BC.factor_fn,
+            density_threshold=0.4,
+        )
+        self.assertIsNone(fac._ensure_nonzeros())
+        self.assertEqual(round(FactorNumericAnalyzer.zval(fac), 5), 0.9)
+
+    def test_partition_value_workers(self):
+        """"""
+        svars = set(
+            NumCatRVariable(
+                node_id=nid,
+                input_data={"outcome-values": [10, 50, 20]},
+                marginal_distribution=uniform_half,
+            )
+            for nid in ["A", "B"]
+        )
+        fac = SparseFactor(gid="f", scope_vars=svars, factor_fn=phi_diagonal)
+        domain = fac._default_domain()
+        self.assertEqual(
+            fac.partition_value(domain, nb_workers=2),
+            fac.partition_value(domain, nb_workers=1),
+        )
+        self.assertEqual(fac.partition_value(domain, nb_workers=2), 1.5)
+        self.assertIsNotNone(fac._nonzeros)
+        subdomain = [
+            frozenset([("A", 10), ("A", 20)]),
+            frozenset([("B", 10), ("B", 50), ("B", 20)]),
+        ]
+        self.assertEqual(
+            fac.partition_value(subdomain, nb_workers=2),
+            fac.partition_value(subdomain, nb_workers=1),
+        )
+        self.assertEqual(fac.partition_value(subdomain, nb_workers=2), 1.0)
+
+    def test_density_threshold(self):
+        """"""
+        self.assertRaises(
+            ValueError,
+            SparseFactor,
+            gid="f",
+            scope_vars=set([self.B]),
+            density_threshold=1.5,
+        )
+
+    def test_product(self):
+        """"""
+        ABC = self.AB.product(self.BC)
+        self.assertEqual(
+            set(v.id() for v in ABC.scope_vars()), set(["A", "B", "C"])
+        )
+        self.assertEqual(len(ABC._ensure_nonzeros()), 2)
+        self.assertEqual(
+            round(ABC.phi(set([("A", 10), ("B", 10), ("C", 50)])), 5), 0.35
+        )
+        self.assertEqual(
+            round(ABC.phi(set([("A", 20), ("B", 50), ("C", 50)])), 5), 0.18
+        )
+        self.assertEqual(ABC.phi(set([("A", 10), ("B", 10), ("C", 10)])), 0)
+        self.assertEqual(round(FactorNumericAnalyzer.zval(ABC), 5), 0.53)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@ import pprint
 import unittest
 
 from pygmodels.graph.gmodel.tree import Tree
+from pygmodels.graph.graphops.graphops import BaseGraphNodeOps
 from pygmodels.graph.gtype.edge import Edge, EdgeType
 from pygmodels.graph.gtype.node import Node
 
@@ -79,6 +80,36 @@ class TreeTest(unittest.TestCase):
             self.gtree.leaves(), set([self.k, self.d, self.e, self.m, self.j])
         )
 
+    def test_leaves_cached(self):
+        """"""
+        leaves = self.gtree.leaves()
+        leaves.add(self.a)
+        self.assertEqual(
+            self.gtree.leaves(), set([self.k, self.d, self.e, self.m, self.j])
+        )
+        table = self.gtree.node_table()
+        table[self.a.id()]["child"] = True
+        table.pop(self.k.id())
+        table = self.gtree.node_table()
+        self.assertEqual(table[self.a.id()], {"child": False, "parent": True})
+        self.assertIn(self.k.id(), table)
+        self.assertEqual(self.gtree.root, self.a)
+
+    def test_from_node_tuples(self):
+        """"""
+        tree = Tree.from_node_tuples(
+            set(
+                [
+                    (self.b, self.a, EdgeType.DIRECTED),
+                    (self.c, self.a, EdgeType.DIRECTED),
+                    (self.d, self.b, EdgeType.DIRECTED),
+                ]
+            )
+        )
+        self.assertEqual(tree.root, self.a)
+        self.assertEqual(tree.leaves(), set([self.c, self.d]))
+        self.assertEqual(len(set([e.id() for e in tree.E])), 3)
+
     def test_from_edgeset(self):
         """"""
         eset = set(
@@ -144,6 +175,47 @@ class TreeTest(unittest.TestCase):
         uset = self.gtree.downset_of(self.b)
         self.assertFalse(uset == set([self.b, self.a, self.d]))
 
+    def test_find_separating_vertices(self):
+        """"""
+        points = self.gtree.find_separating_vertices(
+            generative_fn=lambda x: BaseGraphNodeOps.neighbours_of(
+                self.gtree, x
+            )
+        )
+        self.assertEqual(
+            points, set([self.a, self.b, self.c, self.f, self.g, self.h])
+        )
+
+    def test_assign_num_check_ap(self):
+        """"""
+
+        def gen(x):
+            return BaseGraphNodeOps.neighbours_of(self.gtree, x)
+
+        num, low, visited, parent = {}, {}, {}, {}
+        aset = set()
+        counter = self.gtree.assign_num(
+            v="a",
+            num=num,
+            visited=visited,
+            parent=parent,
+            counter=0,
+            generative_fn=gen,
+        )
+        self.assertEqual(counter, len(self.gtree.V))
+        self.assertEqual(sorted(num.values()), list(range(1, counter + 1)))
+        self.gtree.check_ap(
+            v="a",
+            num=num,
+            visited=visited,
+            parent=parent,
+            low=low,
+            counter=counter,
+            aset=aset,
+            generative_fn=gen,
+        )
+        self.assertEqual(aset, set(["a", "b", "c", "f", "g", "h"]))
+
     def test_extract_path(self):
         """"""
         p = self.gtree.extract_path(start=self.b, end=self.m)
@@ -4,8 +4,9 @@ Test undirected graph object
 import unittest
 from random import choice
 
+from pygmodels.graph.gmodel.tree import Tree
 from pygmodels.graph.gmodel.undigraph import UndiGraph
-from pygmodels.graph.graphops.graphops import BaseGraphOps
+from pygmodels.graph.graphops.graphops import BaseGraphEdgeOps, BaseGraphOps
 from pygmodels.graph.gtype.edge import Edge, EdgeType
 from pygmodels.graph.gtype.node import Node
 
@@ -325,6 +326,35 @@ class UndiGraphTest(unittest.TestCase):
         nps = [x[0] for x in lpath]
         self.assertEqual(nps, ["n1", "n2", "n3", "n4"])
 
+    def test_find_shortest_path_lengths(self):
+        """"""
+        lengths = self.ugraph4.find_shortest_path_lengths()
+        self.assertEqual(
+            lengths["n1"],
+            {
+                "a": float("inf"),
+                "b": float("inf"),
+                "e": float("inf"),
+                "f": float("inf"),
+                "n1": 0,
+                "n2": 1,
+                "n3": 2,
+                "n4": 3,
+            },
+        )
+        for n in self.ugraph4.V:
+            paths = self.ugraph4.find_shortest_paths(n1=n)
+            self.assertEqual(lengths[n.id()], paths.top_sort)
+
+    def test_sssp_delta_stepping(self):
+        """"""
+        expected = {"a": 0, "b": 1, "c": 3, "d": 6, "e": 10, "f": 14, "g": 7}
+        for delta in [1.0, 3.0, 10.0]:
+            dist = self.ugraph5.sssp_delta_stepping(
+                self.a, weight_fn=lambda e: e.data()["w"], delta=delta
+            )
+            self.assertEqual(dist, expected)
+
     def test_lower_bound_for_path_length(self):
         mdegre = self.ugraph1.lower_bound_for_path_length()
         self.assertEqual(mdegre, 0)
@@ -340,6 +370,30 @@ class UndiGraphTest(unittest.TestCase):
             ["ab", "bc", "cd", "de", "ef", "bg", "gd", "df"],
         )
 
+    def test_find_mst_prim(self):
+        """"""
+        tree = Tree.find_mst_prim(
+            self.ugraph5,
+            edge_generator=lambda x: BaseGraphEdgeOps.edges_of(
+                self.ugraph5, x
+            ),
+            weight_function=lambda e: e.data()["w"],
+        )
+        self.assertEqual(
+            set([e.id() for e in tree.E]),
+            set(["ab", "bc", "cd", "de", "ef", "bg"]),
+        )
+
+    def test_find_mst_prim_dense(self):
+        """"""
+        tree = Tree.find_mst_prim_dense(
+            self.ugraph5, weight_function=lambda e: e.data()["w"]
+        )
+        self.assertEqual(
+            set([e.id() for e in tree.E]),
+            set(["ab", "bc", "cd", "de", "ef", "bg"]),
+        )
+
     def test_maximum_spanning_tree(self):
         """"""
         tree, L = self.ugraph5.find_maximum_spanning_tree(
@@ -355,6 +409,13 @@ class UndiGraphTest(unittest.TestCase):
         points = self.ugraph5.find_articulation_points()
         self.assertEqual(set([self.b, self.d]), points)
 
+    def test_find_articulation_points_components(self):
+        """"""
+        self.assertEqual(self.ugraph1.find_articulation_points(), set())
+        self.assertEqual(
+            self.ugraph3.find_articulation_points(), set([self.a, self.b])
+        )
+
     def test_find_bridges(self):
         """
         Test taken from Erciyes p. 235, Fig. 8.5
@@ -362,6 +423,23 @@ class UndiGraphTest(unittest.TestCase):
         bridges = self.ugraph6.find_bridges()
         self.assertEqual(bridges, set([self.de, self.bc]))
 
+    def test_find_bridges_parallel_edges(self):
+        """"""
+        self.assertEqual(self.ugraph5.find_bridges(), set([self.ab]))
+        ab2 = Edge(
+            "ab2",
+            start_node=self.a,
+            end_node=self.b,
+            edge_type=EdgeType.UNDIRECTED,
+        )
+        g = UndiGraph(
+            "ug_ab",
+            nodes=set([self.a, self.b]),
+            edges=set([self.ab, ab2]),
+        )
+        self.assertEqual(g.find_bridges(), set())
+        self.assertEqual(g.find_articulation_points(), set())
+
     def test_find_maximal_cliques(self):
         """!"""
         cliques = self.ugraph7.find_maximal_cliques()